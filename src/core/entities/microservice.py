@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, HttpUrl
 from bson import ObjectId
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 
 class RateLimitConfig(BaseModel):
     """Schema for defining rate limit configurations."""
@@ -8,12 +8,47 @@ class RateLimitConfig(BaseModel):
     requests_per_hour: Optional[int] = Field(None, description="Number of allowed requests per hour.")
     requests_per_day: Optional[int] = Field(None, description="Number of allowed requests per day.")
 
+class ConcurrencyConfig(BaseModel):
+    """Schema for defining the adaptive concurrency limit (bulkhead) of an upstream microservice."""
+    initial_limit: int = Field(20, ge=1, description="Concurrency limit used until latency samples are available.")
+    min_limit: int = Field(1, ge=1, description="Lower bound of the adaptive concurrency limit.")
+    max_limit: int = Field(200, ge=1, description="Upper bound of the adaptive concurrency limit.")
+    queue_size: int = Field(50, ge=0, description="Maximum number of requests waiting for a free slot.")
+    queue_timeout: float = Field(1.0, gt=0, description="Maximum seconds a request waits for a free slot before being rejected.")
+
+class MirrorConfig(BaseModel):
+    """Schema for mirroring a sample of the traffic to a shadow upstream."""
+    target: HttpUrl = Field(..., description="Base URL of the shadow upstream receiving the mirrored requests.")
+    sample_rate: float = Field(1.0, ge=0, le=1, description="Fraction of the requests that are mirrored.")
+
+class IdempotencyConfig(BaseModel):
+    """Schema for replaying the stored response of a write retried with the same Idempotency-Key."""
+    ttl: int = Field(86400, ge=1, description="Seconds a completed response is kept for replay.")
+    wait_timeout: float = Field(0.0, ge=0, description="Seconds a duplicate waits for the in-flight request before getting 409.")
+
+class TransformConfig(BaseModel):
+    """Schema for rewriting requests before they are forwarded to the upstream."""
+    rewrite_path: Optional[str] = Field(None, description="Upstream path, may use the path parameters of the route, e.g. '/v2/users/{user_id}'.")
+    add_headers: Dict[str, str] = Field(default_factory=dict, description="Headers set on every upstream request, replacing the client's.")
+    remove_headers: List[str] = Field(default_factory=list, description="Client headers that are not forwarded.")
+    inject_api_key: bool = Field(default=False, description="Send the microservice api_key as 'Authorization: Bearer <api_key>'.")
+
 class PathDetails(BaseModel):
     """Schema representing a single path with its associated method, protection status, and rate limit configuration."""
     path: str = Field(..., description="The endpoint path, must start with a forward slash ('/').")
     method: str = Field(..., description="HTTP method for the endpoint (e.g., GET, POST).")
     protected: bool = Field(default=False, description="Indicates whether the endpoint is protected (requires authentication).")
     rate_limit: Optional[RateLimitConfig] = Field(None, description="Optional rate limit configuration for this specific path.")
+    timeout: Optional[float] = Field(None, gt=0, description="Optional upstream timeout in seconds for this specific path.")
+    priority: Optional[Literal["critical", "high", "normal", "low"]] = Field(None, description="Admission priority class; defaults to 'high' for protected paths and 'low' otherwise.")
+    protocol: Literal["http", "sse", "websocket"] = Field(default="http", description="Kind of proxy: plain HTTP, Server-Sent Events stream or WebSocket.")
+    idle_timeout: Optional[float] = Field(None, gt=0, description="Seconds without any traffic after which a stream or WebSocket is closed.")
+    max_connections: Optional[int] = Field(None, ge=1, description="Maximum number of concurrent stream or WebSocket connections for this path.")
+    mirror: Optional[MirrorConfig] = Field(None, description="Optional traffic mirroring for this path, overriding the microservice setting.")
+    idempotency: Optional[IdempotencyConfig] = Field(None, description="Optional Idempotency-Key handling; only applies to POST, PUT and PATCH.")
+    transform: Optional[TransformConfig] = Field(None, description="Optional request rewriting for this path, overriding the microservice setting.")
+    queue: Optional[str] = Field(None, min_length=1, description="Serve this path over RabbitMQ request/reply on this queue instead of proxying over HTTP.")
+    broadcast: bool = Field(default=False, description="For SSE paths, share one upstream stream per path and query string between all clients.")
 
 class ObjectIdStr(str):
     """Custom data type for handling ObjectId as a string."""
@@ -30,10 +65,9 @@ class ObjectIdStr(str):
         return str(value)
 
     @classmethod
-    def __get_pydantic_json_schema__(cls, schema):
+    def __get_pydantic_json_schema__(cls, core_schema, handler):
         """Modify the JSON schema to represent ObjectIdStr as a string."""
-        schema.update(type="string")
-        return schema
+        return {"type": "string"}
 
 class Microservice(BaseModel):
     """Entity representing a microservice with its registration details."""
@@ -42,6 +76,10 @@ class Microservice(BaseModel):
     base_url: HttpUrl = Field(..., description="Base URL of the microservice.")
     paths: List[PathDetails] = Field(..., description="List of paths exposed by the microservice.")
     api_key: Optional[str] = Field(None, description="API key for the microservice.")
+    timeout: Optional[float] = Field(None, gt=0, description="Default upstream timeout in seconds for all paths.")
+    concurrency: Optional[ConcurrencyConfig] = Field(None, description="Optional concurrency limit configuration for the microservice.")
+    mirror: Optional[MirrorConfig] = Field(None, description="Optional traffic mirroring applied to all HTTP paths.")
+    transform: Optional[TransformConfig] = Field(None, description="Optional request rewriting applied to all paths.")
 
     class Config:
         schema_extra = {
@@ -1,10 +1,11 @@
 from typing import Dict, Any, List
 from datetime import datetime
 from src.infrastructure.db.mongo_client import MongoDBClient
+from src.core.repositories.registry_repository import RegistryRepository
 from bson import ObjectId
 
-class DBRepository:
-    """Repository to interact with the MongoDB database."""
+class DBRepository(RegistryRepository):
+    """Registry repository backed by the MongoDB database."""
 
     def __init__(self, client: MongoDBClient):
         self.client = client
@@ -38,13 +39,12 @@ class DBRepository:
     async def update(self, id: str, data: Dict[str, Any]) -> bool:
         """Update a document by ID."""
         query = {"_id": ObjectId(id)}
-        updated_data = {"$set": data}
-        updated_data["modified"] = datetime.utcnow()  
+        updated_data = {"$set": {**data, "modified": datetime.utcnow()}}
         result = await self.client.update_one(query, updated_data)
         return result.modified_count > 0
 
     async def delete(self, id: str) -> bool:
         """Delete a document by ID."""
         query = {"_id": ObjectId(id)}
-        result = await self.client.delete_one(query)
-        return result.deleted_count > 0
+        deleted_count = await self.client.delete_one(query)
+        return deleted_count > 0
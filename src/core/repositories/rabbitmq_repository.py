@@ -17,15 +17,43 @@ class RabbitMQRepository:
             logger.error(f"Error publishing message to queue '{queue_name}': {e}")
             raise
 
-    def consume_queue(self, queue_name, on_message_callback):
+    def publish_request(self, queue_name, message, correlation_id, reply_to, headers=None, content_type=None, expiration=None):
+        """Publish a request whose reply is expected on the reply_to queue"""
+        try:
+            self.pika_client.basic_publish(
+                queue_name, message,
+                correlation_id=correlation_id,
+                reply_to=reply_to,
+                headers=headers,
+                content_type=content_type,
+                expiration=expiration,
+                persistent=False
+            )
+        except Exception as e:
+            logger.error(f"Error publishing request to queue '{queue_name}': {e}")
+            raise
+
+    def declare_reply_queue(self):
+        """Declare a private queue for replies and return its name"""
+        return self.pika_client.declare_reply_queue()
+
+    def consume_queue(self, queue_name, on_message_callback, auto_ack=False, declare=True, prefetch_count=1):
         """Consume messages from a specific RabbitMQ queue"""
         try:
-            self.pika_client.consume_messages(queue_name, on_message_callback)
+            self.pika_client.consume_messages(queue_name, on_message_callback, auto_ack, declare, prefetch_count)
             logger.info(f"Started consuming messages from queue '{queue_name}'")
         except Exception as e:
             logger.error(f"Error consuming messages from queue '{queue_name}': {e}")
             raise
 
+    def stop_consuming(self):
+        """Stop consuming from another thread, after the message being handled"""
+        self.pika_client.stop_consuming()
+
+    def close_connection(self):
+        """Close the RabbitMQ connection"""
+        self.pika_client.close_connection()
+
     def purge_queue(self, queue_name):
         """Purge messages from a given RabbitMQ queue"""
         try:
@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+
+
+class RegistryRepository(ABC):
+    """Storage interface for the microservice registry.
+
+    Documents are plain dictionaries keyed by ``_id``, as stored in MongoDB, so use
+    cases and entities do not depend on the backend selected with REGISTRY_BACKEND.
+    """
+
+    @abstractmethod
+    async def create(self, service_data: Dict[str, Any]) -> str:
+        """Store a new document and return its ID."""
+
+    @abstractmethod
+    async def find_all(self) -> List[Dict[str, Any]]:
+        """Retrieve all documents."""
+
+    @abstractmethod
+    async def find(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Retrieve the documents whose fields equal the values in the query."""
+
+    @abstractmethod
+    async def update(self, id: str, data: Dict[str, Any]) -> bool:
+        """Update the given fields of a document by ID."""
+
+    @abstractmethod
+    async def delete(self, id: str) -> bool:
+        """Delete a document by ID."""
@@ -0,0 +1,45 @@
+from typing import Dict, Any, List
+from datetime import datetime
+from src.infrastructure.db.sqlite_client import SQLiteClient
+from src.core.repositories.registry_repository import RegistryRepository
+
+
+class SQLiteRepository(RegistryRepository):
+    """Registry repository backed by the embedded SQLite store, for gateways without MongoDB."""
+
+    def __init__(self, client: SQLiteClient):
+        self.client = client
+
+    async def create(self, service_data: Dict[str, Any]) -> str:
+        """Create a new microservice document."""
+        # Remove _id if it is None or not set
+        if "_id" in service_data and service_data["_id"] is None:
+            del service_data["_id"]
+        service_data["created"] = service_data.get("created", datetime.utcnow())
+        service_data["modified"] = service_data.get("modified", datetime.utcnow())
+        document_id = await self.client.insert_one(service_data)
+        return str(document_id)
+
+    async def find_all(self) -> List[Dict[str, Any]]:
+        """Retrieve all microservice documents."""
+        return await self.client.find({})
+
+    async def find(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Retrieve documents that match the specified query.
+
+        Args:
+            query (Dict[str, Any]): Field values the documents must be equal to.
+
+        Returns:
+            List[Dict[str, Any]]: A list of documents that match the query.
+        """
+        return await self.client.find(query)
+
+    async def update(self, id: str, data: Dict[str, Any]) -> bool:
+        """Update a document by ID."""
+        return await self.client.update_one(id, {**data, "modified": datetime.utcnow()}) > 0
+
+    async def delete(self, id: str) -> bool:
+        """Delete a document by ID."""
+        return await self.client.delete_one(id) > 0
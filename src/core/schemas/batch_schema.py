@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional, Annotated
+from pydantic.types import StringConstraints
+
+class BatchSubRequest(BaseModel):
+    """Schema representing a single sub-request of a batch."""
+    id: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)] = Field(..., description="Identifier of the sub-request, unique within the batch.")
+    method: Annotated[str, StringConstraints(pattern=r'^(GET|POST|PUT|DELETE|PATCH)$', to_upper=True)] = Field(..., description="HTTP method of the sub-request.")
+    path: Annotated[str, StringConstraints(pattern=r'^/.*')] = Field(..., description="Gateway path of a registered route, must start with a forward slash ('/').")
+    headers: Dict[str, str] = Field(default_factory=dict, description="Additional headers for this sub-request.")
+    query: Dict[str, str] = Field(default_factory=dict, description="Query parameters for this sub-request.")
+    body: Optional[Any] = Field(None, description="Optional JSON body for this sub-request.")
+    depends_on: List[str] = Field(default_factory=list, description="Ids of sub-requests that must succeed before this one is sent.")
+
+class BatchRequestSchema(BaseModel):
+    """Schema for a batch of sub-requests dispatched concurrently through the gateway."""
+    requests: List[BatchSubRequest] = Field(..., min_length=1, description="Sub-requests to dispatch.")
+    stream: bool = Field(default=False, description="Stream each result as newline-delimited JSON as soon as it finishes.")
@@ -1,5 +1,7 @@
-from pydantic import BaseModel, HttpUrl, Field
-from typing import List, Optional, Annotated
+import re
+from string import Formatter
+from pydantic import BaseModel, HttpUrl, Field, model_validator
+from typing import Dict, List, Literal, Optional, Annotated
 from pydantic.types import StringConstraints
 
 class RateLimitConfig(BaseModel):
@@ -8,12 +10,72 @@ class RateLimitConfig(BaseModel):
     requests_per_hour: Optional[int] = Field(None, description="Number of allowed requests per hour.")
     requests_per_day: Optional[int] = Field(None, description="Number of allowed requests per day.")
 
+class ConcurrencyConfig(BaseModel):
+    """Schema for defining the adaptive concurrency limit (bulkhead) of an upstream microservice."""
+    initial_limit: int = Field(20, ge=1, description="Concurrency limit used until latency samples are available.")
+    min_limit: int = Field(1, ge=1, description="Lower bound of the adaptive concurrency limit.")
+    max_limit: int = Field(200, ge=1, description="Upper bound of the adaptive concurrency limit.")
+    queue_size: int = Field(50, ge=0, description="Maximum number of requests waiting for a free slot.")
+    queue_timeout: float = Field(1.0, gt=0, description="Maximum seconds a request waits for a free slot before being rejected.")
+
+class MirrorConfig(BaseModel):
+    """Schema for mirroring a sample of the traffic to a shadow upstream."""
+    target: HttpUrl = Field(..., description="Base URL of the shadow upstream receiving the mirrored requests.")
+    sample_rate: float = Field(1.0, ge=0, le=1, description="Fraction of the requests that are mirrored.")
+
+class IdempotencyConfig(BaseModel):
+    """Schema for replaying the stored response of a write retried with the same Idempotency-Key."""
+    ttl: int = Field(86400, ge=1, description="Seconds a completed response is kept for replay.")
+    wait_timeout: float = Field(0.0, ge=0, description="Seconds a duplicate waits for the in-flight request before getting 409.")
+
+class TransformConfig(BaseModel):
+    """Schema for rewriting requests before they are forwarded to the upstream."""
+    rewrite_path: Optional[str] = Field(None, description="Upstream path, may use the path parameters of the route, e.g. '/v2/users/{user_id}'.")
+    add_headers: Dict[str, str] = Field(default_factory=dict, description="Headers set on every upstream request, replacing the client's.")
+    remove_headers: List[str] = Field(default_factory=list, description="Client headers that are not forwarded.")
+    inject_api_key: bool = Field(default=False, description="Send the microservice api_key as 'Authorization: Bearer <api_key>'.")
+
 class PathDetails(BaseModel):
     """Schema representing a single path with its associated method, protection status, and rate limit configuration."""
     path: Annotated[str, StringConstraints(pattern=r'^/.*')] = Field(..., description="The endpoint path, must start with a forward slash ('/').")
     method: Annotated[str, StringConstraints(pattern=r'^(GET|POST|PUT|DELETE|PATCH)$', to_upper=True)] = Field(..., description="HTTP method for the endpoint (e.g., GET, POST).")
     protected: bool = Field(default=False, description="Indicates whether the endpoint is protected (requires authentication).")
     rate_limit: Optional[RateLimitConfig] = Field(None, description="Optional rate limit configuration for this specific path.")
+    timeout: Optional[float] = Field(None, gt=0, description="Optional upstream timeout in seconds for this specific path.")
+    priority: Optional[Literal["critical", "high", "normal", "low"]] = Field(None, description="Admission priority class; defaults to 'high' for protected paths and 'low' otherwise.")
+    protocol: Literal["http", "sse", "websocket"] = Field(default="http", description="Kind of proxy: plain HTTP, Server-Sent Events stream or WebSocket.")
+    idle_timeout: Optional[float] = Field(None, gt=0, description="Seconds without any traffic after which a stream or WebSocket is closed.")
+    max_connections: Optional[int] = Field(None, ge=1, description="Maximum number of concurrent stream or WebSocket connections for this path.")
+    mirror: Optional[MirrorConfig] = Field(None, description="Optional traffic mirroring for this path, overriding the microservice setting.")
+    idempotency: Optional[IdempotencyConfig] = Field(None, description="Optional Idempotency-Key handling; only applies to POST, PUT and PATCH.")
+    transform: Optional[TransformConfig] = Field(None, description="Optional request rewriting for this path, overriding the microservice setting.")
+    queue: Optional[str] = Field(None, min_length=1, description="Serve this path over RabbitMQ request/reply on this queue instead of proxying over HTTP.")
+    broadcast: bool = Field(default=False, description="For SSE paths, share one upstream stream per path and query string between all clients.")
+
+    @model_validator(mode="after")
+    def check_rewrite_path(self) -> "PathDetails":
+        """Reject path rewrites that use parameters the path does not define."""
+        if self.transform and self.transform.rewrite_path:
+            path_params = set(re.findall(r"{([a-zA-Z_][a-zA-Z0-9_]*)(?::[a-zA-Z_][a-zA-Z0-9_]*)?}", self.path))
+            fields = {name for _, name, _, _ in Formatter().parse(self.transform.rewrite_path) if name is not None}
+            unknown = fields - path_params
+            if unknown:
+                raise ValueError(f"rewrite_path uses parameters not defined in the path: {', '.join(sorted(unknown))}")
+        return self
+
+    @model_validator(mode="after")
+    def check_queue_protocol(self) -> "PathDetails":
+        """Request/reply over RabbitMQ only replaces plain HTTP proxying."""
+        if self.queue and self.protocol != "http":
+            raise ValueError("queue can only be set on paths with the 'http' protocol")
+        return self
+
+    @model_validator(mode="after")
+    def check_broadcast_protocol(self) -> "PathDetails":
+        """Only event streams can be shared between clients."""
+        if self.broadcast and self.protocol != "sse":
+            raise ValueError("broadcast can only be set on paths with the 'sse' protocol")
+        return self
 
 class MicroserviceSchema(BaseModel):
     """Schema for registering a new microservice."""
@@ -21,3 +83,7 @@ class MicroserviceSchema(BaseModel):
     base_url: HttpUrl = Field(..., description="Base URL of the microservice.")
     paths: List[PathDetails] = Field(..., description="List of paths exposed by the microservice.")
     api_key: Optional[str] = Field(None, description="API key for the microservice.")
+    timeout: Optional[float] = Field(None, gt=0, description="Default upstream timeout in seconds for all paths.")
+    concurrency: Optional[ConcurrencyConfig] = Field(None, description="Optional concurrency limit configuration for the microservice.")
+    mirror: Optional[MirrorConfig] = Field(None, description="Optional traffic mirroring applied to all HTTP paths.")
+    transform: Optional[TransformConfig] = Field(None, description="Optional request rewriting applied to all paths.")
@@ -1,5 +1,5 @@
 from src.core.entities.microservice import Microservice
-from src.core.repositories.db_repository import DBRepository
+from src.core.repositories.registry_repository import RegistryRepository
 import logging
 
 logger = logging.getLogger(__name__)
@@ -7,7 +7,7 @@ logger = logging.getLogger(__name__)
 class CreateMicroservice:
     """Use-case for creating a new microservice."""
 
-    def __init__(self, db_repository: DBRepository):
+    def __init__(self, db_repository: RegistryRepository):
         self.db_repository = db_repository
 
     async def execute(self, microservice: Microservice) -> Microservice:
@@ -2,12 +2,12 @@
 
 from typing import List, Optional
 from src.core.entities.microservice import Microservice
-from src.core.repositories.db_repository import DBRepository
+from src.core.repositories.registry_repository import RegistryRepository
 
 class GetMicroservices:
     """Use-case for getting microservices by service name."""
 
-    def __init__(self, db_repository: DBRepository):
+    def __init__(self, db_repository: RegistryRepository):
         self.db_repository = db_repository
 
     async def execute(self, service_name: Optional[str] = None) -> List[Microservice]:
@@ -23,6 +23,6 @@ class GetMicroservices:
         query = {}
         if service_name:
             query["service_name"] = service_name
-        # Call the repository method using the instance of DBRepository
+        # Call the repository method using the registry repository
         documents = await self.db_repository.find(query=query)
         return [Microservice(**doc) for doc in documents]  # Convert each document to a Microservice entity
@@ -7,3 +7,9 @@ class ConsumeUserAuthQueue:
     def execute(self, on_message_callback):
         queue_name = 'user_auth_queue'
         return self.repository.consume_queue(queue_name, on_message_callback)
+
+    def stop(self):
+        return self.repository.stop_consuming()
+
+    def close(self):
+        return self.repository.close_connection()
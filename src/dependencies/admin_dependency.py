@@ -0,0 +1,16 @@
+# src/dependencies/admin_dependency.py
+
+import hmac
+from typing import Optional
+from fastapi import Depends, Header, HTTPException
+from dependency_injector.wiring import Provide, inject
+from src.infrastructure.di_container import Container
+
+@inject
+async def verify_admin_key(
+    x_admin_key: Optional[str] = Header(None),
+    admin_api_key: Optional[str] = Depends(Provide[Container.config.admin_api_key])
+) -> None:
+    """Reject the request unless it carries the admin key; admin endpoints are closed when no key is configured."""
+    if not admin_api_key or not x_admin_key or not hmac.compare_digest(x_admin_key, admin_api_key):
+        raise HTTPException(status_code=403, detail="Admin access required.")
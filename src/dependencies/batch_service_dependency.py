@@ -0,0 +1,13 @@
+# src/dependencies/batch_service_dependency.py
+
+from fastapi import Depends
+from dependency_injector.wiring import Provide, inject
+from src.services.batch_service import BatchService
+from src.infrastructure.di_container import Container
+
+@inject
+async def get_batch_service(
+    batch_service: BatchService = Depends(Provide[Container.batch_service])  # Get the BatchService singleton from the DI container
+) -> BatchService:
+    """Provide the BatchService instance."""
+    return batch_service
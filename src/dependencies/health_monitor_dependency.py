@@ -0,0 +1,13 @@
+# src/dependencies/health_monitor_dependency.py
+
+from fastapi import Depends
+from dependency_injector.wiring import Provide, inject
+from src.infrastructure.health_monitor import HealthMonitor
+from src.infrastructure.di_container import Container
+
+@inject
+async def get_health_monitor(
+    health_monitor: HealthMonitor = Depends(Provide[Container.health_monitor])  # Get the HealthMonitor singleton from the DI container
+) -> HealthMonitor:
+    """Provide the HealthMonitor instance."""
+    return health_monitor
@@ -0,0 +1,13 @@
+# src/dependencies/heavy_hitters_dependency.py
+
+from fastapi import Depends
+from dependency_injector.wiring import Provide, inject
+from src.utils.heavy_hitters import HeavyHitterTracker
+from src.infrastructure.di_container import Container
+
+@inject
+async def get_heavy_hitter_tracker(
+    heavy_hitter_tracker: HeavyHitterTracker = Depends(Provide[Container.heavy_hitter_tracker])
+) -> HeavyHitterTracker:
+    """Provide the HeavyHitterTracker instance."""
+    return heavy_hitter_tracker
@@ -0,0 +1,13 @@
+# src/dependencies/openapi_dependency.py
+
+from fastapi import Depends
+from dependency_injector.wiring import Provide, inject
+from src.utils.openapi_aggregator import OpenApiAggregator
+from src.infrastructure.di_container import Container
+
+@inject
+async def get_openapi_aggregator(
+    openapi_aggregator: OpenApiAggregator = Depends(Provide[Container.openapi_aggregator])
+) -> OpenApiAggregator:
+    """Provide the OpenApiAggregator instance."""
+    return openapi_aggregator
@@ -0,0 +1,27 @@
+# src/dependencies/profiling_dependency.py
+
+from fastapi import Depends
+from dependency_injector.wiring import Provide, inject
+from src.utils.profiling import EventLoopLagMonitor, MemoryProfiler, SamplingProfiler
+from src.infrastructure.di_container import Container
+
+@inject
+async def get_loop_lag_monitor(
+    loop_lag_monitor: EventLoopLagMonitor = Depends(Provide[Container.loop_lag_monitor])
+) -> EventLoopLagMonitor:
+    """Provide the EventLoopLagMonitor instance."""
+    return loop_lag_monitor
+
+@inject
+async def get_cpu_profiler(
+    cpu_profiler: SamplingProfiler = Depends(Provide[Container.cpu_profiler])
+) -> SamplingProfiler:
+    """Provide the SamplingProfiler instance."""
+    return cpu_profiler
+
+@inject
+async def get_memory_profiler(
+    memory_profiler: MemoryProfiler = Depends(Provide[Container.memory_profiler])
+) -> MemoryProfiler:
+    """Provide the MemoryProfiler instance."""
+    return memory_profiler
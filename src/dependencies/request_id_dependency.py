@@ -1,8 +1,9 @@
 # src/dependencies/request_id_dependency.py
 
-from fastapi import Request, Depends
+from fastapi import Request
+from src.utils.request_context import current_request_id
 
 async def get_request_id(request: Request) -> str:
-    """Dependency to get the request ID from the request state."""
-    
-    return request.state.request_id
+    """Dependency to get the request ID from the request context."""
+
+    return current_request_id() or request.state.request_id
@@ -1,7 +1,9 @@
-from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
 import logging
 
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
 logger = logging.getLogger(__name__)
 
 class MongoDBClient:
@@ -17,7 +19,7 @@ class MongoDBClient:
         self.db_uri = db_uri
         self.db_name = db_name
         self.db_collection_name = db_collection
-        self.client: Optional[AsyncIOMotorClient] = None
+        self.client: Optional["AsyncIOMotorClient"] = None
         self.db = None
         self.collection = None
 
@@ -25,6 +27,9 @@ class MongoDBClient:
         """Establish a connection to the MongoDB server."""
         try:
             if not self.client:
+                # Imported on first use: motor/pymongo are slow to import and not needed to serve the snapshot
+                from motor.motor_asyncio import AsyncIOMotorClient
+
                 # Create a new MongoDB client and connect to the database and collection
                 self.client = AsyncIOMotorClient(self.db_uri)
                 self.db = self.client[self.db_name]
@@ -42,6 +47,13 @@ class MongoDBClient:
             self.client.close()
             logger.info("Disconnected from MongoDB.")
 
+    async def ping(self) -> bool:
+        """Ping the MongoDB server to check connection status."""
+        if not self.client:
+            raise ConnectionError("MongoDB client is not connected.")
+        await self.client.admin.command("ping")
+        return True
+
     def get_collection(self):
         """
         Get the collection object.
@@ -60,13 +72,46 @@ class MongoDBClient:
         result = await collection.insert_one(document)
         return result.inserted_id
 
+    async def insert_many(self, documents: List[Dict[str, Any]], collection_name: Optional[str] = None) -> List[Any]:
+        """Insert several documents in one round trip, into the main or a named collection."""
+        collection = self.db[collection_name] if collection_name else self.get_collection()
+        result = await collection.insert_many(documents, ordered=False)
+        return result.inserted_ids
+
+    async def create_timeseries_collection(
+        self,
+        collection_name: str,
+        time_field: str,
+        meta_field: Optional[str] = None,
+        granularity: str = "seconds",
+        expire_after_seconds: Optional[int] = None
+    ) -> None:
+        """Create a time-series collection unless it already exists."""
+        if self.db is None:
+            raise ValueError("Database is not initialized. Please call `connect()` first.")
+        if collection_name in await self.db.list_collection_names(filter={"name": collection_name}):
+            return
+        timeseries = {"timeField": time_field, "granularity": granularity}
+        if meta_field:
+            timeseries["metaField"] = meta_field
+        options = {"timeseries": timeseries}
+        if expire_after_seconds:
+            options["expireAfterSeconds"] = expire_after_seconds
+        await self.db.create_collection(collection_name, **options)
+        logger.info(f"Created time-series collection '{collection_name}'.")
+
     async def find(self, query: Dict[str, Any]) -> list:
         """Find documents in the collection that match the query."""
-        print(query)
+        logger.debug(f"Find in '{self.db_collection_name}': {query}")
         collection = self.get_collection()
         documents = await collection.find(query).to_list(length=None)
         return documents
 
+    async def update_one(self, query: Dict[str, Any], update: Dict[str, Any]) -> Any:
+        """Update a single document in the collection that matches the query."""
+        collection = self.get_collection()
+        return await collection.update_one(query, update)
+
     async def delete_one(self, query: Dict[str, Any]) -> int:
         """Delete a single document from the collection that matches the query."""
         collection = self.get_collection()
@@ -0,0 +1,128 @@
+import asyncio
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Iterable, Optional, Tuple
+from redis.asyncio import Redis
+import logging
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "__redis__:invalidate"
+
+# Marks a key whose value is being fetched; an invalidation in the meantime removes it
+_PENDING = object()
+
+
+class RedisClientSideCache:
+    """Local cache of read-mostly Redis keys kept coherent by server-assisted invalidation.
+
+    Redis tracks every key under the configured prefixes (``CLIENT TRACKING ... BCAST``)
+    and pushes the names of modified keys to a dedicated invalidation connection, which
+    evicts them locally. Entries also expire after ``ttl`` seconds as a safety net, and
+    the whole cache is dropped whenever the invalidation connection is lost.
+    """
+
+    def __init__(self, prefixes: Iterable[str], max_keys: int = 10000, ttl: float = 60.0, retry_interval: float = 1.0):
+        self.prefixes = tuple(prefixes)
+        self.max_keys = max_keys
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._listener: Optional[asyncio.Task] = None
+        self._tracking_client: Optional[Redis] = None
+        # Nothing is served from the cache until invalidations are flowing
+        self._active = False
+
+    def tracks(self, key: str) -> bool:
+        """Return whether the key is eligible for local caching."""
+        return self._active and key.startswith(self.prefixes)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return ``(hit, value)`` for a key."""
+        entry = self._entries.get(key)
+        if entry is None or entry[1] is _PENDING:
+            return False, None
+        expires_at, value = entry
+        if expires_at < monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def reserve(self, key: str) -> None:
+        """Mark a key as being fetched from Redis."""
+        self._entries[key] = (0.0, _PENDING)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_keys:
+            self._entries.popitem(last=False)
+
+    def fill(self, key: str, value: Any) -> None:
+        """Store a fetched value unless the key was invalidated while fetching it."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] is _PENDING:
+            self._entries[key] = (monotonic() + self.ttl, value)
+
+    def invalidate(self, keys: Optional[Iterable[str]]) -> None:
+        """Evict the given keys, or everything when ``keys`` is None."""
+        if keys is None:
+            self._entries.clear()
+            return
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def start(self, client: Redis, connection_kwargs: dict) -> None:
+        """Start the invalidation listener."""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen(client, connection_kwargs))
+
+    async def stop(self) -> None:
+        """Stop the invalidation listener and drop the cache."""
+        self._active = False
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self._close_tracking_client()
+        self._entries.clear()
+
+    async def _listen(self, client: Redis, connection_kwargs: dict) -> None:
+        while True:
+            pubsub = client.pubsub()
+            try:
+                # RESP2 redirect mode: the invalidation connection reports its id,
+                # then a dedicated connection enables broadcast tracking towards it
+                await pubsub.connect()
+                await pubsub.connection.send_command("CLIENT", "ID")
+                redirect_id = await pubsub.connection.read_response()
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+
+                self._tracking_client = await Redis(single_connection_client=True, **connection_kwargs)
+                await self._tracking_client.client_tracking_on(clientid=redirect_id, bcast=True, prefix=list(self.prefixes))
+                self._active = True
+                logger.info(f"Redis client-side caching enabled for prefixes {list(self.prefixes)}.")
+
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.invalidate(message["data"])
+                raise ConnectionError("Redis invalidation stream ended.")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Redis client-side cache invalidation lost, cache dropped: {e}")
+            finally:
+                self._active = False
+                self._entries.clear()
+                await self._close_tracking_client()
+                await pubsub.reset()
+            await asyncio.sleep(self.retry_interval)
+
+    async def _close_tracking_client(self) -> None:
+        if self._tracking_client is not None:
+            try:
+                await self._tracking_client.close()
+            except Exception:
+                pass
+            self._tracking_client = None
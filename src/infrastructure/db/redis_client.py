@@ -1,48 +1,129 @@
-from redis.asyncio import Redis
-from typing import Optional
+from redis.asyncio import BlockingConnectionPool, Redis
+from typing import Any, List, Optional, Sequence, Tuple, Union
+from src.infrastructure.db.redis_cache import RedisClientSideCache
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class RedisClient:
     """Class to encapsulate Redis operations."""
 
-    def __init__(self, host: str, port: int, db: int, password: Optional[str] = None):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        db: int,
+        password: Optional[str] = None,
+        max_connections: int = 50,
+        pool_timeout: float = 1.0,
+        socket_timeout: float = 1.0,
+        socket_connect_timeout: float = 1.0,
+        health_check_interval: int = 30,
+        client_cache_prefixes: Optional[Union[str, Sequence[str]]] = None,
+        client_cache_max_keys: int = 10000,
+        client_cache_ttl: float = 60.0
+    ):
         self.host = host
         self.port = port
         self.db = db
         self.password = password
+        self.max_connections = max_connections
+        self.pool_timeout = pool_timeout
+        self.socket_timeout = socket_timeout
+        self.socket_connect_timeout = socket_connect_timeout
+        self.health_check_interval = health_check_interval
         self.client: Optional[Redis] = None
+        self.pool: Optional[BlockingConnectionPool] = None
+
+        # Comma separated in the environment, e.g. "route:,session:,deny:"
+        if isinstance(client_cache_prefixes, str):
+            client_cache_prefixes = [prefix.strip() for prefix in client_cache_prefixes.split(",") if prefix.strip()]
+        self.cache: Optional[RedisClientSideCache] = (
+            RedisClientSideCache(client_cache_prefixes, client_cache_max_keys, client_cache_ttl)
+            if client_cache_prefixes else None
+        )
+
+    def _connection_kwargs(self) -> dict:
+        return {
+            "host": self.host,
+            "port": self.port,
+            "db": self.db,
+            "password": self.password,
+            "socket_timeout": self.socket_timeout,
+            "socket_connect_timeout": self.socket_connect_timeout,
+            "health_check_interval": self.health_check_interval,
+            "encoding": "utf-8",
+            "decode_responses": True,
+        }
 
     async def connect(self) -> None:
         """Connect to the Redis server."""
         if not self.client:
-            self.client = await Redis(
-                host=self.host,
-                port=self.port,
-                db=self.db,
-                password=self.password,
-                encoding="utf-8",
-                decode_responses=True
+            # A blocking pool waits up to pool_timeout for a free connection instead of failing
+            self.pool = BlockingConnectionPool(
+                max_connections=self.max_connections,
+                timeout=self.pool_timeout,
+                **self._connection_kwargs()
             )
-            print(f"Connected to Redis at {self.host}:{self.port}")
+            self.client = await Redis(connection_pool=self.pool)
+            if self.cache:
+                await self.cache.start(self.client, self._connection_kwargs())
+            logger.info(f"Connected to Redis at {self.host}:{self.port} (max_connections={self.max_connections})")
 
     async def disconnect(self) -> None:
         """Disconnect from the Redis server."""
         if self.client:
+            if self.cache:
+                await self.cache.stop()
             await self.client.close()
-            print("Disconnected from Redis.")
+            await self.pool.disconnect()
+            logger.info("Disconnected from Redis.")
             self.client = None
+            self.pool = None
 
     async def get(self, key: str) -> Optional[str]:
-        """Get a value from Redis by key."""
+        """Get a value from Redis by key, served locally for client-side cached keys."""
         if not self.client:
             raise ConnectionError("Redis client is not connected.")
+        if self.cache and self.cache.tracks(key):
+            hit, value = self.cache.get(key)
+            if hit:
+                return value
+            self.cache.reserve(key)
+            value = await self.client.get(key)
+            self.cache.fill(key, value)
+            return value
         return await self.client.get(key)
 
-    async def set(self, key: str, value: str, expire: Optional[int] = None) -> bool:
-        """Set a key-value pair in Redis with an optional expiration time."""
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[str]]:
+        """Get several values in a single round trip, skipping keys cached locally."""
         if not self.client:
             raise ConnectionError("Redis client is not connected.")
-        return await self.client.set(key, value, ex=expire)
+        values: List[Optional[str]] = [None] * len(keys)
+        missing: List[Tuple[int, str]] = []
+        for index, key in enumerate(keys):
+            if self.cache and self.cache.tracks(key):
+                hit, value = self.cache.get(key)
+                if hit:
+                    values[index] = value
+                    continue
+                self.cache.reserve(key)
+            missing.append((index, key))
+
+        if missing:
+            fetched = await self.client.mget([key for _, key in missing])
+            for (index, key), value in zip(missing, fetched):
+                values[index] = value
+                if self.cache and self.cache.tracks(key):
+                    self.cache.fill(key, value)
+        return values
+
+    async def set(self, key: str, value: str, expire: Optional[int] = None, nx: bool = False) -> bool:
+        """Set a key-value pair in Redis with an optional expiration time, only if it does not exist when nx is set."""
+        if not self.client:
+            raise ConnectionError("Redis client is not connected.")
+        return await self.client.set(key, value, ex=expire, nx=nx)
 
     async def delete(self, key: str) -> int:
         """Delete a key from Redis."""
@@ -50,11 +131,40 @@ class RedisClient:
             raise ConnectionError("Redis client is not connected.")
         return await self.client.delete(key)
 
+    def pipeline(self, transaction: bool = False):
+        """
+        Create a pipeline to send several commands in one round trip.
+
+        Usage:
+            async with redis_client.pipeline() as pipe:
+                pipe.get("a").incr("b")
+                a, b = await pipe.execute()
+        """
+        if not self.client:
+            raise ConnectionError("Redis client is not connected.")
+        return self.client.pipeline(transaction=transaction)
+
+    async def batch(self, commands: Sequence[Tuple[Any, ...]], raise_on_error: bool = True) -> List[Any]:
+        """
+        Execute several commands in one round trip.
+
+        Args:
+            commands (Sequence[Tuple[Any, ...]]): Commands as tuples, e.g. ``("GET", "key")``.
+            raise_on_error (bool): Raise the first command error instead of returning it in the results.
+
+        Returns:
+            List[Any]: The result of each command, in order.
+        """
+        async with self.pipeline() as pipe:
+            for command in commands:
+                pipe.execute_command(*command)
+            return await pipe.execute(raise_on_error=raise_on_error)
+
     async def ping(self) -> bool:
         """Ping the Redis server to check connection status."""
         if not self.client:
             raise ConnectionError("Redis client is not connected.")
-        return await self.client.ping() == "PONG"
+        return await self.client.ping()
 
     def __getattr__(self, name: str):
         """
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+from bson import ObjectId
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _to_json(document: Dict[str, Any]) -> str:
+    return json.dumps(document, default=lambda value: value.isoformat() if isinstance(value, datetime) else str(value))
+
+
+class SQLiteClient:
+    """Embedded registry store: a SQLite file with the whole collection indexed in memory.
+
+    Reads never touch the file; they are served from a dictionary loaded once in
+    ``connect()`` plus an index by ``service_name``. Writes go to SQLite in a worker
+    thread and are applied to the in-memory copy only once committed.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the SQLite client.
+
+        Args:
+            path (str): Path of the SQLite database file, created if missing.
+        """
+        self.path = Path(path)
+        self.connection: Optional[sqlite3.Connection] = None
+        self._documents: Dict[str, Dict[str, Any]] = {}
+        self._by_service_name: Dict[str, Set[str]] = {}
+        # sqlite3 connections must not be used by two threads at once
+        self._write_lock = asyncio.Lock()
+
+    async def connect(self) -> None:
+        """Open the database and load every document into memory."""
+        if self.connection:
+            logger.info("SQLite registry store already connected.")
+            return
+        rows = await asyncio.to_thread(self._open)
+        for id, data in rows:
+            self._index(json.loads(data) | {"_id": ObjectId(id)})
+        logger.info(f"Loaded {len(self._documents)} documents from SQLite registry store '{self.path}'.")
+
+    async def disconnect(self) -> None:
+        """Close the database file."""
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+            logger.info("Disconnected from SQLite registry store.")
+
+    async def ping(self) -> bool:
+        """Check that the store is open."""
+        if not self.connection:
+            raise ConnectionError("SQLite registry store is not connected.")
+        return True
+
+    async def insert_one(self, document: Dict[str, Any]) -> ObjectId:
+        """Insert a single document, assigning it an ObjectId like MongoDB does."""
+        document = {**document, "_id": document.get("_id") or ObjectId()}
+        id = str(document["_id"])
+        data = _to_json({key: value for key, value in document.items() if key != "_id"})
+        await self._write("INSERT INTO microservices (id, data) VALUES (?, ?)", (id, data))
+        self._index(document)
+        return document["_id"]
+
+    async def find(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Find the documents whose top-level fields equal the values in the query."""
+        if "_id" in query:
+            document = self._documents.get(str(query["_id"]))
+            candidates = [document] if document else []
+        elif "service_name" in query:
+            candidates = [self._documents[id] for id in self._by_service_name.get(query["service_name"], ())]
+        else:
+            candidates = self._documents.values()
+        # Shallow copies, so callers adding keys do not change the index
+        return [
+            dict(document) for document in candidates
+            if all(document.get(field) == value for field, value in query.items())
+        ]
+
+    async def update_one(self, id: str, fields: Dict[str, Any]) -> int:
+        """Set the given fields of a document by ID and return the number of updated documents."""
+        current = self._documents.get(id)
+        if current is None:
+            return 0
+        document = {**current, **fields}
+        data = _to_json({key: value for key, value in document.items() if key != "_id"})
+        await self._write("UPDATE microservices SET data = ? WHERE id = ?", (data, id))
+        self._unindex(id)
+        self._index(document)
+        return 1
+
+    async def delete_one(self, id: str) -> int:
+        """Delete a document by ID and return the number of deleted documents."""
+        if id not in self._documents:
+            return 0
+        await self._write("DELETE FROM microservices WHERE id = ?", (id,))
+        self._unindex(id)
+        return 1
+
+    def _open(self) -> List[tuple]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS microservices (id TEXT PRIMARY KEY, data TEXT NOT NULL)")
+        self.connection.commit()
+        return self.connection.execute("SELECT id, data FROM microservices").fetchall()
+
+    async def _write(self, statement: str, parameters: tuple) -> None:
+        if not self.connection:
+            raise ConnectionError("SQLite registry store is not connected.")
+        async with self._write_lock:
+            await asyncio.to_thread(self._execute, statement, parameters)
+
+    def _execute(self, statement: str, parameters: tuple) -> None:
+        with self.connection:
+            self.connection.execute(statement, parameters)
+
+    def _index(self, document: Dict[str, Any]) -> None:
+        id = str(document["_id"])
+        self._documents[id] = document
+        self._by_service_name.setdefault(document.get("service_name"), set()).add(id)
+
+    def _unindex(self, id: str) -> None:
+        document = self._documents.pop(id)
+        ids = self._by_service_name.get(document.get("service_name"))
+        if ids:
+            ids.discard(id)
+            if not ids:
+                del self._by_service_name[document.get("service_name")]
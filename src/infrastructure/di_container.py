@@ -1,12 +1,31 @@
 from dependency_injector import containers, providers
 from src.infrastructure.db.mongo_client import MongoDBClient
+from src.infrastructure.db.sqlite_client import SQLiteClient
 from src.core.repositories.db_repository import DBRepository
+from src.core.repositories.sqlite_repository import SQLiteRepository
 from src.infrastructure.pika import PikaClient
 from src.infrastructure.db.redis_client import RedisClient
+from src.infrastructure.http_client import UpstreamHttpClient
+from src.infrastructure.dns_cache import DnsCache
+from src.infrastructure.rabbitmq_rpc import RabbitMQRpcClient
+from src.infrastructure.registry_snapshot import RegistrySnapshot
+from src.infrastructure.health_monitor import HealthMonitor
+from src.infrastructure.usage_meter import UsageMeter
+from src.infrastructure.traffic_mirror import TrafficMirror
+from src.infrastructure.traffic_capture import TrafficCapture
 from src.core.repositories.rabbitmq_repository import RabbitMQRepository
 from src.services.gateway_service import GatewayService
 from src.services.ms_service import MicroserviceService
+from src.services.batch_service import BatchService
 from src.core.use_cases.rabbitmq.consume_user_auth_queue import ConsumeUserAuthQueue
+from src.utils.admission_controller import AdmissionController
+from src.utils.drain import DrainController
+from src.utils.heavy_hitters import HeavyHitterTracker
+from src.utils.deny_list import DenyList
+from src.utils.openapi_aggregator import OpenApiAggregator
+from src.utils.idempotency import IdempotencyStore
+from src.utils.memory_budget import MemoryBudget
+from src.utils.profiling import EventLoopLagMonitor, MemoryProfiler, SamplingProfiler
 
 class Container(containers.DeclarativeContainer):
     """Dependency Injection Container for the Gateway Service."""
@@ -21,13 +40,26 @@ class Container(containers.DeclarativeContainer):
         db_collection=config.db_collection
     )
 
+    # Embedded registry store, used instead of MongoDB when REGISTRY_BACKEND=sqlite (Singleton)
+    sqlite_client = providers.Singleton(
+        SQLiteClient,
+        path=config.registry_sqlite_path
+    )
+
     # Redis Client (Singleton using the new RedisClient class)
     redis_client = providers.Singleton(
         RedisClient,
         host=config.redis_host,
         port=config.redis_port,
         db=config.redis_db,
-        password=config.redis_password
+        password=config.redis_password,
+        max_connections=config.redis_max_connections,
+        pool_timeout=config.redis_pool_timeout,
+        socket_timeout=config.redis_socket_timeout,
+        socket_connect_timeout=config.redis_connect_timeout,
+        client_cache_prefixes=config.redis_client_cache_prefixes,
+        client_cache_max_keys=config.redis_client_cache_max_keys,
+        client_cache_ttl=config.redis_client_cache_ttl
     )
 
     # RabbitMQ Client (Singleton)
@@ -36,31 +68,192 @@ class Container(containers.DeclarativeContainer):
         rabbitmq_host=config.rabbitmq_host
     )
 
-    db_repository = providers.Factory(
-        DBRepository,
-        client=mongo_client
+    # Resolver cache for upstream host names (Singleton)
+    dns_cache = providers.Singleton(
+        DnsCache,
+        ttl=config.dns_cache_ttl,
+        stale_ttl=config.dns_cache_stale_ttl,
+        resolve_timeout=config.dns_resolve_timeout
+    )
+
+    # Shared upstream HTTP connection pool (Singleton)
+    http_client = providers.Singleton(
+        UpstreamHttpClient,
+        max_connections=config.upstream_max_connections,
+        max_keepalive_connections=config.upstream_max_keepalive,
+        dns_cache=dns_cache
+    )
+
+    # Local snapshot of the registry used to serve routes at boot (Singleton)
+    registry_snapshot = providers.Singleton(
+        RegistrySnapshot,
+        path=config.registry_snapshot_path
+    )
+
+    # In-flight request tracking and shutdown draining state (Singleton)
+    drain_controller = providers.Singleton(
+        DrainController,
+        grace_period=config.drain_grace_period,
+        timeout=config.drain_timeout
+    )
+
+    # Background dependency health monitor (Singleton)
+    health_monitor = providers.Singleton(
+        HealthMonitor,
+        mongo_client=mongo_client,
+        redis_client=redis_client,
+        http_client=http_client,
+        rabbitmq_host=config.rabbitmq_host,
+        interval=config.health_interval,
+        probe_timeout=config.health_probe_timeout,
+        required=config.health_required_dependencies,
+        probe_mongodb=config.mongodb_enabled,
+        drain_controller=drain_controller
+    )
+
+    # Per-consumer usage counters flushed to a time-series collection (Singleton)
+    usage_meter = providers.Singleton(
+        UsageMeter,
+        mongo_client=mongo_client,
+        collection_name=config.usage_collection,
+        bucket_seconds=config.usage_bucket_seconds,
+        flush_interval=config.usage_flush_interval,
+        max_keys=config.usage_max_keys,
+        retention_seconds=config.usage_retention_seconds
+    )
+
+    # Process-wide budget for buffered request and response bodies (Singleton)
+    memory_budget = providers.Singleton(
+        MemoryBudget,
+        max_bytes=config.memory_budget_bytes,
+        max_body_size=config.max_body_size,
+        wait_timeout=config.memory_budget_wait_timeout
+    )
+
+    # Background sender of mirrored requests to shadow upstreams (Singleton)
+    traffic_mirror = providers.Singleton(
+        TrafficMirror,
+        queue_size=config.mirror_queue_size,
+        workers=config.mirror_workers,
+        max_connections=config.mirror_max_connections,
+        timeout=config.mirror_timeout,
+        max_body_size=config.mirror_max_body_size,
+        memory_budget=memory_budget
+    )
+
+    # Opt-in sampled recorder of proxied requests (Singleton)
+    traffic_capture = providers.Singleton(
+        TrafficCapture,
+        enabled=config.capture_enabled,
+        directory=config.capture_directory,
+        sample_rate=config.capture_sample_rate,
+        capture_bodies=config.capture_bodies,
+        max_file_size=config.capture_max_file_size,
+        max_files=config.capture_max_files
+    )
+
+    # Idempotency-Key reservations and stored responses in Redis (Singleton)
+    idempotency_store = providers.Singleton(
+        IdempotencyStore,
+        redis_client=redis_client,
+        lock_ttl=config.idempotency_lock_ttl,
+        max_body_size=config.idempotency_max_body_size,
+        memory_budget=memory_budget
+    )
+
+    # Registry repository of the backend selected with REGISTRY_BACKEND
+    db_repository = providers.Selector(
+        config.registry_backend,
+        mongodb=providers.Singleton(DBRepository, client=mongo_client),
+        sqlite=providers.Singleton(SQLiteRepository, client=sqlite_client)
     )
 
-    rabbitmq_repository = providers.Factory(
+    # RabbitMQ request/reply client for queue-backed paths (Singleton owning its own connection)
+    rabbitmq_rpc = providers.Singleton(
+        RabbitMQRpcClient,
+        rabbitmq_host=config.rabbitmq_host,
+        max_pending=config.rabbitmq_rpc_max_pending
+    )
+
+    rabbitmq_repository = providers.Singleton(
         RabbitMQRepository,
         pika_client=rabbitmq_client
     )
 
     # Gateway Service (Singleton)
-    gateway_service = providers.Factory(
+    gateway_service = providers.Singleton(
         GatewayService,
-        mongo_client=mongo_client,
-        redis_client=redis_client
+        db_repository=db_repository,
+        http_client=http_client
     )
 
-    # MicroserviceRegistrationService Factory with dependencies
-    microservice_service = providers.Factory(
+    # Microservice registration service (Singleton, it and its use cases hold no per-request state)
+    microservice_service = providers.Singleton(
         MicroserviceService,
         db_repository=db_repository
     )
 
-    # Consume User Auth Queue use case
-    consume_user_auth_queue = providers.Factory(
+    # Batch Service (Singleton, it holds no per-request state)
+    batch_service = providers.Singleton(
+        BatchService,
+        max_requests=config.batch_max_requests,
+        max_concurrency=config.batch_max_concurrency
+    )
+
+    # Consume User Auth Queue use case (Singleton)
+    consume_user_auth_queue = providers.Singleton(
         ConsumeUserAuthQueue,
         repository=rabbitmq_repository
     )
+
+    # Ingress admission controller (Singleton shared by the middleware and the dynamic router)
+    admission_controller = providers.Singleton(
+        AdmissionController,
+        max_inflight=config.admission_max_inflight,
+        max_queue=config.admission_max_queue,
+        target_delay=config.admission_target_delay,
+        interval=config.admission_interval
+    )
+
+    # Sketch-based top clients, routes and error sources, optionally throttling clients (Singleton)
+    heavy_hitter_tracker = providers.Singleton(
+        HeavyHitterTracker,
+        width=config.heavy_hitter_width,
+        depth=config.heavy_hitter_depth,
+        capacity=config.heavy_hitter_capacity,
+        window_seconds=config.heavy_hitter_window,
+        throttle_rate=config.heavy_hitter_throttle_rate
+    )
+
+    # Denied networks and revoked credentials, synchronized from Redis (Singleton)
+    deny_list = providers.Singleton(
+        DenyList,
+        redis_client=redis_client,
+        networks_key=config.deny_list_networks_key,
+        credentials_key=config.deny_list_credentials_key,
+        channel=config.deny_list_channel,
+        resync_interval=config.deny_list_resync_interval
+    )
+
+    # Background merge of the microservices' OpenAPI documents (Singleton)
+    openapi_aggregator = providers.Singleton(
+        OpenApiAggregator,
+        http_client=http_client,
+        spec_path=config.openapi_spec_path,
+        refresh_interval=config.openapi_refresh_interval,
+        fetch_timeout=config.openapi_fetch_timeout,
+        retry_backoff=config.openapi_retry_backoff
+    )
+
+    # Profiling tools, only started or exposed when profiling is enabled (Singletons)
+    loop_lag_monitor = providers.Singleton(
+        EventLoopLagMonitor,
+        threshold=config.loop_lag_threshold
+    )
+
+    cpu_profiler = providers.Singleton(
+        SamplingProfiler,
+        max_seconds=config.profiler_max_seconds
+    )
+
+    memory_profiler = providers.Singleton(MemoryProfiler)
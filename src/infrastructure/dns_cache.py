@@ -0,0 +1,188 @@
+import asyncio
+import ipaddress
+import socket
+from time import monotonic
+from typing import Dict, Iterable, List, Optional
+import httpcore
+from src.infrastructure import metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _DnsEntry:
+    __slots__ = ("addresses", "expires_at", "refresh_at", "failures", "last_used", "next_index")
+
+    def __init__(self):
+        self.addresses: List[str] = []
+        self.expires_at = 0.0
+        self.refresh_at = 0.0
+        self.failures = 0
+        self.last_used = monotonic()
+        self.next_index = 0
+
+
+class DnsCache:
+    """Resolves upstream host names in the background and serves the addresses from memory.
+
+    Hosts are resolved as soon as they are registered and refreshed before their
+    TTL runs out, so opening a connection never waits for the resolver. When a
+    refresh fails, the previous addresses keep being served for up to
+    ``stale_ttl`` seconds. All A and AAAA records are kept, and successive lookups
+    start from a different address to spread new connections across them.
+    Hosts that are not used for ``stale_ttl`` seconds are forgotten.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        refresh_ahead: float = 0.2,
+        stale_ttl: float = 3600.0,
+        resolve_timeout: float = 2.0,
+        refresh_interval: float = 1.0
+    ):
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.stale_ttl = stale_ttl
+        self.resolve_timeout = resolve_timeout
+        self.refresh_interval = refresh_interval
+        self._entries: Dict[str, _DnsEntry] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def add_host(self, host: Optional[str]) -> None:
+        """Start resolving a host name; IP literals are ignored."""
+        if not host or host in self._entries or _is_ip_address(host):
+            return
+        self._entries[host] = _DnsEntry()
+        self._wakeup.set()
+
+    def lookup(self, host: str) -> List[str]:
+        """
+        Get the cached addresses of a host without waiting.
+
+        Args:
+            host (str): The host name.
+
+        Returns:
+            List[str]: The addresses, rotated by one on each call, or an empty list if nothing usable is cached.
+        """
+        entry = self._entries.get(host)
+        if entry is None or not entry.addresses:
+            return []
+        now = monotonic()
+        if now > entry.expires_at + self.stale_ttl:
+            return []
+        if now > entry.expires_at:
+            metrics.DNS_STALE_SERVED.inc()
+        entry.last_used = now
+        index = entry.next_index % len(entry.addresses)
+        entry.next_index = index + 1
+        return entry.addresses[index:] + entry.addresses[:index]
+
+    async def start(self) -> None:
+        """Resolve the registered hosts and keep refreshing them in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop refreshing."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            await self._refresh_due()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _refresh_due(self) -> None:
+        now = monotonic()
+        for host in [host for host, entry in self._entries.items() if now - entry.last_used > self.stale_ttl]:
+            del self._entries[host]
+        due = [host for host, entry in self._entries.items() if now >= entry.refresh_at]
+        if due:
+            await asyncio.gather(*(self._refresh(host) for host in due))
+
+    async def _refresh(self, host: str) -> None:
+        entry = self._entries.get(host)
+        if entry is None:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await asyncio.wait_for(
+                loop.getaddrinfo(host, None, type=socket.SOCK_STREAM), self.resolve_timeout
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            entry.failures += 1
+            # Retry soon, backing off, while the previous addresses keep being served
+            entry.refresh_at = monotonic() + min(self.ttl, 2 ** entry.failures)
+            metrics.DNS_RESOLUTIONS.labels("failure").inc()
+            logger.warning(f"Failed to resolve '{host}' (attempt {entry.failures}), serving cached addresses: {e}")
+            return
+
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        now = monotonic()
+        entry.addresses = addresses
+        entry.expires_at = now + self.ttl
+        entry.refresh_at = now + self.ttl * (1 - self.refresh_ahead)
+        entry.failures = 0
+        metrics.DNS_RESOLUTIONS.labels("success").inc()
+        logger.debug(f"Resolved '{host}' to {addresses}.")
+
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """httpcore network backend that connects to addresses from the DNS cache.
+
+    TLS still uses the host name for SNI and certificate checks, since httpcore
+    passes it separately when starting TLS. Hosts that are not cached fall back
+    to the default backend and the system resolver.
+    """
+
+    # Addresses tried before giving up on a host with several records
+    MAX_ATTEMPTS = 2
+
+    def __init__(self, dns_cache: DnsCache, backend: Optional[httpcore.AsyncNetworkBackend] = None):
+        self.dns_cache = dns_cache
+        self.backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable] = None
+    ) -> httpcore.AsyncNetworkStream:
+        addresses = self.dns_cache.lookup(host)[:self.MAX_ATTEMPTS] or [host]
+        for attempt, address in enumerate(addresses, start=1):
+            try:
+                return await self.backend.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                if attempt == len(addresses):
+                    raise
+                logger.warning(f"Failed to connect to {host} at {address}:{port}, trying the next address: {e}")
+
+    async def connect_unix_socket(self, path: str, timeout: Optional[float] = None, socket_options: Optional[Iterable] = None):
+        return await self.backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self.backend.sleep(seconds)
+
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+        return True
+    except ValueError:
+        return False
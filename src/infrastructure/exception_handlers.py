@@ -14,6 +14,31 @@ class DuplicateMsException(HTTPException):
         self.service_name = service_name
         self.code = code
 
+class UpstreamOverloadedException(HTTPException):
+    def __init__(self, service_name: str, retry_after: int = 1, code: int = 503):
+        super().__init__(
+            status_code=code,
+            detail=f"Microservice {service_name} is overloaded, please retry later.",
+            headers={"Retry-After": str(retry_after)}
+        )
+        self.service_name = service_name
+        self.code = code
+
+class PayloadTooLargeException(HTTPException):
+    def __init__(self, max_size: int, code: int = 413):
+        super().__init__(status_code=code, detail=f"Request body exceeds the limit of {max_size} bytes.")
+        self.max_size = max_size
+        self.code = code
+
+class MemoryBudgetExhaustedException(HTTPException):
+    def __init__(self, retry_after: int = 1, code: int = 503):
+        super().__init__(
+            status_code=code,
+            detail="Gateway is buffering too much data, please retry later.",
+            headers={"Retry-After": str(retry_after)}
+        )
+        self.code = code
+
 def register_exception_handlers(app: FastAPI):
     """
     Register global exception handlers for the FastAPI app.
@@ -28,6 +53,7 @@ def register_exception_handlers(app: FastAPI):
         return JSONResponse(
             status_code=exc.status_code,
             content={"status": "error", "data": None, "message": exc.detail},
+            headers=getattr(exc, "headers", None),
         )
 
     @app.exception_handler(RequestValidationError)
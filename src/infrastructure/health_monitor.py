@@ -0,0 +1,162 @@
+import asyncio
+from datetime import datetime, timezone
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Sequence, Union
+from src.infrastructure.db.mongo_client import MongoDBClient
+from src.infrastructure.db.redis_client import RedisClient
+from src.infrastructure.http_client import UpstreamHttpClient
+from src.utils.drain import DrainController
+import logging
+
+logger = logging.getLogger(__name__)
+
+RABBITMQ_PORT = 5672
+
+
+class HealthMonitor:
+    """Probes the gateway dependencies in the background and keeps the latest results in memory.
+
+    Health and readiness endpoints only read the cached results, so probe traffic
+    towards MongoDB, Redis, RabbitMQ and the upstreams does not grow with the number
+    of callers.
+    """
+
+    def __init__(
+        self,
+        mongo_client: MongoDBClient,
+        redis_client: RedisClient,
+        http_client: UpstreamHttpClient,
+        rabbitmq_host: Optional[str] = None,
+        interval: float = 5.0,
+        probe_timeout: float = 2.0,
+        required: Union[str, Sequence[str]] = ("mongodb", "redis"),
+        probe_mongodb: bool = True,
+        drain_controller: Optional[DrainController] = None
+    ):
+        self.mongo_client = mongo_client
+        self.redis_client = redis_client
+        self.http_client = http_client
+        self.rabbitmq_host = rabbitmq_host
+        self.interval = interval
+        self.probe_timeout = probe_timeout
+        # Comma separated in the environment; upstreams are never required
+        if isinstance(required, str):
+            required = [name.strip() for name in required.split(",") if name.strip()]
+        self.required = frozenset(required)
+        # Not probed when nothing uses it, such as with the embedded registry store
+        self.probe_mongodb = probe_mongodb
+        # Readiness fails as soon as the gateway starts draining
+        self.drain_controller = drain_controller
+        # Results older than this are reported as stale and fail readiness
+        self.stale_after = interval * 3
+
+        self._upstreams: Dict[str, str] = {}
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._last_round: Optional[float] = None
+        self._ready = False
+        self._task: Optional[asyncio.Task] = None
+
+    def add_upstream(self, service_name: str, base_url: str) -> None:
+        """Probe an upstream microservice from the next round on."""
+        self._upstreams[service_name] = base_url
+
+    def remove_upstream(self, service_name: str) -> None:
+        """Stop probing an upstream microservice."""
+        self._upstreams.pop(service_name, None)
+
+    async def start(self) -> None:
+        """Start probing in the background; readiness fails until the first round completes."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop background probing."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.probe_all()
+            except Exception as e:
+                logger.error(f"Health probe round failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def probe_all(self) -> None:
+        """Probe every dependency concurrently and publish the results."""
+        probes: Dict[str, Callable[[], Awaitable[Any]]] = {"redis": self.redis_client.ping}
+        if self.probe_mongodb:
+            probes["mongodb"] = self.mongo_client.ping
+        if self.rabbitmq_host:
+            probes["rabbitmq"] = self._probe_rabbitmq
+        for service_name, base_url in list(self._upstreams.items()):
+            probes[f"upstream:{service_name}"] = self._upstream_probe(base_url)
+
+        names = list(probes)
+        results = await asyncio.gather(*(self._probe(name, probes[name]) for name in names))
+        # Publish a new dict instead of mutating the one readers may hold
+        self._results = dict(zip(names, results))
+        self._last_round = monotonic()
+        self._ready = all(
+            self._results[name]["healthy"] for name in self.required if name in self._results
+        )
+
+    async def _probe(self, name: str, probe: Callable[[], Awaitable[Any]]) -> Dict[str, Any]:
+        start = monotonic()
+        try:
+            result = await asyncio.wait_for(probe(), self.probe_timeout)
+            healthy, detail = result is not False, None
+        except asyncio.TimeoutError:
+            healthy, detail = False, f"timed out after {self.probe_timeout}s"
+        except Exception as e:
+            healthy, detail = False, str(e) or type(e).__name__
+        if not healthy:
+            logger.warning(f"Health probe '{name}' failed: {detail}")
+        return {
+            "healthy": healthy,
+            "latency_ms": round((monotonic() - start) * 1000, 2),
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+            "detail": detail,
+        }
+
+    async def _probe_rabbitmq(self) -> bool:
+        # A TCP handshake is enough to know the broker is reachable without a blocking AMQP client
+        _, writer = await asyncio.open_connection(self.rabbitmq_host, RABBITMQ_PORT)
+        writer.close()
+        await writer.wait_closed()
+        return True
+
+    def _upstream_probe(self, base_url: str) -> Callable[[], Awaitable[bool]]:
+        async def probe() -> bool:
+            response = await self.http_client.get_client().head(base_url, timeout=self.probe_timeout)
+            if response.status_code >= 500:
+                raise ConnectionError(f"status {response.status_code}")
+            return True
+        return probe
+
+    def age(self) -> Optional[float]:
+        """Seconds since the last probe round, or None before the first one."""
+        return None if self._last_round is None else monotonic() - self._last_round
+
+    def is_ready(self) -> bool:
+        """Whether every required dependency was healthy in a recent enough probe round and the gateway is not draining."""
+        if self.drain_controller and self.drain_controller.draining:
+            return False
+        age = self.age()
+        return self._ready and age is not None and age <= self.stale_after
+
+    def report(self) -> Dict[str, Any]:
+        """The cached probe results with their staleness."""
+        age = self.age()
+        return {
+            "ready": self.is_ready(),
+            "stale": age is None or age > self.stale_after,
+            "age_seconds": None if age is None else round(age, 3),
+            "draining": bool(self.drain_controller and self.drain_controller.draining),
+            "dependencies": self._results,
+        }
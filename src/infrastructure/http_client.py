@@ -0,0 +1,71 @@
+import httpcore
+from httpx import AsyncClient, AsyncHTTPTransport, Limits, Timeout, create_ssl_context
+from typing import Optional
+from src.infrastructure.dns_cache import CachingNetworkBackend, DnsCache
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CachingDnsTransport(AsyncHTTPTransport):
+    """httpx transport whose connection pool connects to upstream addresses from the DNS cache."""
+
+    def __init__(self, dns_cache: DnsCache, limits: Limits):
+        super().__init__(limits=limits)
+        # Built here rather than patched in, since httpx does not expose the httpcore network backend
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=CachingNetworkBackend(dns_cache),
+        )
+
+
+class UpstreamHttpClient:
+    """Class to encapsulate the shared HTTP connection pool used to reach upstream microservices."""
+
+    def __init__(
+        self,
+        max_connections: int = 1000,
+        max_keepalive_connections: int = 200,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 5.0,
+        dns_cache: Optional[DnsCache] = None
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.dns_cache = dns_cache
+        self.client: Optional[AsyncClient] = None
+
+    async def connect(self) -> None:
+        """Create the shared connection pool."""
+        if not self.client:
+            limits = Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry
+            )
+            transport = CachingDnsTransport(self.dns_cache, limits) if self.dns_cache else AsyncHTTPTransport(limits=limits)
+            self.client = AsyncClient(transport=transport, timeout=Timeout(self.timeout))
+            logger.info(f"Upstream HTTP pool created (max_connections={self.max_connections}).")
+
+    async def disconnect(self) -> None:
+        """Close the shared connection pool."""
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+            logger.info("Upstream HTTP pool closed.")
+
+    def get_client(self) -> AsyncClient:
+        """
+        Get the shared HTTP client.
+
+        Returns:
+            AsyncClient: The shared httpx client.
+        """
+        if not self.client:
+            raise ConnectionError("Upstream HTTP client is not connected.")
+        return self.client
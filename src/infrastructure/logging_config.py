@@ -1,20 +1,36 @@
+import atexit
 import logging
 import logging.config
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from src.utils.request_context import current_request_id
+
+
+class RequestContextFilter(logging.Filter):
+    """Add the request ID of the current context to every log record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Records handed to the file writer thread keep the ID captured on the request's thread
+        record.request_id = current_request_id() or getattr(record, "request_id", "-")
+        return True
 
-# Create logs directory if it does not exist
-Path("logs").mkdir(parents=True, exist_ok=True)
 
 LOGGING_CONFIG = {
     "version": 1,
     "disable_existing_loggers": False,
+    "filters": {
+        "request_context": {
+            "()": RequestContextFilter,
+        },
+    },
     "formatters": {
         "standard": {
-            "format": "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+            "format": "%(asctime)s [%(levelname)s] %(name)s [%(request_id)s]: %(message)s",
             "datefmt": "%Y-%m-%d %H:%M:%S",
         },
         "json": {
-            "format": '{"timestamp": "%(asctime)s", "level": "%(levelname)s", "logger": "%(name)s", "message": "%(message)s"}',
+            "format": '{"timestamp": "%(asctime)s", "level": "%(levelname)s", "logger": "%(name)s", "request_id": "%(request_id)s", "message": "%(message)s"}',
             "datefmt": "%Y-%m-%d %H:%M:%S",
         },
     },
@@ -23,18 +39,21 @@ LOGGING_CONFIG = {
             "level": "DEBUG",
             "formatter": "standard",
             "class": "logging.StreamHandler",
+            "filters": ["request_context"],
         },
         "file": {
             "level": "INFO",
             "formatter": "json",
             "class": "logging.FileHandler",
             "filename": "logs/application.log",
+            "filters": ["request_context"],
         },
         "error_file": {
             "level": "ERROR",
             "formatter": "json",
             "class": "logging.FileHandler",
             "filename": "logs/errors.log",
+            "filters": ["request_context"],
         },
     },
     "loggers": {
@@ -63,5 +82,31 @@ LOGGING_CONFIG = {
 
 def setup_logging():
     """Set up logging configuration."""
+    # Create logs directory if it does not exist
+    Path("logs").mkdir(parents=True, exist_ok=True)
     logging.basicConfig(level=logging.WARNING)
     logging.config.dictConfig(LOGGING_CONFIG)
+    _offload_file_handlers()
+
+def _offload_file_handlers():
+    """Write every configured log file from a background thread instead of the event loop."""
+    loggers = [logging.getLogger()] + [logging.getLogger(name) for name in LOGGING_CONFIG["loggers"] if name]
+    # Each file handler gets its own queue, shared by every logger it is attached to, so records
+    # still reach exactly the files they did before
+    queue_handlers = {}
+    for logger in loggers:
+        for handler in list(logger.handlers):
+            if not isinstance(handler, logging.FileHandler):
+                continue
+            if handler not in queue_handlers:
+                log_queue = queue.SimpleQueue()
+                queue_handler = QueueHandler(log_queue)
+                queue_handler.setLevel(handler.level)
+                # Capture the request ID before the record leaves the request's context
+                queue_handler.addFilter(RequestContextFilter())
+                listener = QueueListener(log_queue, handler, respect_handler_level=True)
+                listener.start()
+                atexit.register(listener.stop)
+                queue_handlers[handler] = queue_handler
+            logger.removeHandler(handler)
+            logger.addHandler(queue_handlers[handler])
@@ -0,0 +1,203 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# Per-upstream bulkhead metrics
+UPSTREAM_CONCURRENCY_LIMIT = Gauge(
+    "gateway_upstream_concurrency_limit",
+    "Current adaptive concurrency limit for an upstream microservice.",
+    ["service"]
+)
+UPSTREAM_INFLIGHT = Gauge(
+    "gateway_upstream_inflight_requests",
+    "Number of requests currently in flight to an upstream microservice.",
+    ["service"]
+)
+UPSTREAM_QUEUE_DEPTH = Gauge(
+    "gateway_upstream_queue_depth",
+    "Number of requests waiting for a concurrency slot to an upstream microservice.",
+    ["service"]
+)
+UPSTREAM_REJECTED = Counter(
+    "gateway_upstream_rejected_total",
+    "Requests rejected by the upstream bulkhead.",
+    ["service", "reason"]
+)
+UPSTREAM_LATENCY = Histogram(
+    "gateway_upstream_latency_seconds",
+    "Latency of proxied requests to an upstream microservice.",
+    ["service"]
+)
+
+# Ingress admission control metrics
+ADMISSION_INFLIGHT = Gauge(
+    "gateway_admission_inflight_requests",
+    "Number of admitted requests currently in flight, per priority class.",
+    ["priority"]
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "gateway_admission_queue_depth",
+    "Number of requests waiting for admission, per priority class.",
+    ["priority"]
+)
+ADMISSION_QUEUE_DELAY = Histogram(
+    "gateway_admission_queue_delay_seconds",
+    "Time requests spent waiting for admission, per priority class.",
+    ["priority"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+ADMISSION_SHED = Counter(
+    "gateway_admission_shed_total",
+    "Requests shed by the ingress admission controller.",
+    ["priority", "reason"]
+)
+
+# Long-lived stream and WebSocket metrics
+STREAM_CONNECTIONS = Gauge(
+    "gateway_stream_connections",
+    "Number of open long-lived proxied connections.",
+    ["service", "protocol"]
+)
+STREAM_REJECTED = Counter(
+    "gateway_stream_rejected_total",
+    "Long-lived connections rejected because the route connection cap was reached.",
+    ["service", "protocol"]
+)
+BROADCAST_UPSTREAMS = Gauge(
+    "gateway_broadcast_upstreams",
+    "Upstream event streams shared by broadcast subscribers.",
+    ["service"]
+)
+BROADCAST_SUBSCRIBERS = Gauge(
+    "gateway_broadcast_subscribers",
+    "Clients subscribed to a shared upstream event stream.",
+    ["service"]
+)
+BROADCAST_DROPPED = Counter(
+    "gateway_broadcast_dropped_total",
+    "Broadcast subscribers disconnected because their buffer was full.",
+    ["service"]
+)
+
+# Usage metering metrics
+USAGE_KEYS = Gauge(
+    "gateway_usage_meter_keys",
+    "Number of (bucket, consumer, route) counters waiting to be flushed."
+)
+USAGE_OVERFLOW = Counter(
+    "gateway_usage_meter_overflow_total",
+    "Requests folded into the overflow counter because the usage meter was full."
+)
+USAGE_FLUSH_FAILURES = Counter(
+    "gateway_usage_meter_flush_failures_total",
+    "Usage flushes that failed to reach MongoDB."
+)
+
+# Traffic mirroring metrics
+MIRROR_QUEUE_DEPTH = Gauge(
+    "gateway_mirror_queue_depth",
+    "Mirrored requests waiting to be sent to a shadow upstream."
+)
+MIRROR_SENT = Counter(
+    "gateway_mirror_sent_total",
+    "Mirrored requests sent to a shadow upstream.",
+    ["service"]
+)
+MIRROR_DROPPED = Counter(
+    "gateway_mirror_dropped_total",
+    "Mirrored requests dropped instead of being sent to a shadow upstream.",
+    ["service", "reason"]
+)
+
+# Traffic capture metrics
+CAPTURE_RECORDED = Counter(
+    "gateway_capture_recorded_total",
+    "Requests written to the traffic capture log."
+)
+CAPTURE_DROPPED = Counter(
+    "gateway_capture_dropped_total",
+    "Sampled requests not written to the traffic capture log.",
+    ["reason"]
+)
+
+# Event loop metrics (only collected while profiling is enabled)
+EVENT_LOOP_LAG = Histogram(
+    "gateway_event_loop_lag_seconds",
+    "Delay between when the event loop heartbeat was due and when it ran.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+EVENT_LOOP_STALLS = Counter(
+    "gateway_event_loop_stalls_total",
+    "Times the event loop was blocked for longer than the lag threshold."
+)
+
+# DNS cache metrics
+DNS_RESOLUTIONS = Counter(
+    "gateway_dns_resolutions_total",
+    "Background resolutions of upstream host names.",
+    ["result"]
+)
+DNS_STALE_SERVED = Counter(
+    "gateway_dns_stale_served_total",
+    "Connections opened with addresses past their TTL because refreshing them failed."
+)
+
+# Idempotency metrics
+IDEMPOTENCY_OUTCOMES = Counter(
+    "gateway_idempotency_outcomes_total",
+    "Requests carrying an Idempotency-Key, by outcome.",
+    ["service", "outcome"]
+)
+
+# Buffered bytes budget metrics
+MEMORY_BUDGET_USED = Gauge(
+    "gateway_memory_budget_used_bytes",
+    "Bytes of request and response bodies currently reserved against the buffering budget."
+)
+MEMORY_BUDGET_LIMIT = Gauge(
+    "gateway_memory_budget_limit_bytes",
+    "Size of the buffering budget."
+)
+MEMORY_BUDGET_WAITING = Gauge(
+    "gateway_memory_budget_waiting_requests",
+    "Requests waiting for buffering budget."
+)
+MEMORY_BUDGET_REJECTED = Counter(
+    "gateway_memory_budget_rejected_total",
+    "Requests rejected by the buffering budget.",
+    ["reason"]
+)
+
+# RabbitMQ request/reply metrics
+RPC_PENDING = Gauge(
+    "gateway_rpc_pending_requests",
+    "Requests published to RabbitMQ and waiting for their reply."
+)
+RPC_OUTCOMES = Counter(
+    "gateway_rpc_outcomes_total",
+    "RabbitMQ request/reply calls, by queue and outcome.",
+    ["queue", "outcome"]
+)
+
+# Heavy-hitter throttling metrics
+HEAVY_HITTER_THROTTLED = Counter(
+    "gateway_heavy_hitter_throttled_total",
+    "Requests refused because the client exceeded the heavy-hitter throttle rate.",
+    ["dimension"]
+)
+
+# Deny list metrics
+DENY_LIST_ENTRIES = Gauge(
+    "gateway_deny_list_entries",
+    "Entries in the active deny list, by kind.",
+    ["kind"]
+)
+DENY_LIST_BLOCKED = Counter(
+    "gateway_deny_list_blocked_total",
+    "Requests refused by the deny list, by reason.",
+    ["reason"]
+)
+
+# Graceful shutdown metrics
+DRAINING = Gauge(
+    "gateway_draining",
+    "1 while the gateway is draining before shutdown, 0 otherwise."
+)
@@ -1,6 +1,6 @@
-import pika
 import logging
 import json
+from src.utils.request_context import current_request_id
 from fastapi import HTTPException
 
 logger = logging.getLogger(__name__)
@@ -10,6 +10,7 @@ class PikaClient:
         try:
             # Establish connection to RabbitMQ
             self.rabbitmq_host = rabbitmq_host
+            self._declared_queues = set()
             self._connect()
         except Exception as e:
             logger.error(f"Error connecting to RabbitMQ: {e}")
@@ -17,9 +18,13 @@ class PikaClient:
 
     def _connect(self):
         """Establish a connection and channel to RabbitMQ"""
+        # Imported on first use so that importing the container stays cheap
+        import pika
+
         try:
             self.connection = pika.BlockingConnection(pika.ConnectionParameters(host=self.rabbitmq_host))
             self.channel = self.connection.channel()
+            self._declared_queues = set()
             logger.info("RabbitMQ connection and channel established successfully.")
         except Exception as e:
             logger.error(f"Failed to connect to RabbitMQ: {e}")
@@ -27,15 +32,41 @@ class PikaClient:
 
     def declare_queue(self, queue_name):
         """Declare a RabbitMQ queue if not already existing"""
+        # Declared once per channel rather than before every publish
+        if queue_name in self._declared_queues:
+            return
         try:
             self.channel.queue_declare(queue=queue_name, durable=True)
+            self._declared_queues.add(queue_name)
             logger.info(f"Declared queue: {queue_name}")
         except Exception as e:
             logger.error(f"Error declaring queue {queue_name}: {e}")
             raise HTTPException(status_code=500, detail="Failed to declare RabbitMQ queue")
 
-    def basic_publish(self, queue_name, message):
+    def declare_reply_queue(self):
+        """Declare an exclusive, server-named queue for replies and return its name"""
+        try:
+            result = self.channel.queue_declare(queue='', exclusive=True, auto_delete=True)
+            logger.info(f"Declared reply queue: {result.method.queue}")
+            return result.method.queue
+        except Exception as e:
+            logger.error(f"Error declaring reply queue: {e}")
+            raise HTTPException(status_code=500, detail="Failed to declare RabbitMQ reply queue")
+
+    def basic_publish(
+        self,
+        queue_name,
+        message,
+        correlation_id=None,
+        reply_to=None,
+        headers=None,
+        content_type=None,
+        expiration=None,
+        persistent=True
+    ):
         """Publish a message to a specific RabbitMQ queue"""
+        import pika
+
         try:
             # Reconnect if connection or channel is closed
             if not self.connection or self.connection.is_closed:
@@ -49,12 +80,23 @@ class PikaClient:
             if isinstance(message, dict):
                 message = json.dumps(message)
 
-            # Publish the message
+            # Publish the message, tagged with the current request ID for cross-service correlation
+            request_id = current_request_id()
+            message_headers = dict(headers or {})
+            if request_id:
+                message_headers.setdefault("x-request-id", request_id)
             self.channel.basic_publish(
                 exchange='',
                 routing_key=queue_name,
                 body=message,
-                properties=pika.BasicProperties(delivery_mode=2)  # Make message persistent
+                properties=pika.BasicProperties(
+                    delivery_mode=2 if persistent else 1,  # Make message persistent
+                    correlation_id=correlation_id or request_id,
+                    reply_to=reply_to,
+                    headers=message_headers or None,
+                    content_type=content_type,
+                    expiration=expiration
+                )
             )
             logger.info(f"Published message to queue '{queue_name}'")
         except pika.exceptions.ChannelClosedByBroker as e:
@@ -67,7 +109,7 @@ class PikaClient:
             logger.error(f"Unexpected error while publishing to RabbitMQ: {e}")
             raise HTTPException(status_code=500, detail=f"Failed to publish message to RabbitMQ: {e}")
 
-    def consume_messages(self, queue_name, on_message_callback, auto_ack=False):
+    def consume_messages(self, queue_name, on_message_callback, auto_ack=False, declare=True, prefetch_count=1):
         """Consume messages from a specific RabbitMQ queue"""
         try:
             # Ensure connection is open before consuming
@@ -76,10 +118,11 @@ class PikaClient:
                 self._connect()
             
             # Declare the queue to ensure it exists
-            self.declare_queue(queue_name)
+            if declare:
+                self.declare_queue(queue_name)
             
-            # Set QoS to control message flow (one message at a time)
-            self.channel.basic_qos(prefetch_count=1)
+            # Set QoS to control message flow (one message at a time by default)
+            self.channel.basic_qos(prefetch_count=prefetch_count)
 
             # Start consuming messages
             self.channel.basic_consume(
@@ -93,6 +136,15 @@ class PikaClient:
             logger.error(f"Error consuming messages from RabbitMQ queue '{queue_name}': {e}")
             raise HTTPException(status_code=500, detail="Failed to consume messages from RabbitMQ queue")
 
+    def stop_consuming(self):
+        """Ask the consumer running in another thread to return once its current message is handled"""
+        try:
+            if self.connection and self.connection.is_open:
+                # Blocking connections are not thread-safe; this is the one call allowed from other threads
+                self.connection.add_callback_threadsafe(self.channel.stop_consuming)
+        except Exception as e:
+            logger.error(f"Error while stopping RabbitMQ consumer: {e}")
+
     def close_connection(self):
         """Close RabbitMQ connection"""
         try:
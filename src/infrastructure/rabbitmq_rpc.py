@@ -0,0 +1,171 @@
+import asyncio
+import threading
+from itertools import count
+from typing import Dict, NamedTuple, Optional
+from src.core.repositories.rabbitmq_repository import RabbitMQRepository
+from src.infrastructure.pika import PikaClient
+from src.infrastructure import metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RpcReply(NamedTuple):
+    status_code: int
+    content_type: Optional[str]
+    headers: Dict[str, str]
+    body: bytes
+
+
+class RpcOverloaded(Exception):
+    """Raised when too many requests are already waiting for a reply."""
+
+
+class RabbitMQRpcClient:
+    """Request/reply over RabbitMQ for paths served by queue workers instead of HTTP upstreams.
+
+    A dedicated thread owns a PikaClient connection and consumes a private reply
+    queue; publishes from the event loop are handed to that thread with
+    ``add_callback_threadsafe``, since pika connections are not thread-safe.
+    Each request carries a correlation ID and the reply queue name, and the
+    shared reply consumer resolves the matching future on the event loop.
+    """
+
+    def __init__(self, rabbitmq_host: str, max_pending: int = 1000, reconnect_interval: float = 5.0):
+        self.rabbitmq_host = rabbitmq_host
+        self.max_pending = max_pending
+        self.reconnect_interval = reconnect_interval
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._ids = count()
+        self._prefix = ""
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._client: Optional[PikaClient] = None
+        self._repository: Optional[RabbitMQRepository] = None
+        self._reply_queue: Optional[str] = None
+
+    async def start(self) -> None:
+        """Start the connection thread; requests fail fast until it is connected."""
+        if self._thread is None:
+            self._loop = asyncio.get_running_loop()
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="rabbitmq-rpc", daemon=True)
+            self._thread.start()
+
+    async def stop(self) -> None:
+        """Stop consuming replies, close the connection and fail the requests still waiting."""
+        self._stopping.set()
+        client = self._client
+        if client:
+            try:
+                client.connection.add_callback_threadsafe(client.channel.stop_consuming)
+            except Exception:
+                pass
+        if self._thread:
+            await asyncio.to_thread(self._thread.join, self.reconnect_interval)
+            self._thread = None
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("RabbitMQ request/reply client stopped."))
+
+    async def call(self, queue_name: str, body: bytes, headers: Dict[str, str], content_type: Optional[str], timeout: float) -> RpcReply:
+        """
+        Publish a request to a queue and wait for its reply.
+
+        Args:
+            queue_name (str): Queue of the workers serving the request.
+            body (bytes): Request body.
+            headers (Dict[str, str]): Message headers describing the HTTP request.
+            content_type (str): Content type of the body.
+            timeout (float): Seconds to wait for the reply; also the message expiration.
+
+        Returns:
+            RpcReply: The reply mapped to an HTTP status, headers and body.
+
+        Raises:
+            ConnectionError: If RabbitMQ is not connected.
+            RpcOverloaded: If max_pending requests are already waiting.
+            asyncio.TimeoutError: If no reply arrives in time.
+        """
+        client, reply_queue = self._client, self._reply_queue
+        if client is None or reply_queue is None:
+            raise ConnectionError("RabbitMQ request/reply client is not connected.")
+        if len(self._pending) >= self.max_pending:
+            metrics.RPC_OUTCOMES.labels(queue_name, "overloaded").inc()
+            raise RpcOverloaded()
+
+        correlation_id = f"{self._prefix}{next(self._ids)}"
+        future = self._loop.create_future()
+        self._pending[correlation_id] = future
+        metrics.RPC_PENDING.set(len(self._pending))
+        expiration = str(int(timeout * 1000))
+
+        def publish():
+            try:
+                self._repository.publish_request(
+                    queue_name, body, correlation_id, reply_queue, headers, content_type, expiration
+                )
+            except Exception as e:
+                self._loop.call_soon_threadsafe(self._fail, correlation_id, e)
+
+        try:
+            client.connection.add_callback_threadsafe(publish)
+            reply = await asyncio.wait_for(future, timeout)
+            metrics.RPC_OUTCOMES.labels(queue_name, "replied").inc()
+            return reply
+        except asyncio.TimeoutError:
+            metrics.RPC_OUTCOMES.labels(queue_name, "timeout").inc()
+            raise
+        except Exception:
+            metrics.RPC_OUTCOMES.labels(queue_name, "error").inc()
+            raise
+        finally:
+            self._pending.pop(correlation_id, None)
+            metrics.RPC_PENDING.set(len(self._pending))
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self._client = PikaClient(self.rabbitmq_host)
+                self._repository = RabbitMQRepository(self._client)
+                self._reply_queue = self._repository.declare_reply_queue()
+                # Correlation IDs only need to be unique per reply queue
+                self._prefix = f"{self._reply_queue}:"
+                logger.info(f"RabbitMQ request/reply client consuming replies on '{self._reply_queue}'.")
+                # Replies are acknowledged on delivery; a lost reply surfaces as a timeout
+                self._repository.consume_queue(self._reply_queue, self._on_reply, auto_ack=True, declare=False, prefetch_count=0)
+            except Exception as e:
+                logger.error(f"RabbitMQ request/reply connection failed: {e}")
+            finally:
+                self._reply_queue = None
+                client, self._client = self._client, None
+                if client:
+                    client.close_connection()
+            if self._pending:
+                self._loop.call_soon_threadsafe(self._fail_all)
+            self._stopping.wait(self.reconnect_interval)
+
+    def _on_reply(self, channel, method, properties, body) -> None:
+        headers = {name: str(value) for name, value in (properties.headers or {}).items()}
+        try:
+            status_code = int(headers.pop("x-http-status", 200))
+        except ValueError:
+            status_code = 502
+        reply = RpcReply(status_code, properties.content_type, headers, body)
+        self._loop.call_soon_threadsafe(self._resolve, properties.correlation_id, reply)
+
+    def _resolve(self, correlation_id: str, reply: RpcReply) -> None:
+        future = self._pending.get(correlation_id)
+        if future and not future.done():
+            future.set_result(reply)
+
+    def _fail(self, correlation_id: str, error: Exception) -> None:
+        future = self._pending.get(correlation_id)
+        if future and not future.done():
+            future.set_exception(ConnectionError(f"Failed to publish request: {error}"))
+
+    def _fail_all(self) -> None:
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("RabbitMQ connection lost."))
@@ -0,0 +1,66 @@
+import asyncio
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List
+from src.core.entities.microservice import Microservice
+import logging
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+
+class RegistrySnapshot:
+    """Local last-known-good copy of the microservice registry, used to serve routes at boot."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def load(self) -> List[Microservice]:
+        """
+        Load the microservices stored in the snapshot.
+
+        Returns:
+            List[Microservice]: The stored microservices, or an empty list if there is no usable snapshot.
+        """
+        try:
+            with self.path.open("rb") as snapshot_file:
+                snapshot = json.loads(snapshot_file.read())
+            if snapshot.get("version") != SNAPSHOT_VERSION:
+                logger.warning(f"Ignoring registry snapshot '{self.path}' with unknown version {snapshot.get('version')}.")
+                return []
+            microservices = [Microservice(**document) for document in snapshot["microservices"]]
+            logger.info(f"Loaded {len(microservices)} microservices from snapshot '{self.path}' saved at {snapshot.get('saved_at')}.")
+            return microservices
+        except FileNotFoundError:
+            logger.info(f"No registry snapshot at '{self.path}'.")
+        except Exception as e:
+            logger.error(f"Failed to load registry snapshot '{self.path}': {e}")
+        return []
+
+    async def save(self, microservices: List[Microservice]) -> None:
+        """Persist the microservices without blocking the event loop."""
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+            # The Mongo id is not needed to build routes
+            "microservices": [microservice.model_dump(mode="json", exclude={"id"}) for microservice in microservices],
+        }
+        data = json.dumps(snapshot, separators=(",", ":")).encode("utf-8")
+        try:
+            await asyncio.to_thread(self._write, data)
+            logger.info(f"Saved {len(microservices)} microservices to snapshot '{self.path}'.")
+        except Exception as e:
+            logger.error(f"Failed to save registry snapshot '{self.path}': {e}")
+
+    def _write(self, data: bytes) -> None:
+        # Write to a temporary file and rename it, so readers never see a partial snapshot
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with temporary_path.open("wb") as snapshot_file:
+            snapshot_file.write(data)
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temporary_path, self.path)
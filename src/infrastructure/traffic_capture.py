@@ -0,0 +1,194 @@
+import os
+import queue
+import struct
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from random import random
+from time import time
+from typing import BinaryIO, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from src.infrastructure import metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Every capture file starts with this marker, followed by length-prefixed records
+FILE_MAGIC = b"GWCAP\x01"
+# Record layout: timestamp, and the lengths of method, path, query, headers and body
+RECORD_HEADER = struct.Struct("<dBHHII")
+LENGTH_PREFIX = struct.Struct("<I")
+
+# Credentials are never written to disk
+SENSITIVE_HEADERS = frozenset({"authorization", "proxy-authorization", "cookie", "x-api-key"})
+
+
+class CapturedRequest(NamedTuple):
+    timestamp: float
+    method: str
+    path: str
+    query: str
+    headers: List[Tuple[str, str]]
+    body: bytes
+
+
+def encode_record(request: CapturedRequest) -> bytes:
+    """Serialize a captured request as one length-prefixed record."""
+    method = request.method.encode("ascii")
+    path = request.path.encode("utf-8")
+    query = request.query.encode("utf-8")
+    headers = b"\n".join(f"{name}:{value}".encode("latin-1") for name, value in request.headers)
+    payload = b"".join((
+        RECORD_HEADER.pack(request.timestamp, len(method), len(path), len(query), len(headers), len(request.body)),
+        method, path, query, headers, request.body
+    ))
+    return LENGTH_PREFIX.pack(len(payload)) + payload
+
+
+def decode_record(payload: bytes) -> CapturedRequest:
+    """Deserialize the payload of one record."""
+    timestamp, method_length, path_length, query_length, headers_length, body_length = RECORD_HEADER.unpack_from(payload)
+    offset = RECORD_HEADER.size
+    fields = []
+    for length in (method_length, path_length, query_length, headers_length, body_length):
+        fields.append(payload[offset:offset + length])
+        offset += length
+    method, path, query, headers, body = fields
+    header_list = []
+    if headers:
+        for line in headers.split(b"\n"):
+            name, _, value = line.decode("latin-1").partition(":")
+            header_list.append((name, value))
+    return CapturedRequest(timestamp, method.decode("ascii"), path.decode("utf-8"), query.decode("utf-8"), header_list, body)
+
+
+def read_capture(paths: Iterable[str]) -> Iterator[CapturedRequest]:
+    """Read the records of capture files, in the given order; a truncated last record is ignored."""
+    for path in paths:
+        with open(path, "rb") as capture_file:
+            if capture_file.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                raise ValueError(f"'{path}' is not a traffic capture file.")
+            while True:
+                prefix = capture_file.read(LENGTH_PREFIX.size)
+                if len(prefix) < LENGTH_PREFIX.size:
+                    break
+                (length,) = LENGTH_PREFIX.unpack(prefix)
+                payload = capture_file.read(length)
+                if len(payload) < length:
+                    break
+                yield decode_record(payload)
+
+
+def capture_files(directory: str) -> List[str]:
+    """List the capture files of a directory, oldest first."""
+    return sorted(str(path) for path in Path(directory).glob("capture-*.bin"))
+
+
+class TrafficCapture:
+    """Opt-in recorder of sampled proxied requests to an append-only, rotating binary log.
+
+    The request path only samples and enqueues a tuple; encoding and file I/O happen
+    in a dedicated writer thread. When the queue is full, records are dropped and
+    counted rather than slowing requests down.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        directory: str = "data/capture",
+        sample_rate: float = 0.01,
+        capture_bodies: bool = False,
+        max_file_size: int = 104857600,
+        max_files: int = 10,
+        queue_size: int = 10000
+    ):
+        self.enabled = enabled
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.capture_bodies = capture_bodies
+        self.max_file_size = max_file_size
+        self.max_files = max_files
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._file: Optional[BinaryIO] = None
+        self._file_size = 0
+
+    def sampled(self) -> bool:
+        """Whether to record the current request; checked first, so unsampled requests build nothing."""
+        return random() < self.sample_rate
+
+    def record(self, method: str, path: str, query: str, headers: Iterable[Tuple[str, str]], body: bytes) -> None:
+        """Enqueue a sampled request for writing."""
+        try:
+            self._queue.put_nowait((time(), method, path, query, headers, body if self.capture_bodies else b""))
+        except queue.Full:
+            metrics.CAPTURE_DROPPED.labels("queue_full").inc()
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        if self.enabled and self._thread is None:
+            self._thread = threading.Thread(target=self._write_loop, name="traffic-capture", daemon=True)
+            self._thread.start()
+            logger.info(f"Traffic capture enabled: sampling {self.sample_rate:.2%} of requests into '{self.directory}'.")
+
+    def stop(self) -> None:
+        """Write what is queued, then stop the writer thread and close the current file."""
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _write_loop(self) -> None:
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                timestamp, method, path, query, headers, body = item
+                try:
+                    record = encode_record(CapturedRequest(
+                        timestamp, method, path, query,
+                        [(name, value) for name, value in headers if name not in SENSITIVE_HEADERS],
+                        body
+                    ))
+                except Exception as e:
+                    # One record that cannot be serialized must not stop the writer
+                    metrics.CAPTURE_DROPPED.labels("encode_error").inc()
+                    logger.error(f"Failed to encode traffic capture record: {e!r}")
+                    continue
+                try:
+                    self._write(record)
+                    metrics.CAPTURE_RECORDED.inc()
+                except Exception as e:
+                    metrics.CAPTURE_DROPPED.labels("write_error").inc()
+                    logger.error(f"Failed to write traffic capture record: {e!r}")
+                    self._close()
+        finally:
+            self._close()
+
+    def _write(self, record: bytes) -> None:
+        if self._file is None or self._file_size + len(record) > self.max_file_size:
+            self._rotate()
+        self._file.write(record)
+        self._file_size += len(record)
+        # Flush whenever the writer catches up, so the log trails the traffic by little
+        if self._queue.empty():
+            self._file.flush()
+
+    def _rotate(self) -> None:
+        self._close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = datetime.now(timezone.utc).strftime("capture-%Y%m%dT%H%M%S%f.bin")
+        self._file = open(self.directory / name, "ab")
+        self._file.write(FILE_MAGIC)
+        self._file_size = len(FILE_MAGIC)
+        # Keep only the newest files
+        for old_file in capture_files(str(self.directory))[:-self.max_files]:
+            os.remove(old_file)
+
+    def _close(self) -> None:
+        if self._file:
+            capture_file, self._file = self._file, None
+            try:
+                capture_file.close()
+            except OSError as e:
+                logger.error(f"Failed to close traffic capture file: {e}")
@@ -0,0 +1,120 @@
+import asyncio
+from httpx import AsyncClient, HTTPError, Limits, Timeout
+from typing import List, NamedTuple, Optional, Tuple
+from src.infrastructure import metrics
+from src.utils.memory_budget import MemoryBudget
+import logging
+
+logger = logging.getLogger(__name__)
+
+class MirroredRequest(NamedTuple):
+    service_name: str
+    method: str
+    url: str
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+
+
+class TrafficMirror:
+    """Sends copies of sampled requests to shadow upstreams in the background.
+
+    Copies go into a bounded queue drained by a few workers over a connection pool
+    of their own, so a slow shadow upstream can neither exhaust the primary pool
+    nor make the primary request wait. Shadow responses are discarded. Queued
+    bodies are reserved against the process memory budget until they are sent.
+    When the queue is full or the budget cannot cover the body right away, the
+    copy is dropped and counted.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 1000,
+        workers: int = 4,
+        max_connections: int = 50,
+        timeout: float = 5.0,
+        max_body_size: int = 1048576,
+        memory_budget: Optional[MemoryBudget] = None
+    ):
+        self.queue_size = queue_size
+        self.workers = workers
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.max_body_size = max_body_size
+        self.memory_budget = memory_budget
+        self.client: Optional[AsyncClient] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Create the shadow connection pool and start the workers."""
+        if self.client:
+            return
+        self.client = AsyncClient(
+            limits=Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+            timeout=Timeout(self.timeout)
+        )
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        logger.info(f"Traffic mirror started ({self.workers} workers, queue of {self.queue_size}).")
+
+    async def stop(self) -> None:
+        """Stop the workers, dropping pending copies, and close the pool."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Return the bytes of the copies that were never sent
+        while self._queue and not self._queue.empty():
+            self._release(self._queue.get_nowait())
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+        self._queue = None
+        metrics.MIRROR_QUEUE_DEPTH.set(0)
+
+    def submit(self, service_name: str, method: str, url: str, headers: List[Tuple[bytes, bytes]], body: bytes) -> None:
+        """Queue a copy of an upstream request (already transformed) without waiting; the copy is dropped if it cannot be queued."""
+        if self._queue is None:
+            metrics.MIRROR_DROPPED.labels(service_name, "stopped").inc()
+            return
+        if len(body) > self.max_body_size:
+            metrics.MIRROR_DROPPED.labels(service_name, "body_too_large").inc()
+            return
+        if self._queue.full():
+            metrics.MIRROR_DROPPED.labels(service_name, "queue_full").inc()
+            return
+        # Copies never wait for memory, the primary request comes first
+        if self.memory_budget and not self.memory_budget.try_reserve(len(body)):
+            metrics.MIRROR_DROPPED.labels(service_name, "memory_budget").inc()
+            return
+        self._queue.put_nowait(MirroredRequest(service_name, method, url, headers, body))
+        metrics.MIRROR_QUEUE_DEPTH.set(self._queue.qsize())
+
+    async def _work(self) -> None:
+        while True:
+            mirrored = await self._queue.get()
+            metrics.MIRROR_QUEUE_DEPTH.set(self._queue.qsize())
+            try:
+                async with self.client.stream(
+                    mirrored.method,
+                    mirrored.url,
+                    headers=mirrored.headers,
+                    content=mirrored.body
+                ) as response:
+                    # Discard the body without buffering it
+                    async for _ in response.aiter_raw():
+                        pass
+                metrics.MIRROR_SENT.labels(mirrored.service_name).inc()
+            except HTTPError as e:
+                metrics.MIRROR_DROPPED.labels(mirrored.service_name, "upstream_error").inc()
+                logger.debug(f"Mirrored request to '{mirrored.url}' failed: {e}")
+            except Exception as e:
+                # Anything else (an invalid URL or header, a closed client) must not stop the worker
+                metrics.MIRROR_DROPPED.labels(mirrored.service_name, "error").inc()
+                logger.warning(f"Mirrored request to '{mirrored.url}' could not be sent: {e!r}")
+            finally:
+                self._release(mirrored)
+
+    def _release(self, mirrored: MirroredRequest) -> None:
+        if self.memory_budget:
+            self.memory_budget.release(len(mirrored.body))
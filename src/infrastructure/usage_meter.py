@@ -0,0 +1,175 @@
+import asyncio
+import hashlib
+from datetime import datetime, timezone
+from time import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from src.infrastructure.db.mongo_client import MongoDBClient
+from src.infrastructure import metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Counter slots of an aggregation entry
+REQUESTS, CLIENT_ERRORS, SERVER_ERRORS, BYTES_IN, BYTES_OUT, LATENCY_SUM = range(6)
+
+# Consumer and route used once the meter holds max_keys entries
+OVERFLOW = "__overflow__"
+ANONYMOUS = "anonymous"
+
+
+class UsageMeter:
+    """In-process per-consumer and per-route usage counters, flushed in bulk to a Mongo time-series collection.
+
+    Recording a request is a dictionary lookup and a few integer additions. The
+    counters of each ``bucket_seconds`` window are written every ``flush_interval``
+    seconds with a single ``insert_many``; a window that spans several flushes is
+    split across documents and summed at query time.
+    """
+
+    def __init__(
+        self,
+        mongo_client: MongoDBClient,
+        collection_name: str = "usage_metrics",
+        bucket_seconds: int = 60,
+        flush_interval: float = 10.0,
+        max_keys: int = 50000,
+        retention_seconds: Optional[int] = None
+    ):
+        self.mongo_client = mongo_client
+        self.collection_name = collection_name
+        self.bucket_seconds = bucket_seconds
+        self.flush_interval = flush_interval
+        self.max_keys = max_keys
+        self.retention_seconds = retention_seconds
+        self._counters: Dict[Tuple[int, str, str], List[float]] = {}
+        self._prepared = False
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, consumer: Optional[str], route: str, status_code: int, bytes_in: int, bytes_out: int, latency: float) -> None:
+        """Account one request."""
+        bucket = int(time()) // self.bucket_seconds * self.bucket_seconds
+        key = (bucket, consumer or ANONYMOUS, route)
+        counters = self._counters.get(key)
+        if counters is None:
+            if len(self._counters) >= self.max_keys:
+                metrics.USAGE_OVERFLOW.inc()
+                key = (bucket, OVERFLOW, OVERFLOW)
+                counters = self._counters.get(key)
+            if counters is None:
+                counters = self._counters[key] = [0, 0, 0, 0, 0, 0.0]
+                metrics.USAGE_KEYS.set(len(self._counters))
+        counters[REQUESTS] += 1
+        if status_code >= 500:
+            counters[SERVER_ERRORS] += 1
+        elif status_code >= 400:
+            counters[CLIENT_ERRORS] += 1
+        counters[BYTES_IN] += bytes_in
+        counters[BYTES_OUT] += bytes_out
+        counters[LATENCY_SUM] += latency
+
+    async def metered(
+        self,
+        chunks: AsyncIterator[bytes],
+        consumer: Optional[str],
+        route: str,
+        status_code: int,
+        bytes_in: int,
+        started: float
+    ) -> AsyncIterator[bytes]:
+        """Relay a response body and record the request once it has been sent."""
+        bytes_out = 0
+        try:
+            async for chunk in chunks:
+                bytes_out += len(chunk)
+                yield chunk
+        finally:
+            self.record(consumer, route, status_code, bytes_in, bytes_out, time() - started)
+
+    async def start(self) -> None:
+        """Start preparing the collection and flushing periodically, without waiting for MongoDB."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush and write what is left."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if await self._prepare():
+            await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            # Counters keep accumulating, within max_keys, until the collection exists
+            if await self._prepare():
+                await self.flush()
+
+    async def _prepare(self) -> bool:
+        """Create the time-series collection if needed; returns whether it is ready."""
+        if not self._prepared:
+            try:
+                await self.mongo_client.create_timeseries_collection(
+                    self.collection_name,
+                    time_field="timestamp",
+                    meta_field="meta",
+                    granularity="minutes",
+                    expire_after_seconds=self.retention_seconds
+                )
+                self._prepared = True
+            except Exception as e:
+                logger.error(f"Failed to prepare usage collection '{self.collection_name}', retrying on the next flush: {e}")
+        return self._prepared
+
+    async def flush(self) -> None:
+        """Write the accumulated counters in one bulk insert."""
+        if not self._counters:
+            metrics.USAGE_KEYS.set(0)
+            return
+        # Swap first so requests keep recording into a fresh dict while we write
+        counters, self._counters = self._counters, {}
+        metrics.USAGE_KEYS.set(0)
+        documents = [
+            {
+                "timestamp": datetime.fromtimestamp(bucket, tz=timezone.utc),
+                "meta": {"consumer": self._consumer_id(consumer), "route": route},
+                "requests": values[REQUESTS],
+                "client_errors": values[CLIENT_ERRORS],
+                "server_errors": values[SERVER_ERRORS],
+                "bytes_in": values[BYTES_IN],
+                "bytes_out": values[BYTES_OUT],
+                "latency_sum": values[LATENCY_SUM],
+            }
+            for (bucket, consumer, route), values in counters.items()
+        ]
+        try:
+            await self.mongo_client.insert_many(documents, collection_name=self.collection_name)
+            logger.debug(f"Flushed {len(documents)} usage documents.")
+        except Exception as e:
+            metrics.USAGE_FLUSH_FAILURES.inc()
+            logger.error(f"Failed to flush {len(documents)} usage documents: {e}")
+            self._merge_back(counters)
+        metrics.USAGE_KEYS.set(len(self._counters))
+
+    def _merge_back(self, counters: Dict[Tuple[int, str, str], List[float]]) -> None:
+        # Keep unflushed counters for the next attempt, within the same memory bound
+        for key, values in counters.items():
+            current = self._counters.get(key)
+            if current is None:
+                if len(self._counters) >= self.max_keys:
+                    continue
+                self._counters[key] = values
+            else:
+                for index, value in enumerate(values):
+                    current[index] += value
+
+    @staticmethod
+    def _consumer_id(consumer: str) -> str:
+        # Raw API keys never leave the process; hashing happens here, off the request path
+        if consumer in (ANONYMOUS, OVERFLOW):
+            return consumer
+        return "key:" + hashlib.sha256(consumer.encode()).hexdigest()[:16]
@@ -0,0 +1,30 @@
+import json
+from fastapi import APIRouter, Depends, Request
+from starlette.responses import StreamingResponse
+from src.core.schemas.batch_schema import BatchRequestSchema
+from src.services.batch_service import BatchService
+from src.dependencies.batch_service_dependency import get_batch_service
+
+# Create a FastAPI router for batch endpoints
+router = APIRouter()
+
+@router.post("/batch/")
+async def execute_batch(
+    batch: BatchRequestSchema,
+    request: Request,
+    service: BatchService = Depends(get_batch_service)
+):
+    """Dispatch several sub-requests concurrently and return their results in one response."""
+    if not batch.stream:
+        return await service.execute(request, batch)
+
+    # Validate before streaming so errors still get a proper status code
+    service.validate(batch)
+
+    async def ndjson_results():
+        async for result in service.execute_as_completed(request, batch):
+            yield json.dumps(result) + "\n"
+
+    # Streamed results are sent as they finish, without the standard response envelope
+    request.state.passthrough = True
+    return StreamingResponse(ndjson_results(), media_type="application/x-ndjson")
@@ -1,28 +1,37 @@
-from fastapi import APIRouter
-from src.infrastructure.di_container import Container  # Import the DI container
+from fastapi import APIRouter, Depends
+from src.infrastructure.health_monitor import HealthMonitor
+from src.dependencies.health_monitor_dependency import get_health_monitor
 from starlette.responses import JSONResponse
 
 router = APIRouter()
 
 @router.get("/health", tags=["Health"])
-async def health_check():
+async def health_check(health_monitor: HealthMonitor = Depends(get_health_monitor)):
     """
     Health check endpoint.
-    This endpoint returns 200 OK if the service is healthy.
+    This endpoint returns 200 OK if the service is up, with the cached status of its dependencies.
     """
-    return JSONResponse(status_code=200, content={"status": "Healthy", "message": "Service is up and running."})
+    report = health_monitor.report()
+    healthy = all(dependency["healthy"] for dependency in report["dependencies"].values())
+    return JSONResponse(
+        status_code=200,
+        content={
+            "status": "Healthy" if healthy and not report["stale"] else "Degraded",
+            "message": "Service is up and running.",
+            **report,
+        },
+    )
 
 @router.get("/readiness", tags=["Readiness"])
-async def readiness_check():
+async def readiness_check(health_monitor: HealthMonitor = Depends(get_health_monitor)):
     """
     Advanced readiness check endpoint.
-    This endpoint checks if the service is ready to accept requests by verifying dependencies.
+    This endpoint answers from the results of the background health monitor, without touching any dependency.
     """
-    container = Container()
-    mongo_client = container.mongo_client()
+    report = health_monitor.report()
+    if report["draining"]:
+        return JSONResponse(status_code=503, content={"status": "Not Ready", "message": "Service is shutting down.", **report})
+    if not report["ready"]:
+        return JSONResponse(status_code=503, content={"status": "Not Ready", "message": "Required dependencies are unavailable or their status is stale.", **report})
 
-    # Check if the MongoDB client is connected
-    if mongo_client.client is None:
-        return JSONResponse(status_code=503, content={"status": "Not Ready", "message": "MongoDB client is not connected."})
-
-    return JSONResponse(status_code=200, content={"status": "Ready", "message": "Service is ready to accept traffic."})
+    return JSONResponse(status_code=200, content={"status": "Ready", "message": "Service is ready to accept traffic.", **report})
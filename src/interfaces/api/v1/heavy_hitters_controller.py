@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, Query
+from typing import List, Optional
+from src.dependencies.admin_dependency import verify_admin_key
+from src.dependencies.heavy_hitters_dependency import get_heavy_hitter_tracker
+from src.utils.heavy_hitters import DIMENSIONS, HeavyHitterTracker
+
+# Every endpoint requires the admin key
+router = APIRouter(dependencies=[Depends(verify_admin_key)])
+
+@router.get("/")
+async def get_heavy_hitters(
+    dimension: Optional[List[str]] = Query(None, description=f"Dimensions to report, among {', '.join(DIMENSIONS)}; all by default."),
+    limit: int = Query(10, ge=1, le=1000),
+    tracker: HeavyHitterTracker = Depends(get_heavy_hitter_tracker)
+):
+    """Top client IPs, API keys, routes and upstream error sources in the current and previous windows."""
+    dimensions = [name for name in dimension if name in DIMENSIONS] if dimension else DIMENSIONS
+    return tracker.top(dimensions, limit)
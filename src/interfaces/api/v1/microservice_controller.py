@@ -39,5 +39,4 @@ async def get_all_users(
     service: MicroserviceService = Depends(get_ms_service)  # Use Provide to inject UserService from Container
 ):
     """Get all users."""
-    print("-----Get all microservices")
     return await service.get_all_microservices()
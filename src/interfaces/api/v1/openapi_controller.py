@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.openapi.docs import get_swagger_ui_html
+from src.dependencies.openapi_dependency import get_openapi_aggregator
+from src.utils.openapi_aggregator import OpenApiAggregator
+
+router = APIRouter()
+
+@router.get("/openapi/aggregated.json", include_in_schema=False)
+async def get_aggregated_openapi(request: Request, aggregator: OpenApiAggregator = Depends(get_openapi_aggregator)):
+    """The gateway's and the registered microservices' OpenAPI documents, merged in the background."""
+    document = aggregator.document
+    if document is None:
+        raise HTTPException(status_code=503, detail="The aggregated OpenAPI document is not built yet.", headers={"Retry-After": "1"})
+    # Served exactly as serialized, without the standard response envelope
+    request.state.passthrough = True
+    headers = {"ETag": document.etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == document.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=document.body, media_type="application/json", headers=headers)
+
+@router.get("/openapi/docs", include_in_schema=False)
+async def get_aggregated_docs(request: Request):
+    """Swagger UI for the aggregated OpenAPI document."""
+    request.state.passthrough = True
+    return get_swagger_ui_html(openapi_url=request.url.path.rsplit("/", 1)[0] + "/aggregated.json", title="API Gateway - all services")
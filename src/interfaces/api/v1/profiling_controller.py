@@ -0,0 +1,43 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from typing import Literal
+from src.dependencies.admin_dependency import verify_admin_key
+from src.dependencies.profiling_dependency import get_cpu_profiler, get_loop_lag_monitor, get_memory_profiler
+from src.utils.profiling import EventLoopLagMonitor, MemoryProfiler, ProfilerBusy, SamplingProfiler
+
+# Only registered when profiling is enabled, and every endpoint requires the admin key
+router = APIRouter(dependencies=[Depends(verify_admin_key)])
+
+@router.get("/loop-lag")
+async def get_loop_stalls(monitor: EventLoopLagMonitor = Depends(get_loop_lag_monitor)):
+    """Recent event loop stalls with the stack that was running."""
+    return {"threshold_seconds": monitor.threshold, "stalls": list(monitor.stalls)}
+
+@router.get("/cpu", response_class=PlainTextResponse)
+async def profile_cpu(
+    seconds: float = Query(10.0, gt=0),
+    hz: int = Query(100, ge=1, le=1000),
+    profiler: SamplingProfiler = Depends(get_cpu_profiler)
+):
+    """Sample all threads for the given time and return a folded-stack profile for flame graphs."""
+    try:
+        profile = await asyncio.to_thread(profiler.profile, seconds, hz)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return PlainTextResponse(profile)
+
+@router.post("/memory/snapshot")
+async def snapshot_memory(
+    limit: int = Query(25, ge=1, le=500),
+    key_type: Literal["lineno", "filename", "traceback"] = "lineno",
+    profiler: MemoryProfiler = Depends(get_memory_profiler)
+):
+    """Take a tracemalloc snapshot and diff it against the previous one; the first call starts tracing."""
+    return await asyncio.to_thread(profiler.snapshot, limit, key_type)
+
+@router.delete("/memory")
+async def stop_memory_tracing(profiler: MemoryProfiler = Depends(get_memory_profiler)):
+    """Stop tracemalloc tracing."""
+    profiler.stop()
+    return {"tracing": False}
@@ -1,17 +1,14 @@
 from fastapi import FastAPI
-import uvicorn
 from src.infrastructure.di_container import Container
 from src.utils.system.config import load_config
 from src.utils.system.lifespan import lifespan
 from src.utils.system.middleware_setup import add_middlewares
 from src.utils.system.routes import register_routers
+from src.utils.system.server import serve
 from src.infrastructure.exception_handlers import register_exception_handlers
 from src.infrastructure.logging_config import setup_logging
 import logging
 
-# Setup logging configuration
-setup_logging()
-
 # Initialize the logger
 logger = logging.getLogger(__name__)
 
@@ -24,7 +21,15 @@ app = FastAPI(
 # Initialize the DI container
 container = Container()
 load_config(container)
-container.init_resources()
+container.wire(modules=[
+    "src.dependencies.microservice_service_dependency",
+    "src.dependencies.batch_service_dependency",
+    "src.dependencies.health_monitor_dependency",
+    "src.dependencies.admin_dependency",
+    "src.dependencies.profiling_dependency",
+    "src.dependencies.heavy_hitters_dependency",
+    "src.dependencies.openapi_dependency",
+])
 
 # Attach DI container to the app
 app.container = container
@@ -41,24 +46,17 @@ register_exception_handlers(app)
 # Set lifespan event handler for the FastAPI application
 app.router.lifespan_context = lifespan
 
-def server_started(server):
-    for server in server.servers:
-        for socket in server.sockets:
-            print(socket.getsockname())
-
 def main():
-    config = uvicorn.Config("main:app", port=8500)
-    server = uvicorn.Server(config)
-
-    orig_log_started_message = server._log_started_message
-
-    def patch_log_started_message(listeners):
-        orig_log_started_message(listeners)
-        server_started(server)
-
-    server._log_started_message = patch_log_started_message
-
-    server.run()
+    # Logging for the supervisor; each worker sets up its own at startup
+    setup_logging()
+    # One supervisor owns the listening socket; SIGHUP reloads the workers one at a time
+    serve(
+        "src.main:app",
+        host=container.config.server_host(),
+        port=container.config.server_port(),
+        workers=container.config.server_workers(),
+        drain_timeout=container.config.drain_timeout()
+    )
 
 if __name__ == "__main__":
     main()
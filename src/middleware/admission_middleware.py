@@ -0,0 +1,45 @@
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from src.utils.admission_controller import AdmissionController, AdmissionRejected
+from src.utils.request_context import BATCH_SUB_REQUEST_KEY
+import logging
+
+logger = logging.getLogger(__name__)
+
+class AdmissionControlMiddleware:
+    """Middleware to admit or shed requests by priority class when the gateway is overloaded.
+
+    Written as a plain ASGI middleware so the admission slot is held until the
+    response body, streamed or proxied, has been fully sent, not just until the
+    response headers.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController) -> None:
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        priority = self.controller.classify(scope["method"], scope["path"])
+        # Exposed to handlers as request.state.priority
+        scope.setdefault("state", {})["priority"] = priority
+        if scope.get(BATCH_SUB_REQUEST_KEY):
+            # Already admitted as part of its batch request
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            async with self.controller.admit(priority):
+                await self.app(scope, receive, send)
+        except AdmissionRejected as exc:
+            # Only raised by the admission itself, before the application has run
+            logger.warning(f"Shed {scope['method']} {scope['path']}: {exc}")
+            response = JSONResponse(
+                status_code=503,
+                content={"status": "error", "data": None, "message": "Gateway is overloaded, please retry later."},
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
@@ -0,0 +1,100 @@
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from fastapi import HTTPException
+from src.utils.memory_budget import MemoryBudget
+from src.utils.request_context import BATCH_SUB_REQUEST_KEY
+import logging
+
+logger = logging.getLogger(__name__)
+
+class BodyBudgetMiddleware:
+    """Middleware to reserve request bodies against the process-wide buffering budget.
+
+    Declared bodies (Content-Length) are checked and reserved before the request
+    is passed on, so oversized or unaffordable requests are rejected before a
+    single byte is read. Chunked bodies are read and reserved chunk by chunk
+    here, then replayed to the application. The reservation is released once
+    the response starts, when the body has been forwarded. Written as a plain
+    ASGI middleware so it can replace the receive channel.
+    """
+
+    def __init__(self, app: ASGIApp, budget: MemoryBudget) -> None:
+        self.app = app
+        self.budget = budget
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Batch sub-requests are built from the batch body, which is already reserved
+        if scope["type"] != "http" or scope.get(BATCH_SUB_REQUEST_KEY):
+            await self.app(scope, receive, send)
+            return
+
+        budget = self.budget
+        headers = Headers(scope=scope)
+        content_length = headers.get("content-length")
+        declared = int(content_length) if content_length and content_length.isdigit() else 0
+        try:
+            await budget.reserve(declared)
+        except HTTPException as exc:
+            await self._reject(scope, receive, send, exc)
+            return
+        reserved = declared
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            # The size is unknown up front, so the body is read and reserved here, chunk by chunk
+            chunks = []
+            try:
+                while True:
+                    message = await receive()
+                    if message["type"] != "http.request":
+                        budget.release(reserved)
+                        return
+                    chunk = message.get("body", b"")
+                    budget.check_size(reserved + len(chunk))
+                    await budget.reserve(len(chunk))
+                    reserved += len(chunk)
+                    chunks.append(chunk)
+                    if not message.get("more_body", False):
+                        break
+            except BaseException as exc:
+                budget.release(reserved)
+                if isinstance(exc, HTTPException):
+                    await self._reject(scope, receive, send, exc)
+                    return
+                raise
+            receive = self._replay(b"".join(chunks), receive)
+
+        async def send_released(message: Message) -> None:
+            nonlocal reserved
+            if message["type"] == "http.response.start":
+                # The body has been forwarded by the time the response starts
+                budget.release(reserved)
+                reserved = 0
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_released)
+        finally:
+            budget.release(reserved)
+
+    @staticmethod
+    def _replay(body: bytes, receive: Receive) -> Receive:
+        sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return replay_receive
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send, exc: HTTPException) -> None:
+        logger.warning(f"Rejected {scope['method']} {scope['path']}: {exc.detail}")
+        response = JSONResponse(
+            status_code=exc.status_code,
+            content={"status": "error", "data": None, "message": exc.detail},
+            headers=exc.headers,
+        )
+        await response(scope, receive, send)
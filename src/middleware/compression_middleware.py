@@ -0,0 +1,83 @@
+import asyncio
+from typing import AsyncIterator, List, Optional
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp
+from src.utils.compression import StreamCompressor, is_compressible, negotiate_encoding
+
+class CompressionMiddleware(BaseHTTPMiddleware):
+    """Middleware to compress responses with the best encoding the client accepts (br, zstd or gzip)."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        offload_size: int = 64 * 1024,
+        level: Optional[int] = None
+    ) -> None:
+        super().__init__(app)
+        # Bodies smaller than this are sent as they are
+        self.minimum_size = minimum_size
+        # Chunks at least this large are compressed in a worker thread
+        self.offload_size = offload_size
+        self.level = level
+
+    async def dispatch(self, request: Request, call_next):
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+        response = await call_next(request)
+
+        if encoding is None or request.method == "HEAD" or not self._should_compress(response):
+            return response
+
+        # Peek at the body until we know it is worth compressing
+        body_iterator = response.body_iterator
+        head: List[bytes] = []
+        size = 0
+        async for chunk in body_iterator:
+            head.append(chunk)
+            size += len(chunk)
+            if size >= self.minimum_size:
+                break
+        else:
+            response.body_iterator = self._replay(head)
+            return response
+
+        response.body_iterator = self._compress(encoding, b"".join(head), body_iterator)
+        if "content-length" in response.headers:
+            del response.headers["content-length"]
+        response.headers["Content-Encoding"] = encoding
+        response.headers.add_vary_header("Accept-Encoding")
+        return response
+
+    def _should_compress(self, response: Response) -> bool:
+        if response.status_code < 200 or response.status_code in (204, 304):
+            return False
+        if "content-encoding" in response.headers:
+            return False
+        if not is_compressible(response.headers.get("content-type")):
+            return False
+        content_length = response.headers.get("content-length")
+        return content_length is None or int(content_length) >= self.minimum_size
+
+    @staticmethod
+    async def _replay(chunks: List[bytes]) -> AsyncIterator[bytes]:
+        for chunk in chunks:
+            yield chunk
+
+    async def _compress(self, encoding: str, head: bytes, rest: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        compressor = StreamCompressor(encoding, self.level)
+        output = await self._run(compressor.compress, head)
+        if output:
+            yield output
+        async for chunk in rest:
+            output = await self._run(compressor.compress, chunk)
+            if output:
+                yield output
+        yield compressor.finish()
+
+    async def _run(self, compress, chunk: bytes) -> bytes:
+        # Keep large chunks off the event loop; small ones are cheaper to do inline
+        if len(chunk) >= self.offload_size:
+            return await asyncio.to_thread(compress, chunk)
+        return compress(chunk)
@@ -0,0 +1,58 @@
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from src.infrastructure import metrics
+from src.utils.deny_list import DenyList
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Policy violation: the handshake is refused before it is accepted
+WEBSOCKET_POLICY_VIOLATION = 1008
+
+class DenyListMiddleware:
+    """Middleware to refuse denied client networks and revoked tokens or API keys before any other work.
+
+    Written as a plain ASGI middleware so WebSocket handshakes are refused as well,
+    with a close before accept.
+    """
+
+    def __init__(self, app: ASGIApp, deny_list: DenyList) -> None:
+        self.app = app
+        self.deny_list = deny_list
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        deny_list = self.deny_list
+        client = scope.get("client")
+        host = client[0] if client else None
+        if deny_list.is_denied(host):
+            metrics.DENY_LIST_BLOCKED.labels("network").inc()
+            logger.warning(f"Denied {scope.get('method', 'WEBSOCKET')} {scope['path']} from {host}")
+            await self._refuse(scope, receive, send, 403, "Access denied.")
+            return
+
+        headers = Headers(scope=scope)
+        authorization = headers.get("authorization")
+        api_key = headers.get("x-api-key")
+        if (
+            (authorization and authorization[:7].lower() == "bearer " and deny_list.is_revoked(authorization[7:].strip()))
+            or (api_key and deny_list.is_revoked(api_key))
+        ):
+            metrics.DENY_LIST_BLOCKED.labels("credential").inc()
+            logger.warning(f"Refused revoked credential on {scope.get('method', 'WEBSOCKET')} {scope['path']} from {host}")
+            await self._refuse(scope, receive, send, 401, "Credential revoked.")
+            return
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _refuse(scope: Scope, receive: Receive, send: Send, status_code: int, message: str) -> None:
+        if scope["type"] == "websocket":
+            await send({"type": "websocket.close", "code": WEBSOCKET_POLICY_VIOLATION, "reason": message})
+            return
+        response = JSONResponse(status_code=status_code, content={"status": "error", "data": None, "message": message})
+        await response(scope, receive, send)
@@ -0,0 +1,51 @@
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.utils.drain import DrainController
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Probes keep answering while draining, so readiness can report it
+PROBE_PATHS = ("/api/v1/health", "/api/v1/readiness")
+
+class DrainMiddleware:
+    """Middleware to count requests in flight and wind connections down while the gateway drains.
+
+    While draining, responses carry ``Connection: close`` so keep-alive clients move
+    to another instance; once the drain is closed, new requests get ``503``. Written
+    as a plain ASGI middleware so a request stays counted until its response body,
+    streamed or not, has been fully sent.
+    """
+
+    def __init__(self, app: ASGIApp, controller: DrainController) -> None:
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        controller = self.controller
+        if controller.closed and not scope["path"].startswith(PROBE_PATHS):
+            logger.warning(f"Refused {scope['method']} {scope['path']}: gateway is shutting down")
+            response = JSONResponse(
+                status_code=503,
+                content={"status": "error", "data": None, "message": "Gateway is shutting down, please retry."},
+                headers={"Retry-After": "1", "Connection": "close"},
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_draining(message: Message) -> None:
+            if message["type"] == "http.response.start" and controller.draining:
+                headers = MutableHeaders(scope=message)
+                headers["connection"] = "close"
+            await send(message)
+
+        controller.acquire()
+        try:
+            await self.app(scope, receive, send_draining)
+        finally:
+            controller.release()
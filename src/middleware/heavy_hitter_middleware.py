@@ -0,0 +1,53 @@
+import hashlib
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp
+from src.infrastructure import metrics
+from src.utils.heavy_hitters import HeavyHitterTracker
+import logging
+
+logger = logging.getLogger(__name__)
+
+class HeavyHitterMiddleware(BaseHTTPMiddleware):
+    """Middleware to count requests per client IP, API key, route and upstream error, and throttle abusive clients."""
+
+    def __init__(self, app: ASGIApp, tracker: HeavyHitterTracker) -> None:
+        super().__init__(app)
+        self.tracker = tracker
+
+    async def dispatch(self, request: Request, call_next):
+        # Health checks, admin endpoints and critical routes are neither counted nor throttled
+        if getattr(request.state, "priority", None) == "critical":
+            return await call_next(request)
+
+        tracker = self.tracker
+        client_ip = request.client.host if request.client else "unknown"
+        count = tracker.record("client_ip", client_ip)
+        throttled = "client_ip" if tracker.should_throttle("client_ip", client_ip, count) else None
+        api_key = request.headers.get("x-api-key")
+        if api_key:
+            # Same truncated hash as the usage records, so keys never show up in clear
+            key_id = "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:16]
+            count = tracker.record("api_key", key_id)
+            if not throttled and tracker.should_throttle("api_key", key_id, count):
+                throttled = "api_key"
+        if throttled:
+            metrics.HEAVY_HITTER_THROTTLED.labels(throttled).inc()
+            logger.warning(f"Throttled {request.method} {request.url.path} from {client_ip}: {throttled} above {tracker.throttle_rate}/s")
+            return JSONResponse(
+                status_code=429,
+                content={"status": "error", "data": None, "message": "Too many requests, please slow down."},
+                headers={"Retry-After": "1"},
+            )
+
+        response = await call_next(request)
+
+        # Only requests that matched a route are counted, so unknown paths cannot flood the route counters
+        route = request.scope.get("route")
+        if route is not None:
+            label = f"{request.method} {route.path}"
+            tracker.record("route", label)
+            if response.status_code >= 500:
+                tracker.record("upstream_error", label)
+        return response
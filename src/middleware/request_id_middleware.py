@@ -1,19 +1,33 @@
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
-import uuid
+from starlette.types import ASGIApp
+from typing import Optional
+from src.utils.request_context import RequestIdGenerator, bind_request_id, reset_request_id
+
+# Incoming IDs longer than this are replaced rather than propagated
+MAX_REQUEST_ID_LENGTH = 128
 
 class RequestIDMiddleware(BaseHTTPMiddleware):
     """Middleware to extract or set a request ID for each request."""
 
+    def __init__(self, app: ASGIApp, generator: Optional[RequestIdGenerator] = None) -> None:
+        super().__init__(app)
+        self.generator = generator or RequestIdGenerator()
+
     async def dispatch(self, request: Request, call_next) -> Response:
-        # Extract the request ID from the headers or set a default value
-        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
-        # Store request ID in the request state for future use
+        # Extract the request ID from the headers or generate a new one
+        request_id = request.headers.get("X-Request-ID")
+        if not request_id or len(request_id) > MAX_REQUEST_ID_LENGTH or not request_id.isprintable():
+            request_id = self.generator.next_id()
+        # Store request ID in the request state and in the context read by logging, the proxy and publishers
         request.state.request_id = request_id
-
-        # Continue processing the request and get the response
-        response = await call_next(request)
+        token = bind_request_id(request_id)
+        try:
+            # Continue processing the request and get the response
+            response = await call_next(request)
+        finally:
+            reset_request_id(token)
 
         # Optionally, add the request ID to response headers
         response.headers["X-Request-ID"] = request_id
@@ -4,6 +4,8 @@ from starlette.requests import Request
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from fastapi.exceptions import HTTPException as FastAPIHTTPException
 from starlette.types import ASGIApp
+from typing import Optional, Sequence
+from src.utils.memory_budget import MemoryBudget
 import json
 
 class ResponseFormatMiddleware(BaseHTTPMiddleware):
@@ -11,10 +13,22 @@ class ResponseFormatMiddleware(BaseHTTPMiddleware):
     Middleware to standardize the format of API responses.
     """
 
-    def __init__(self, app: ASGIApp) -> None:
+    def __init__(
+        self,
+        app: ASGIApp,
+        excluded_paths: Sequence[str] = ("/internal/",),
+        budget: Optional[MemoryBudget] = None
+    ) -> None:
         super().__init__(app)
+        # Paths whose responses must reach the client untouched (e.g. Prometheus metrics)
+        self.excluded_paths = tuple(excluded_paths)
+        # Bounds the response bodies buffered here for reformatting
+        self.budget = budget
 
     async def dispatch(self, request: Request, call_next):
+        if request.url.path.startswith(self.excluded_paths):
+            return await call_next(request)
+
         try:
             # Process the request and get the response
             response = await call_next(request)
@@ -37,10 +51,30 @@ class ResponseFormatMiddleware(BaseHTTPMiddleware):
             }
             return JSONResponse(content=standardized_response, status_code=500)
 
+        # Proxied upstream responses are relayed as they are
+        if getattr(request.state, "passthrough", False):
+            return response
+
         # Check if the response is a StreamingResponse or does not contain a body
+        reserved = 0
         if isinstance(response, Response) and hasattr(response, "body_iterator"):
-            # Read the response body
-            body = b"".join([chunk async for chunk in response.body_iterator])
+            # Read the response body, reserving it against the buffering budget
+            chunks = []
+            try:
+                async for chunk in response.body_iterator:
+                    if self.budget:
+                        await self.budget.reserve(len(chunk))
+                        reserved += len(chunk)
+                    chunks.append(chunk)
+            except (StarletteHTTPException, FastAPIHTTPException) as exc:
+                if self.budget:
+                    self.budget.release(reserved)
+                return JSONResponse(
+                    content={"status": "error", "data": None, "message": exc.detail, "error": {"code": exc.status_code, "detail": exc.detail}},
+                    status_code=exc.status_code,
+                    headers=getattr(exc, "headers", None),
+                )
+            body = b"".join(chunks)
             response.body_iterator = iter([body])  # Set the body iterator back
 
             # Load the response body as JSON if applicable
@@ -61,4 +95,7 @@ class ResponseFormatMiddleware(BaseHTTPMiddleware):
         }
 
         # Return the new formatted JSON response
-        return JSONResponse(content=standardized_response, status_code=response.status_code)
+        formatted = JSONResponse(content=standardized_response, status_code=response.status_code)
+        if self.budget:
+            self.budget.release(reserved)
+        return formatted
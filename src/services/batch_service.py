@@ -0,0 +1,203 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Pattern, Tuple
+from fastapi import HTTPException, Request
+from httpx import URL, ASGITransport, AsyncClient, InvalidURL
+from starlette.routing import compile_path
+from src.core.schemas.batch_schema import BatchRequestSchema, BatchSubRequest
+from starlette.types import ASGIApp, Receive, Scope, Send
+from src.utils.request_context import BATCH_SUB_REQUEST_KEY, current_request_id
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Caller headers copied onto every sub-request so auth and client identity are unchanged
+FORWARDED_HEADERS = ("authorization", "x-api-key", "cookie", "x-request-id", "x-forwarded-for", "accept-language")
+
+# Gateway paths a batch may not target
+FORBIDDEN_PREFIXES = ("/api/v1/batch", "/internal/")
+
+
+class BatchService:
+    """Service layer for dispatching batches of sub-requests through the gateway."""
+
+    def __init__(self, max_requests: int = 20, max_concurrency: int = 10):
+        self.max_requests = max_requests
+        self.max_concurrency = max_concurrency
+        # service_name -> [(method, path, protocol)]; the lookup table below is rebuilt from it
+        self._service_streams: Dict[str, List[Tuple[Optional[str], str, str]]] = {}
+        self._streaming_routes: List[Tuple[Optional[str], Pattern, str]] = []
+
+    def set_streaming_routes(self, service_name: str, routes: List[Tuple[Optional[str], str, str]]) -> None:
+        """Record the streaming routes of a microservice, replacing its previous ones.
+
+        Sub-requests are buffered, so a batch can never target a stream that does not end.
+
+        Args:
+            service_name (str): The microservice the routes belong to.
+            routes (List[Tuple[Optional[str], str, str]]): ``(method, path, protocol)`` of each route; the
+                method is ``None`` for WebSocket routes, which match any method.
+        """
+        self._service_streams[service_name] = routes
+        self._rebuild_streams()
+
+    def remove_service(self, service_name: str) -> None:
+        """Forget the streaming routes of a microservice that is no longer registered."""
+        if self._service_streams.pop(service_name, None) is not None:
+            self._rebuild_streams()
+
+    def _rebuild_streams(self) -> None:
+        streams = []
+        for routes in self._service_streams.values():
+            for method, path, protocol in routes:
+                regex, _, _ = compile_path(path.rstrip("/") or "/")
+                streams.append((method, regex, protocol))
+        # Swapped in whole, so validation never sees a half-built table
+        self._streaming_routes = streams
+
+    def _streaming_protocol(self, method: str, path: str) -> Optional[str]:
+        path = path.rstrip("/") or "/"
+        for route_method, regex, protocol in self._streaming_routes:
+            if route_method in (None, method) and regex.match(path):
+                return protocol
+        return None
+
+    def validate(self, batch: BatchRequestSchema) -> None:
+        """Validate size, ids, targets and dependencies of a batch.
+
+        Raises:
+            HTTPException: If the batch is invalid.
+        """
+        if len(batch.requests) > self.max_requests:
+            raise HTTPException(status_code=400, detail=f"A batch may contain at most {self.max_requests} requests.")
+
+        ids = [sub_request.id for sub_request in batch.requests]
+        if len(set(ids)) != len(ids):
+            raise HTTPException(status_code=400, detail="Sub-request ids must be unique.")
+
+        dependencies = {}
+        for sub_request in batch.requests:
+            dispatched_path = self._dispatched_path(sub_request.path)
+            if dispatched_path.startswith(FORBIDDEN_PREFIXES):
+                raise HTTPException(status_code=400, detail=f"Path '{sub_request.path}' cannot be used in a batch.")
+            protocol = self._streaming_protocol(sub_request.method, dispatched_path)
+            if protocol:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Path '{sub_request.path}' is a streaming route ({protocol}) and cannot be used in a batch."
+                )
+            unknown = set(sub_request.depends_on) - set(ids)
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Sub-request '{sub_request.id}' depends on unknown ids: {sorted(unknown)}.")
+            dependencies[sub_request.id] = set(sub_request.depends_on)
+
+        # Kahn's algorithm: whatever cannot be ordered is part of a cycle
+        remaining = dict(dependencies)
+        while remaining:
+            ready = [id_ for id_, deps in remaining.items() if not deps & remaining.keys()]
+            if not ready:
+                raise HTTPException(status_code=400, detail=f"Dependency cycle between sub-requests: {sorted(remaining)}.")
+            for id_ in ready:
+                del remaining[id_]
+
+    async def execute(self, request: Request, batch: BatchRequestSchema) -> List[Dict[str, Any]]:
+        """Dispatch the batch and return the results in request order."""
+        results = {}
+        async for result in self.execute_as_completed(request, batch):
+            results[result["id"]] = result
+        return [results[sub_request.id] for sub_request in batch.requests]
+
+    async def execute_as_completed(self, request: Request, batch: BatchRequestSchema) -> AsyncIterator[Dict[str, Any]]:
+        """Dispatch the batch and yield each result as soon as it is available."""
+        self.validate(batch)
+        forwarded_headers = {
+            name: value for name, value in request.headers.items() if name in FORWARDED_HEADERS
+        }
+        # Sub-requests share the batch request ID so they can be correlated
+        forwarded_headers["x-request-id"] = current_request_id() or request.state.request_id
+        client_address = (request.client.host, request.client.port) if request.client else ("127.0.0.1", 0)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Sub-requests go through the whole application, so middlewares, rate limits
+        # and route dependencies apply exactly as they do to direct calls
+        transport = ASGITransport(app=_batch_sub_requests(request.app), client=client_address)
+        async with AsyncClient(transport=transport, base_url=str(request.base_url)) as client:
+            tasks: Dict[str, asyncio.Task] = {}
+
+            async def run(sub_request: BatchSubRequest) -> Dict[str, Any]:
+                for dependency in sub_request.depends_on:
+                    dependency_result = await asyncio.shield(tasks[dependency])
+                    if dependency_result["status"] >= 400:
+                        return self._failed_dependency(sub_request, dependency)
+                async with semaphore:
+                    return await self._dispatch(client, sub_request, forwarded_headers)
+
+            for sub_request in batch.requests:
+                tasks[sub_request.id] = asyncio.ensure_future(run(sub_request))
+            try:
+                for next_done in asyncio.as_completed(list(tasks.values())):
+                    yield await next_done
+            finally:
+                for task in tasks.values():
+                    task.cancel()
+
+    async def _dispatch(self, client: AsyncClient, sub_request: BatchSubRequest, forwarded_headers: Dict[str, str]) -> Dict[str, Any]:
+        headers = {**forwarded_headers, **sub_request.headers}
+        try:
+            response = await client.request(
+                sub_request.method,
+                sub_request.path,
+                headers=headers,
+                params=sub_request.query,
+                json=sub_request.body,
+            )
+        except Exception as e:
+            logger.error(f"Batch sub-request '{sub_request.id}' failed: {e}")
+            return {"id": sub_request.id, "status": 502, "headers": {}, "body": None, "error": str(e)}
+
+        return {
+            "id": sub_request.id,
+            "status": response.status_code,
+            "headers": {"content-type": response.headers.get("content-type")},
+            "body": self._decode_body(response.content, response.headers.get("content-type")),
+        }
+
+    @staticmethod
+    def _dispatched_path(path: str) -> str:
+        """The path the application will see, once the HTTP client has decoded and normalized it."""
+        # "//host/..." would be read as a network location rather than a path
+        if path.startswith("//"):
+            raise HTTPException(status_code=400, detail=f"Path '{path}' is not a valid URL path.")
+        try:
+            return URL("http://gateway/" + path.lstrip("/")).path
+        except InvalidURL:
+            raise HTTPException(status_code=400, detail=f"Path '{path}' is not a valid URL path.")
+
+    @staticmethod
+    def _failed_dependency(sub_request: BatchSubRequest, dependency: str) -> Dict[str, Any]:
+        return {
+            "id": sub_request.id,
+            "status": 424,
+            "headers": {},
+            "body": None,
+            "error": f"Dependency '{dependency}' did not succeed.",
+        }
+
+    @staticmethod
+    def _decode_body(content: bytes, content_type: Optional[str]) -> Any:
+        if not content:
+            return None
+        if content_type and "json" in content_type:
+            try:
+                return json.loads(content)
+            except ValueError:
+                pass
+        return content.decode("utf-8", errors="replace")
+
+
+def _batch_sub_requests(app: ASGIApp) -> ASGIApp:
+    """Mark the requests sent to the application as batch sub-requests."""
+    async def marked_app(scope: Scope, receive: Receive, send: Send) -> None:
+        scope[BATCH_SUB_REQUEST_KEY] = True
+        await app(scope, receive, send)
+    return marked_app
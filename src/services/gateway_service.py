@@ -1,28 +1,64 @@
 from typing import Any, Dict, Optional
-from src.core.repositories.db_repository import DBRepository
+from fastapi import HTTPException
+from httpx import USE_CLIENT_DEFAULT, RequestError, TimeoutException
+from src.core.entities.microservice import Microservice, TransformConfig
+from src.core.repositories.registry_repository import RegistryRepository
+from src.infrastructure.http_client import UpstreamHttpClient
+from src.utils.request_context import current_request_id
+from src.utils.request_transform import RequestTransform
+import logging
+
+logger = logging.getLogger(__name__)
 
 class GatewayService:
     """Service layer for the API Gateway microservice."""
 
-    def __init__(self, user_repository: DBRepository, request_id: Optional[str] = None):
-        self.user_repository = user_repository
+    def __init__(self, db_repository: RegistryRepository, http_client: UpstreamHttpClient):
+        self.db_repository = db_repository
+        self.http_client = http_client
 
-    async def forward_request_to_service(self, service_name: str, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    async def forward_request_to_service(
+        self,
+        service_name: str,
+        path: str,
+        method: str = "GET",
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Any] = None
+    ) -> Dict[str, Any]:
         """
-        Forward a request to a registered microservice.
-        
+        Forward a request to a registered microservice, authenticated with its API key.
+
         Args:
             service_name (str): The name of the target microservice.
             path (str): The endpoint path of the target microservice.
-            params (Optional[Dict[str, Any]]): Query parameters or data to send.
+            method (str): The HTTP method.
+            params (Optional[Dict[str, Any]]): Query parameters to send.
+            json (Optional[Any]): JSON body to send.
 
         Returns:
             Dict[str, Any]: The response data from the microservice.
         """
         # Retrieve microservice details from MongoDB
-        microservice = await self.collection.find_one({"service_name": service_name})
-        if not microservice:
+        documents = await self.db_repository.find({"service_name": service_name})
+        if not documents:
             raise ValueError(f"Microservice '{service_name}' is not registered.")
-        
-        url = f"{microservice['base_url']}/{path}"
-        headers = {"Authorization": f"Bearer {microservice['api_key']}"}
+        microservice = Microservice(**documents[0])
+
+        transform = RequestTransform(TransformConfig(inject_api_key=True), microservice.api_key)
+        url = str(microservice.base_url).rstrip('/') + '/api/v1' + transform.target(path, "", {})
+        try:
+            response = await self.http_client.get_client().request(
+                method,
+                url,
+                params=params,
+                json=json,
+                headers=transform.headers([], current_request_id()),
+                timeout=microservice.timeout or USE_CLIENT_DEFAULT,
+            )
+        except TimeoutException:
+            raise HTTPException(status_code=504, detail=f"Microservice {service_name} timed out.")
+        except RequestError as e:
+            logger.error(f"Request to '{service_name}' failed: {method} {url}: {e}")
+            raise HTTPException(status_code=502, detail=f"Microservice {service_name} is unavailable.")
+        response.raise_for_status()
+        return response.json()
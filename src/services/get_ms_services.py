@@ -1,7 +1,7 @@
 from typing import Optional
 from fastapi import HTTPException
 from src.core.entities.microservice import Microservice
-from src.core.repositories.db_repository import DBRepository
+from src.core.repositories.registry_repository import RegistryRepository
 from src.core.use_cases.get_ms import GetMicroservices
 from src.core.use_cases.get_all_ms import GetAllMicroservices
 import logging
@@ -11,11 +11,10 @@ logger = logging.getLogger(__name__)
 class GetMicroservices:
     """Service layer for managing microservice registration."""
 
-    def __init__(self, db_repository: DBRepository, request_id: Optional[str] = None):
+    def __init__(self, db_repository: RegistryRepository):
         self.db_repository = db_repository
         self.get_microservices_use_case = GetMicroservices(self.db_repository)
         self.get_all_microservices_use_case = GetAllMicroservices(self.db_repository)
-        self.request_id = request_id
     
     async def get_microservice_by_name(self, service_name: str) -> Optional[Microservice]:
         """Retrieve a microservice by its service name.
@@ -29,12 +28,12 @@ class GetMicroservices:
         try:
             microservice = await self.get_microservices_use_case.execute(service_name=service_name)
             if not microservice:
-                logger.info(f"Microservice with name '{service_name}' not found.", extra={"request_id": self.request_id})
+                logger.info(f"Microservice with name '{service_name}' not found.")
             return microservice
 
         except Exception as e:
             # Log and raise unexpected exceptions
-            logger.error(f"Failed to retrieve microservice '{service_name}': {e}", extra={"request_id": self.request_id})
+            logger.error(f"Failed to retrieve microservice '{service_name}': {e}")
             raise HTTPException(status_code=500, detail=f"Failed to retrieve microservice '{service_name}': {e}")
         
     async def get_all_microservices(self):
@@ -49,5 +48,5 @@ class GetMicroservices:
 
         except Exception as e:
             # Log and raise unexpected exceptions
-            logger.error(f"Failed to retrieve microservices: {e}", extra={"request_id": self.request_id})
+            logger.error(f"Failed to retrieve microservices: {e}")
             raise HTTPException(status_code=500, detail=f"Failed to retrieve microservices: {e}")
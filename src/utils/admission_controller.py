@@ -0,0 +1,280 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import Deque, Dict, List, Optional, Pattern, Tuple
+from starlette.routing import compile_path
+from src.infrastructure import metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Priority classes, highest first
+PRIORITIES = ("critical", "high", "normal", "low")
+
+# Share of the global in-flight budget each class may use on its own
+DEFAULT_CLASS_SHARES = {"critical": 1.0, "high": 1.0, "normal": 0.7, "low": 0.4}
+
+# Gateway-owned paths that never go through the microservice registry
+DEFAULT_PREFIX_PRIORITIES = (
+    ("/api/v1/health", "critical"),
+    ("/api/v1/readiness", "critical"),
+    ("/internal/", "critical"),
+    ("/api/v1/", "normal"),
+)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed by the admission controller."""
+
+    def __init__(self, priority: str, reason: str):
+        super().__init__(f"Request with priority '{priority}' shed: {reason}")
+        self.priority = priority
+        self.reason = reason
+
+
+class _PriorityClass:
+    """Per-class budget, wait queue and CoDel state."""
+
+    def __init__(self, name: str, rank: int, budget: int):
+        self.name = name
+        self.rank = rank
+        self.budget = budget
+        self.inflight = 0
+        self.waiters: Deque[Tuple[float, asyncio.Future]] = deque()
+        # CoDel state: when the queueing delay first went above target, and whether we are shedding
+        self.first_above_time = 0.0
+        self.dropping = False
+
+        self.inflight_gauge = metrics.ADMISSION_INFLIGHT.labels(priority=name)
+        self.queue_gauge = metrics.ADMISSION_QUEUE_DEPTH.labels(priority=name)
+        self.delay_histogram = metrics.ADMISSION_QUEUE_DELAY.labels(priority=name)
+        self.shed_codel = metrics.ADMISSION_SHED.labels(priority=name, reason="queue_delay")
+        self.shed_queue_full = metrics.ADMISSION_SHED.labels(priority=name, reason="queue_full")
+        self.shed_preempted = metrics.ADMISSION_SHED.labels(priority=name, reason="preempted")
+        self.shed_timeout = metrics.ADMISSION_SHED.labels(priority=name, reason="timeout")
+
+
+class AdmissionController:
+    """Global ingress admission controller with per-priority in-flight budgets.
+
+    Requests are admitted immediately while their class is under budget and the
+    gateway is under its global in-flight limit. Otherwise they queue; freed slots go
+    to the highest waiting class first, so lower classes see queueing delay first.
+    Each class runs CoDel on its queueing delay: once the delay stays above
+    ``target_delay`` for a whole ``interval`` the class sheds new arrivals and
+    stale waiters until the delay drops again. ``critical`` requests are never queued.
+    """
+
+    def __init__(
+        self,
+        max_inflight: int = 512,
+        max_queue: int = 1024,
+        target_delay: float = 0.05,
+        interval: float = 0.5,
+        class_shares: Optional[Dict[str, float]] = None
+    ):
+        shares = {**DEFAULT_CLASS_SHARES, **(class_shares or {})}
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.target_delay = target_delay
+        self.interval = interval
+        # A waiter never waits longer than this, whatever the CoDel state
+        self.max_wait = interval * 4
+        self.inflight = 0
+        self.queued = 0
+        self.classes: Dict[str, _PriorityClass] = {
+            name: _PriorityClass(name, rank, max(1, int(max_inflight * shares[name])))
+            for rank, name in enumerate(PRIORITIES)
+        }
+        # service_name -> [(method, path, priority)]; the lookup tables below are rebuilt from it
+        self._service_routes: Dict[str, List[Tuple[str, str, str]]] = {}
+        self._exact_routes: Dict[Tuple[str, str], str] = {}
+        self._templated_routes: List[Tuple[str, Pattern, str]] = []
+        self._prefix_priorities = DEFAULT_PREFIX_PRIORITIES
+
+    def set_service_routes(self, service_name: str, routes: List[Tuple[str, str, str]]) -> None:
+        """Record the priority classes of the routes of a microservice, replacing its previous ones.
+
+        Args:
+            service_name (str): The microservice the routes belong to.
+            routes (List[Tuple[str, str, str]]): ``(method, path, priority)`` of each route; paths may
+                contain path parameters and priorities are one of ``PRIORITIES``.
+        """
+        for _, _, priority in routes:
+            if priority not in self.classes:
+                raise ValueError(f"Unknown priority class '{priority}'.")
+        self._service_routes[service_name] = [(method.upper(), path, priority) for method, path, priority in routes]
+        self._rebuild_routes()
+
+    def remove_service(self, service_name: str) -> None:
+        """Forget the route priorities of a microservice that is no longer registered."""
+        if self._service_routes.pop(service_name, None) is not None:
+            self._rebuild_routes()
+
+    def _rebuild_routes(self) -> None:
+        exact: Dict[Tuple[str, str], str] = {}
+        templated: List[Tuple[str, Pattern, str]] = []
+        for routes in self._service_routes.values():
+            for method, path, priority in routes:
+                if "{" in path:
+                    regex, _, _ = compile_path(path)
+                    templated.append((method, regex, priority))
+                else:
+                    exact[(method, path.rstrip("/") or "/")] = priority
+        # Swapped in whole, so classification never sees a half-built table
+        self._exact_routes, self._templated_routes = exact, templated
+
+    def classify(self, method: str, path: str) -> str:
+        """Return the priority class for a request.
+
+        Args:
+            method (str): HTTP method of the request.
+            path (str): Request path.
+
+        Returns:
+            str: The priority class name.
+        """
+        priority = self._exact_routes.get((method, path.rstrip("/") or "/"))
+        if priority:
+            return priority
+        for route_method, regex, route_priority in self._templated_routes:
+            if route_method == method and regex.match(path):
+                return route_priority
+        for prefix, prefix_priority in self._prefix_priorities:
+            if path.startswith(prefix):
+                return prefix_priority
+        return "low"
+
+    @asynccontextmanager
+    async def admit(self, priority: str):
+        """Hold an admission slot of the given class for the duration of a request.
+
+        Raises:
+            AdmissionRejected: If the request is shed.
+        """
+        priority_class = self.classes[priority]
+        await self._acquire(priority_class)
+        try:
+            yield
+        finally:
+            self._release(priority_class)
+
+    def _has_capacity(self, priority_class: _PriorityClass) -> bool:
+        return priority_class.inflight < priority_class.budget and self.inflight < self.max_inflight
+
+    def _take(self, priority_class: _PriorityClass) -> None:
+        priority_class.inflight += 1
+        self.inflight += 1
+        priority_class.inflight_gauge.set(priority_class.inflight)
+
+    async def _acquire(self, priority_class: _PriorityClass) -> None:
+        if priority_class.name == "critical" or (
+            self._has_capacity(priority_class) and not self._has_waiters_above(priority_class.rank + 1)
+        ):
+            self._take(priority_class)
+            return
+
+        if priority_class.dropping:
+            priority_class.shed_codel.inc()
+            raise AdmissionRejected(priority_class.name, "queueing delay above target")
+
+        if self.queued >= self.max_queue and not self._preempt_lower(priority_class.rank):
+            priority_class.shed_queue_full.inc()
+            raise AdmissionRejected(priority_class.name, "admission queue full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (monotonic(), waiter)
+        priority_class.waiters.append(entry)
+        self.queued += 1
+        priority_class.queue_gauge.set(len(priority_class.waiters))
+        try:
+            await asyncio.wait_for(waiter, self.max_wait)
+        except asyncio.TimeoutError:
+            # The slot may have been handed over right before the timeout
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                self._release(priority_class)
+            priority_class.shed_timeout.inc()
+            raise AdmissionRejected(priority_class.name, "admission wait timed out")
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                self._release(priority_class)
+            raise
+        finally:
+            try:
+                priority_class.waiters.remove(entry)
+                self.queued -= 1
+            except ValueError:
+                pass
+            priority_class.queue_gauge.set(len(priority_class.waiters))
+            if not priority_class.waiters:
+                self._reset_codel(priority_class)
+
+    def _has_waiters_above(self, rank: int) -> bool:
+        # True when any of the ``rank`` highest classes has requests waiting
+        return any(self.classes[name].waiters for name in PRIORITIES[:rank])
+
+    def _reset_codel(self, priority_class: _PriorityClass) -> None:
+        # Like CoDel leaving the dropping state once its queue drains
+        if priority_class.dropping:
+            logger.info(f"Admission class '{priority_class.name}' left the dropping state.")
+        priority_class.first_above_time = 0.0
+        priority_class.dropping = False
+
+    def _preempt_lower(self, rank: int) -> bool:
+        """Shed the newest waiter of the lowest class below ``rank`` to make room."""
+        for name in reversed(PRIORITIES[rank + 1:]):
+            lower = self.classes[name]
+            while lower.waiters:
+                _, waiter = lower.waiters.pop()
+                self.queued -= 1
+                lower.queue_gauge.set(len(lower.waiters))
+                if not waiter.done():
+                    lower.shed_preempted.inc()
+                    waiter.set_exception(AdmissionRejected(name, "preempted by higher priority traffic"))
+                    return True
+        return False
+
+    def _release(self, priority_class: _PriorityClass) -> None:
+        priority_class.inflight -= 1
+        self.inflight -= 1
+        priority_class.inflight_gauge.set(priority_class.inflight)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiters, highest class first, applying CoDel per class."""
+        now = monotonic()
+        for name in PRIORITIES:
+            priority_class = self.classes[name]
+            while priority_class.waiters and self._has_capacity(priority_class):
+                enqueued_at, waiter = priority_class.waiters.popleft()
+                self.queued -= 1
+                priority_class.queue_gauge.set(len(priority_class.waiters))
+                if waiter.done():
+                    continue
+                sojourn = now - enqueued_at
+                priority_class.delay_histogram.observe(sojourn)
+                if self._should_drop(priority_class, sojourn, now):
+                    priority_class.shed_codel.inc()
+                    waiter.set_exception(AdmissionRejected(name, "queueing delay above target"))
+                    continue
+                self._take(priority_class)
+                waiter.set_result(None)
+            if not priority_class.waiters:
+                self._reset_codel(priority_class)
+            if self.inflight >= self.max_inflight:
+                return
+
+    def _should_drop(self, priority_class: _PriorityClass, sojourn: float, now: float) -> bool:
+        if sojourn < self.target_delay:
+            self._reset_codel(priority_class)
+            return False
+        if priority_class.first_above_time == 0.0:
+            priority_class.first_above_time = now + self.interval
+            return False
+        if now >= priority_class.first_above_time:
+            if not priority_class.dropping:
+                logger.warning(f"Admission class '{priority_class.name}' entered the dropping state.")
+            priority_class.dropping = True
+            return True
+        return False
@@ -0,0 +1,167 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import Callable, Deque, Optional
+from src.core.entities.microservice import ConcurrencyConfig
+from src.infrastructure.exception_handlers import UpstreamOverloadedException
+from src.infrastructure import metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveConcurrencyLimit:
+    """AIMD concurrency limit driven by the observed upstream latency.
+
+    The limit grows by one while the upstream answers close to its no-load latency
+    and is multiplied by ``backoff_ratio`` when latency degrades or a request fails.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        backoff_ratio: float = 0.9,
+        latency_tolerance: float = 2.0,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self.value = min(max(initial_limit, min_limit), self.max_limit)
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.baseline_latency: Optional[float] = None
+
+    def on_sample(self, latency: float, inflight: int, dropped: bool) -> int:
+        """Update the limit with a completed request and return the new value.
+
+        Args:
+            latency (float): Time in seconds the request held its slot.
+            inflight (int): Number of requests in flight when the sample was taken.
+            dropped (bool): Whether the request failed or timed out.
+
+        Returns:
+            int: The updated concurrency limit.
+        """
+        baseline = self.baseline_latency
+        if not dropped:
+            # Track the no-load latency: follow drops immediately, drift up slowly
+            if baseline is None or latency < baseline:
+                self.baseline_latency = latency
+            else:
+                self.baseline_latency = baseline + (latency - baseline) * 0.01
+
+        if dropped or (baseline is not None and latency > baseline * self.latency_tolerance):
+            self.value = max(self.min_limit, int(self.value * self.backoff_ratio))
+        elif inflight * 2 >= self.value:
+            # Only grow when the current limit is actually being used
+            self.value = min(self.max_limit, self.value + 1)
+        return self.value
+
+
+class UpstreamBulkhead:
+    """Bounds the number of outstanding requests to a single upstream microservice."""
+
+    def __init__(self, service_name: str, config: Optional[ConcurrencyConfig] = None):
+        config = config or ConcurrencyConfig()
+        self.service_name = service_name
+        self.queue_size = config.queue_size
+        self.queue_timeout = config.queue_timeout
+        self.limit = AdaptiveConcurrencyLimit(config.initial_limit, config.min_limit, config.max_limit)
+        self.inflight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        # Bind the labelled metric children once instead of on every request
+        self._limit_gauge = metrics.UPSTREAM_CONCURRENCY_LIMIT.labels(service=service_name)
+        self._inflight_gauge = metrics.UPSTREAM_INFLIGHT.labels(service=service_name)
+        self._queue_gauge = metrics.UPSTREAM_QUEUE_DEPTH.labels(service=service_name)
+        self._queue_full = metrics.UPSTREAM_REJECTED.labels(service=service_name, reason="queue_full")
+        self._queue_timeout = metrics.UPSTREAM_REJECTED.labels(service=service_name, reason="queue_timeout")
+        self._latency = metrics.UPSTREAM_LATENCY.labels(service=service_name)
+        self._limit_gauge.set(self.limit.value)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a concurrency slot for the duration of an upstream call.
+
+        Raises:
+            UpstreamOverloadedException: If the wait queue is full or the wait times out.
+        """
+        release = await self.acquire()
+        dropped = False
+        try:
+            yield
+        except BaseException:
+            dropped = True
+            raise
+        finally:
+            release(dropped)
+
+    async def acquire(self) -> Callable[[bool], None]:
+        """Take a concurrency slot that outlives a block, such as one held until a streamed body is closed.
+
+        Returns:
+            Callable[[bool], None]: Releases the slot, telling whether the call failed; later calls do nothing.
+
+        Raises:
+            UpstreamOverloadedException: If the wait queue is full or the wait times out.
+        """
+        await self._acquire()
+        start = monotonic()
+        released = False
+
+        def release(dropped: bool = False) -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self._release(monotonic() - start, dropped)
+        return release
+
+    async def _acquire(self) -> None:
+        if self.inflight < self.limit.value and not self._waiters:
+            self.inflight += 1
+            self._inflight_gauge.set(self.inflight)
+            return
+
+        if len(self._waiters) >= self.queue_size:
+            self._queue_full.inc()
+            raise UpstreamOverloadedException(self.service_name)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._queue_gauge.set(len(self._waiters))
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            # The slot may have been handed over right before the timeout
+            if waiter.done() and not waiter.cancelled():
+                self._release_slot()
+            self._queue_timeout.inc()
+            raise UpstreamOverloadedException(self.service_name)
+        except asyncio.CancelledError:
+            # The slot may have been handed over right before the cancellation
+            if waiter.done() and not waiter.cancelled():
+                self._release_slot()
+            raise
+        finally:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+            self._queue_gauge.set(len(self._waiters))
+
+    def _release(self, latency: float, dropped: bool) -> None:
+        self._latency.observe(latency)
+        self._limit_gauge.set(self.limit.on_sample(latency, self.inflight, dropped))
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        # Hand the slot directly to the oldest waiter while the limit allows it
+        while self._waiters and self.inflight <= self.limit.value:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.inflight -= 1
+        self._inflight_gauge.set(self.inflight)
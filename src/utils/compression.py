@@ -0,0 +1,104 @@
+import zlib
+from typing import FrozenSet, List, Optional
+
+# Optional codecs: only advertised when the package is installed
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# Server preference when the client weights several encodings equally
+SUPPORTED_ENCODINGS: List[str] = [
+    encoding for encoding, available in (("br", brotli), ("zstd", zstandard), ("gzip", zlib)) if available
+]
+
+# Content types that are already compressed or not worth compressing
+INCOMPRESSIBLE_TYPE_PREFIXES = ("image/", "video/", "audio/", "font/woff")
+INCOMPRESSIBLE_TYPES: FrozenSet[str] = frozenset({
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/x-bzip2",
+    "application/zstd",
+    "application/pdf",
+    "application/octet-stream",
+    # Streamed formats: compressing would hold back events until the compressor flushes
+    "text/event-stream",
+    "application/x-ndjson",
+})
+
+def parse_accept_encoding(header: Optional[str]) -> dict:
+    """Parse an Accept-Encoding header into a mapping of encoding to q-value."""
+    accepted = {}
+    if not header:
+        return accepted
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token] = quality
+    return accepted
+
+def accepts_encoding(accepted: dict, encoding: str) -> bool:
+    """Return whether the parsed Accept-Encoding allows the given encoding."""
+    quality = accepted.get(encoding.lower(), accepted.get("*", 0.0))
+    return quality > 0
+
+def negotiate_encoding(header: Optional[str]) -> Optional[str]:
+    """Pick the best encoding supported by both the client and the gateway."""
+    accepted = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    """Return whether responses of the given content type are worth compressing."""
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return not (media_type in INCOMPRESSIBLE_TYPES or media_type.startswith(INCOMPRESSIBLE_TYPE_PREFIXES))
+
+
+class StreamCompressor:
+    """Incremental compressor with a common interface over gzip, brotli and zstd."""
+
+    def __init__(self, encoding: str, level: Optional[int] = None):
+        self.encoding = encoding
+        if encoding == "gzip":
+            # wbits=31 writes a gzip header and trailer
+            self._compressor = zlib.compressobj(level if level is not None else 6, zlib.DEFLATED, 31)
+            self._compress, self._finish = self._compressor.compress, self._compressor.flush
+        elif encoding == "br":
+            self._compressor = brotli.Compressor(quality=level if level is not None else 4)
+            self._compress, self._finish = self._compressor.process, self._compressor.finish
+        elif encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=level if level is not None else 3).compressobj()
+            self._compress, self._finish = self._compressor.compress, self._compressor.flush
+        else:
+            raise ValueError(f"Unsupported encoding '{encoding}'.")
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and return whatever output is ready."""
+        return self._compress(data)
+
+    def finish(self) -> bytes:
+        """Flush the remaining output and terminate the stream."""
+        return self._finish()
@@ -0,0 +1,198 @@
+import asyncio
+import hashlib
+from ipaddress import ip_address, ip_network
+from typing import Iterable, List, Optional, Tuple
+from src.infrastructure import metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def credential_hash(credential: str) -> bytes:
+    """SHA-256 of a token or API key, the form revoked credentials are stored in."""
+    return hashlib.sha256(credential.encode()).digest()
+
+
+class CidrTree:
+    """Binary radix tree of network prefixes for one address family.
+
+    Nodes are ``[zero_child, one_child, terminal]`` lists. A lookup walks at most one
+    node per address bit and stops at the first terminal prefix.
+    """
+
+    __slots__ = ("bits", "root", "size")
+
+    def __init__(self, bits: int):
+        self.bits = bits
+        self.root = [None, None, False]
+        self.size = 0
+
+    def add(self, network: int, prefix_length: int) -> None:
+        node = self.root
+        for position in range(self.bits - 1, self.bits - 1 - prefix_length, -1):
+            if node[2]:
+                # Already covered by a shorter prefix
+                return
+            bit = (network >> position) & 1
+            if node[bit] is None:
+                node[bit] = [None, None, False]
+            node = node[bit]
+        if not node[2]:
+            node[2] = True
+            # Longer prefixes below are now redundant
+            node[0] = node[1] = None
+            self.size += 1
+
+    def contains(self, address: int) -> bool:
+        node = self.root
+        for position in range(self.bits - 1, -1, -1):
+            if node[2]:
+                return True
+            node = node[(address >> position) & 1]
+            if node is None:
+                return False
+        return node[2]
+
+
+class DenySnapshot:
+    """Immutable deny-list state; replaced as a whole, never modified in place."""
+
+    __slots__ = ("ipv4", "ipv6", "revoked", "networks")
+
+    def __init__(self, networks: Iterable[str] = (), revoked: Iterable[bytes] = ()):
+        self.ipv4 = CidrTree(32)
+        self.ipv6 = CidrTree(128)
+        self.networks = []
+        for entry in networks:
+            try:
+                network = ip_network(entry.strip(), strict=False)
+            except ValueError:
+                logger.warning(f"Ignoring invalid deny-list network '{entry}'.")
+                continue
+            tree = self.ipv4 if network.version == 4 else self.ipv6
+            tree.add(int(network.network_address), network.prefixlen)
+            self.networks.append(str(network))
+        self.revoked = frozenset(revoked)
+
+
+class DenyList:
+    """Denied client networks and revoked credentials, checked on every request without I/O.
+
+    The lists live in two Redis sets: CIDRs in ``networks_key`` and SHA-256 hex digests
+    of revoked tokens and API keys in ``credentials_key``. They are loaded at startup,
+    reloaded whenever a message arrives on ``channel`` and every ``resync_interval``
+    seconds, and each reload builds a new snapshot that replaces the current one in a
+    single assignment, so lookups never see a half-applied update.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        networks_key: str = "deny:networks",
+        credentials_key: str = "deny:credentials",
+        channel: str = "deny:updates",
+        resync_interval: float = 60.0,
+        retry_interval: float = 5.0
+    ):
+        self.redis_client = redis_client
+        self.networks_key = networks_key
+        self.credentials_key = credentials_key
+        self.channel = channel
+        self.resync_interval = resync_interval
+        self.retry_interval = retry_interval
+        self.snapshot = DenySnapshot()
+        self._listener: Optional[asyncio.Task] = None
+
+    def is_denied(self, host: Optional[str]) -> bool:
+        """Whether a client address falls in a denied network."""
+        snapshot = self.snapshot
+        if not host or not (snapshot.ipv4.size or snapshot.ipv6.size):
+            return False
+        try:
+            address = ip_address(host)
+        except ValueError:
+            return False
+        # Dual-stack listeners report IPv4 clients as ::ffff:a.b.c.d, which must match IPv4 networks
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        tree = snapshot.ipv4 if address.version == 4 else snapshot.ipv6
+        return tree.contains(int(address))
+
+    def is_revoked(self, credential: str) -> bool:
+        """Whether a token or API key has been revoked."""
+        revoked = self.snapshot.revoked
+        return bool(revoked) and credential_hash(credential) in revoked
+
+    def replace(self, networks: Iterable[str], revoked: Iterable[bytes]) -> None:
+        """Build a new snapshot and swap it in."""
+        snapshot = DenySnapshot(networks, revoked)
+        self.snapshot = snapshot
+        metrics.DENY_LIST_ENTRIES.labels("network").set(len(snapshot.networks))
+        metrics.DENY_LIST_ENTRIES.labels("credential").set(len(snapshot.revoked))
+
+    async def load(self) -> None:
+        """Reload both lists from Redis."""
+        networks, credentials = await self.redis_client.batch([
+            ("SMEMBERS", self.networks_key),
+            ("SMEMBERS", self.credentials_key),
+        ])
+        revoked = []
+        for digest in credentials:
+            try:
+                revoked.append(bytes.fromhex(digest))
+            except ValueError:
+                logger.warning(f"Ignoring invalid revoked credential digest '{digest}'.")
+        self.replace(networks, revoked)
+        logger.info(f"Deny list loaded: {len(networks)} networks, {len(revoked)} revoked credentials.")
+
+    async def deny(self, networks: List[str]) -> None:
+        """Add networks to the shared deny list and notify every gateway."""
+        await self._update(self.networks_key, [str(ip_network(network, strict=False)) for network in networks])
+
+    async def revoke(self, credentials: List[str]) -> None:
+        """Revoke tokens or API keys in the shared deny list and notify every gateway."""
+        await self._update(self.credentials_key, [credential_hash(credential).hex() for credential in credentials])
+
+    async def start(self) -> None:
+        """Load the lists and start following updates."""
+        if self._listener is None:
+            try:
+                await self.load()
+            except Exception as e:
+                logger.error(f"Failed to load the deny list, retrying in the background: {e}")
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop following updates; the last snapshot stays in use."""
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _update(self, key: str, members: List[str]) -> None:
+        if members:
+            await self.redis_client.batch([("SADD", key, *members), ("PUBLISH", self.channel, key)])
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.redis_client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # Updates published while disconnected are picked up here
+                await self.load()
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=self.resync_interval)
+                    # A burst of updates costs a single reload
+                    while message is not None and await pubsub.get_message(ignore_subscribe_messages=True, timeout=0):
+                        pass
+                    await self.load()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Deny list updates lost, keeping the last snapshot: {e}")
+            finally:
+                await pubsub.reset()
+            await asyncio.sleep(self.retry_interval)
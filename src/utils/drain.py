@@ -0,0 +1,73 @@
+import asyncio
+from time import monotonic
+from typing import Optional
+from src.infrastructure import metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DrainController:
+    """Tracks in-flight requests and coordinates a graceful shutdown.
+
+    Draining happens in two steps. Once ``begin`` is called, readiness fails and
+    responses ask clients to close their connection, but requests are still served
+    for ``grace_period`` seconds so load balancers can take the instance out of
+    rotation. Once ``close`` is called, new requests are refused and shutdown waits
+    up to ``timeout`` seconds for the requests in flight to finish.
+    """
+
+    def __init__(self, grace_period: float = 5.0, timeout: float = 30.0):
+        self.grace_period = grace_period
+        self.timeout = timeout
+        self._draining_since: Optional[float] = None
+        self._closed = False
+        self._inflight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def draining(self) -> bool:
+        return self._draining_since is not None
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def begin(self) -> None:
+        """Fail readiness and stop keeping client connections alive."""
+        if self._draining_since is None:
+            self._draining_since = monotonic()
+            metrics.DRAINING.set(1)
+            logger.info(f"Draining started with {self._inflight} requests in flight.")
+
+    def grace_elapsed(self) -> bool:
+        """Whether the grace period since ``begin`` is over."""
+        return self._draining_since is not None and monotonic() - self._draining_since >= self.grace_period
+
+    def close(self) -> None:
+        """Refuse new requests from now on."""
+        self.begin()
+        self._closed = True
+
+    def acquire(self) -> None:
+        self._inflight += 1
+        self._idle.clear()
+
+    def release(self) -> None:
+        self._inflight -= 1
+        if self._inflight == 0:
+            self._idle.set()
+
+    async def wait_idle(self, timeout: float) -> bool:
+        """Wait until no request is in flight; returns False if the timeout expired first."""
+        try:
+            await asyncio.wait_for(self._idle.wait(), max(timeout, 0))
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"Drain deadline reached with {self._inflight} requests still in flight.")
+            return False
@@ -1,40 +1,374 @@
-from fastapi import FastAPI, HTTPException, Request, Response
-from fastapi.routing import APIRoute
-from httpx import AsyncClient
-from typing import Callable, List
-from src.core.entities.microservice import Microservice
+import json
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket
+from fastapi.routing import APIRoute, APIWebSocketRoute
+import asyncio
+from httpx import RequestError, Timeout, TimeoutException
+from httpx import Response as UpstreamResponse
+from starlette.background import BackgroundTask
+from starlette.responses import StreamingResponse
+from starlette.routing import BaseRoute
+from random import random
+from time import time
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
+from src.core.entities.microservice import Microservice, MirrorConfig, PathDetails
+from src.infrastructure.http_client import UpstreamHttpClient
+from src.infrastructure.rabbitmq_rpc import RabbitMQRpcClient, RpcOverloaded
+from src.infrastructure.traffic_capture import TrafficCapture
+from src.infrastructure.traffic_mirror import TrafficMirror
+from src.infrastructure.usage_meter import UsageMeter
+from src.utils.bulkhead import UpstreamBulkhead
+from src.utils.compression import accepts_encoding, parse_accept_encoding
+from src.utils.deny_list import credential_hash
+from src.utils.event_broadcast import EventBroadcaster
+from src.utils.idempotency import IdempotencyStore
+from src.utils.request_context import current_request_id
+from src.utils.request_transform import HOP_BY_HOP_HEADERS, RequestTransform
+from src.utils.stream_proxy import ConnectionLimiter, proxy_websocket_handler, relay_event_stream
 
 import logging
 
 logger = logging.getLogger(__name__)
 
-async def proxy_request_handler(request: Request, service_name: str, base_url: str):
-    """Generic proxy request handler to forward requests to microservices."""
-    # Convert base_url to string before applying string methods
-    base_url_str = str(base_url)  # Convert Pydantic HttpUrl to string
-    target_url = f"{base_url_str.rstrip('/')}/{request.url.path.lstrip('/')}"
-
-    async with AsyncClient() as client:
-        response = await client.request(
-            method=request.method,
-            url=target_url,
-            headers=dict(request.headers),  # Forward headers
-            params=dict(request.query_params),  # Forward query parameters
-            content=await request.body(),  # Forward the request body
+# Timeout applied when neither the path nor the microservice configures one
+DEFAULT_UPSTREAM_TIMEOUT = 5.0
+
+# Dropped from relayed responses in addition to the hop-by-hop headers when the upstream body is decoded before relaying it
+DECODED_BODY_HEADERS = HOP_BY_HOP_HEADERS | {b"content-encoding", b"content-length"}
+# Reply headers not copied to the client; the body length is set by the gateway
+RPC_EXCLUDED_HEADERS = HOP_BY_HOP_HEADERS | {b"content-length", b"content-type"}
+# Methods for which Idempotency-Key handling can be enabled
+IDEMPOTENT_METHODS = frozenset({"POST", "PUT", "PATCH"})
+
+class ProxyRoute:
+    """Everything a dynamic route needs to forward a request, resolved once when the route is built."""
+
+    def __init__(
+        self,
+        service_name: str,
+        base_url: str,
+        http_client: UpstreamHttpClient,
+        path_details: Optional[PathDetails] = None,
+        bulkhead: Optional[UpstreamBulkhead] = None,
+        timeout: Optional[float] = None,
+        usage_meter: Optional[UsageMeter] = None,
+        traffic_mirror: Optional[TrafficMirror] = None,
+        mirror: Optional[MirrorConfig] = None,
+        traffic_capture: Optional[TrafficCapture] = None,
+        idempotency_store: Optional[IdempotencyStore] = None,
+        transform: Optional[RequestTransform] = None,
+        rpc_client: Optional[RabbitMQRpcClient] = None,
+        broadcast_buffer: int = 64
+    ):
+        self.service_name = service_name
+        # Convert base_url to string before applying string methods
+        self.base_url = str(base_url).rstrip('/')
+        self.http_client = http_client
+        self.path_details = path_details
+        self.bulkhead = bulkhead
+        self.timeout = timeout or DEFAULT_UPSTREAM_TIMEOUT
+        self.usage_meter = usage_meter
+        self.traffic_mirror = traffic_mirror if mirror and mirror.sample_rate > 0 else None
+        self.mirror_url = str(mirror.target).rstrip('/') + '/api/v1' if self.traffic_mirror else None
+        self.mirror_sample_rate = mirror.sample_rate if self.traffic_mirror else 0.0
+        self.traffic_capture = traffic_capture if traffic_capture and traffic_capture.enabled else None
+        self.idempotency = path_details.idempotency if path_details and path_details.method in IDEMPOTENT_METHODS else None
+        self.idempotency_store = idempotency_store if self.idempotency else None
+        self.transform = transform or RequestTransform()
+        self.rpc_client = rpc_client if path_details and path_details.queue else None
+        self.broadcaster = (
+            EventBroadcaster(service_name, http_client, broadcast_buffer)
+            if path_details and path_details.protocol == "sse" and path_details.broadcast else None
+        )
+        self.label = f"{path_details.method} {path_details.path}" if path_details else service_name
+
+async def proxy_request_handler(
+    request: Request,
+    route: ProxyRoute,
+    timeout: Optional[Union[float, Timeout]] = None,
+    hold_slot: bool = True
+):
+    """Generic proxy request handler to forward requests to microservices.
+
+    The upstream concurrency slot is held until the response body is closed, unless
+    ``hold_slot`` is off, for long-lived streams that would pin a slot indefinitely.
+    """
+    started = time()
+    target = route.transform.target(request.url.path, request.url.query, request.path_params)
+    target_url = route.base_url + target
+
+    # Read the body before taking a slot so slow clients do not hold upstream capacity
+    body = await request.body()
+    if route.traffic_capture and route.traffic_capture.sampled():
+        route.traffic_capture.record(
+            request.method, request.url.path, request.url.query, request.headers.items(), body
+        )
+    client = route.http_client.get_client()
+    # Propagate the request ID so the upstream can correlate its logs with ours
+    request_id = current_request_id() or request.state.request_id
+    headers = route.transform.headers(request.headers.raw, request_id)
+    if route.traffic_mirror and random() < route.mirror_sample_rate:
+        # The shadow target never gets the route's added headers or upstream credentials
+        mirror_headers = route.transform.headers(request.headers.raw, request_id, added=False)
+        route.traffic_mirror.submit(route.service_name, request.method, route.mirror_url + target, mirror_headers, body)
+    upstream_request = client.build_request(
+        method=request.method,
+        url=target_url,
+        headers=headers,
+        content=body,
+        timeout=timeout or route.timeout,
+    )
+    release_slot = None
+
+    try:
+        release_slot = await route.bulkhead.acquire() if route.bulkhead else None
+        try:
+            upstream_response = await client.send(upstream_request, stream=True)
+        except TimeoutException:
+            logger.error(f"Request to '{route.service_name}' timed out: {request.method} {target_url}")
+            raise HTTPException(status_code=504, detail=f"Microservice {route.service_name} timed out.")
+        except RequestError as e:
+            logger.error(f"Request to '{route.service_name}' failed: {request.method} {target_url}: {e}")
+            raise HTTPException(status_code=502, detail=f"Microservice {route.service_name} is unavailable.")
+    except BaseException as e:
+        if release_slot:
+            release_slot(True)
+        if isinstance(e, HTTPException) and route.usage_meter:
+            route.usage_meter.record(request.headers.get("x-api-key"), route.label, e.status_code, len(body), 0, time() - started)
+        raise
+
+    # Return the forwarded response as-is, without the standard response envelope
+    request.state.passthrough = True
+    response = stream_upstream_response(request, upstream_response)
+    if release_slot:
+        if hold_slot:
+            # The body is part of the upstream call: the slot is held, and latency measured, until it is closed
+            response.body_iterator = _release_after(response.body_iterator, release_slot)
+            response.on_close.append(release_slot)
+        else:
+            release_slot(False)
+    if route.usage_meter:
+        response.body_iterator = route.usage_meter.metered(
+            response.body_iterator, request.headers.get("x-api-key"), route.label,
+            upstream_response.status_code, len(body), started
+        )
+    return response
+
+async def _release_after(chunks: AsyncIterator[bytes], release: Callable[[bool], None]) -> AsyncIterator[bytes]:
+    dropped = False
+    try:
+        async for chunk in chunks:
+            yield chunk
+    except Exception:
+        dropped = True
+        raise
+    finally:
+        release(dropped)
+
+async def proxy_rabbitmq_handler(request: Request, route: ProxyRoute) -> Response:
+    """Serve a request over RabbitMQ request/reply instead of forwarding it over HTTP.
+
+    The request body is published to the path's queue with the HTTP method, target path
+    and forwarded headers as message headers. Workers reply to the message's reply_to
+    queue with the same correlation ID; an ``x-http-status`` reply header sets the status.
+    """
+    started = time()
+    queue_name = route.path_details.queue
+    target = route.transform.target(request.url.path, request.url.query, request.path_params)
+    body = await request.body()
+    headers = {
+        name.decode("latin-1"): value.decode("latin-1")
+        for name, value in route.transform.headers(request.headers.raw, current_request_id() or request.state.request_id)
+    }
+    headers["x-http-method"] = request.method
+    headers["x-http-path"] = target
+
+    try:
+        try:
+            reply = await route.rpc_client.call(
+                queue_name, body, headers, request.headers.get("content-type"), route.timeout
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"No reply from queue '{queue_name}' of '{route.service_name}': {request.method} {target}")
+            raise HTTPException(status_code=504, detail=f"Microservice {route.service_name} timed out.")
+        except RpcOverloaded:
+            raise HTTPException(status_code=503, detail=f"Microservice {route.service_name} is overloaded.", headers={"Retry-After": "1"})
+        except ConnectionError as e:
+            logger.error(f"Request to queue '{queue_name}' of '{route.service_name}' failed: {e}")
+            raise HTTPException(status_code=502, detail=f"Microservice {route.service_name} is unavailable.")
+    except HTTPException as e:
+        if route.usage_meter:
+            route.usage_meter.record(request.headers.get("x-api-key"), route.label, e.status_code, len(body), 0, time() - started)
+        raise
+
+    if route.usage_meter:
+        route.usage_meter.record(
+            request.headers.get("x-api-key"), route.label, reply.status_code, len(body), len(reply.body), time() - started
         )
+    # Return the reply as-is, without the standard response envelope
+    request.state.passthrough = True
+    response_headers = {
+        name: value for name, value in reply.headers.items()
+        if name.encode("latin-1").lower() not in RPC_EXCLUDED_HEADERS and not name.lower().startswith("x-http-")
+    }
+    return Response(reply.body, status_code=reply.status_code, headers=response_headers, media_type=reply.content_type)
+
+class ProxiedStreamingResponse(StreamingResponse):
+    """Streaming response that runs its ``on_close`` callbacks once sent, even if the client went away first.
+
+    Upstream read errors are reported by the body iterator, which sees them first.
+    """
 
-    # Return the forwarded response as a FastAPI response
-    return Response(content=response.content, status_code=response.status_code)
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_close: List[Callable[[], None]] = []
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            for callback in self.on_close:
+                callback()
+
+def stream_upstream_response(request: Request, upstream_response: UpstreamResponse) -> ProxiedStreamingResponse:
+    """Relay an upstream response to the client without buffering its body.
+
+    Compressed upstream bodies are passed through unchanged when the client accepts
+    their encoding; otherwise they are decoded and left to the compression middleware.
+    """
+    content_encoding = upstream_response.headers.get("content-encoding")
+    passthrough = content_encoding is None or accepts_encoding(
+        parse_accept_encoding(request.headers.get("accept-encoding")), content_encoding
+    )
+    excluded_headers = HOP_BY_HOP_HEADERS if passthrough else DECODED_BODY_HEADERS
 
-def create_dynamic_route(service_name: str, path: str, method: str, base_url: str) -> APIRoute:
-    """Create a dynamic APIRoute object for the specified path and method."""
-    # Convert base_url to string before using it
-    base_url_str = str(base_url)
+    response = ProxiedStreamingResponse(
+        upstream_response.aiter_raw() if passthrough else upstream_response.aiter_bytes(),
+        status_code=upstream_response.status_code,
+        background=BackgroundTask(upstream_response.aclose),
+    )
+    response.raw_headers = [
+        (name, value) for name, value in upstream_response.headers.raw if name.lower() not in excluded_headers
+    ]
+    return response
+
+async def proxy_sse_handler(request: Request, route: ProxyRoute, limiter: ConnectionLimiter) -> StreamingResponse:
+    """Relay a Server-Sent Events stream from a microservice without buffering it."""
+    lease = limiter.try_acquire()
+    if lease is None:
+        raise HTTPException(status_code=503, detail=f"Too many open streams for microservice {route.service_name}.")
+
+    # httpx applies the read timeout to every read, which makes it the idle timeout of the stream
+    stream_timeout = Timeout(route.timeout, read=route.path_details.idle_timeout)
+    try:
+        response = await proxy_request_handler(request, route, stream_timeout, hold_slot=False)
+    except BaseException:
+        lease.release()
+        raise
+
+    response.body_iterator = relay_event_stream(response.body_iterator, route.service_name, lease.release)
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+async def proxy_broadcast_handler(request: Request, route: ProxyRoute, limiter: ConnectionLimiter) -> StreamingResponse:
+    """Subscribe a client to the upstream event stream shared by every client of the same path and query."""
+    lease = limiter.try_acquire()
+    if lease is None:
+        raise HTTPException(status_code=503, detail=f"Too many open streams for microservice {route.service_name}.")
+
+    started = time()
+    target = route.transform.target(request.url.path, request.url.query, request.path_params)
+    try:
+        # The shared stream is opened without client headers, since it is not specific to one client
+        channel, queue, content_type = await route.broadcaster.subscribe(
+            target,
+            route.base_url + target,
+            route.transform.headers([], current_request_id() or request.state.request_id),
+            Timeout(route.timeout, read=route.path_details.idle_timeout),
+        )
+    except BaseException:
+        lease.release()
+        raise
+
+    request.state.passthrough = True
+    response = StreamingResponse(route.broadcaster.events(channel, queue, lease.release), media_type=content_type)
+    if route.usage_meter:
+        response.body_iterator = route.usage_meter.metered(
+            response.body_iterator, request.headers.get("x-api-key"), route.label, 200, 0, started
+        )
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+async def proxy_idempotent_handler(request: Request, route: ProxyRoute):
+    """Forward a write once per Idempotency-Key and replay its stored response to retries."""
+    idempotency_key = request.headers.get("idempotency-key")
+    if not idempotency_key:
+        return await proxy_request_handler(request, route)
+
+    started = time()
+    body = await request.body()
+    store = route.idempotency_store
+    # Keys are scoped per route and consumer (API key and Authorization credential), so clients cannot see each other's responses
+    authorization = request.headers.get("authorization")
+    consumer = request.headers.get("x-api-key", "") + "\n" + (credential_hash(authorization).hex() if authorization else "")
+    key = store.make_key(f"{route.label}\n{consumer}", idempotency_key)
+    target = f"{request.url.path}?{request.url.query}" if request.url.query else request.url.path
+    reservation, stored_response = await store.reserve(route.service_name, key, target, body, route.idempotency.wait_timeout)
+    if stored_response is not None:
+        request.state.passthrough = True
+        if route.usage_meter:
+            route.usage_meter.record(
+                request.headers.get("x-api-key"), route.label, stored_response.status_code,
+                len(body), len(stored_response.body), time() - started
+            )
+        return stored_response
+
+    try:
+        response = await proxy_request_handler(request, route)
+    except BaseException:
+        await store.release(reservation)
+        raise
+    return await store.record(reservation, response, route.idempotency.ttl)
+
+def create_dynamic_route(route: ProxyRoute) -> Union[APIRoute, APIWebSocketRoute]:
+    """Create a dynamic APIRoute (or APIWebSocketRoute) object for the specified path and method."""
+    service_name = route.service_name
+    path_details = route.path_details
+    path = path_details.path
+    method = path_details.method
     if not path.endswith("/"):
         path += "/"
-    async def dynamic_endpoint(request: Request):
-        return await proxy_request_handler(request, service_name, base_url_str)
-    print(method)
+
+    if path_details.protocol == "websocket":
+        limiter = ConnectionLimiter(service_name, path_details.protocol, path_details.max_connections)
+
+        async def websocket_endpoint(websocket: WebSocket):
+            await proxy_websocket_handler(
+                websocket, service_name, route.base_url, limiter, route.timeout, path_details.idle_timeout, route.transform
+            )
+
+        return APIWebSocketRoute(path=path, endpoint=websocket_endpoint, name=f"{service_name}-WS-{path}")
+
+    if route.broadcaster:
+        limiter = ConnectionLimiter(service_name, path_details.protocol, path_details.max_connections)
+
+        async def dynamic_endpoint(request: Request):
+            return await proxy_broadcast_handler(request, route, limiter)
+    elif path_details.protocol == "sse":
+        limiter = ConnectionLimiter(service_name, path_details.protocol, path_details.max_connections)
+
+        async def dynamic_endpoint(request: Request):
+            return await proxy_sse_handler(request, route, limiter)
+    elif route.rpc_client:
+        async def dynamic_endpoint(request: Request):
+            return await proxy_rabbitmq_handler(request, route)
+    elif route.idempotency_store:
+        async def dynamic_endpoint(request: Request):
+            return await proxy_idempotent_handler(request, route)
+    else:
+        async def dynamic_endpoint(request: Request):
+            return await proxy_request_handler(request, route)
 
     return APIRoute(
         path=path,
@@ -43,20 +377,115 @@ def create_dynamic_route(service_name: str, path: str, method: str, base_url: st
         name=f"{service_name}-{method}-{path}",
     )
 
+def build_microservice_routes(app: FastAPI, microservice: Microservice) -> List[BaseRoute]:
+    """Create the dynamic routes of one microservice and record their admission priority."""
+    admission_controller = app.container.admission_controller()
+    batch_service = app.container.batch_service()
+    http_client = app.container.http_client()
+    usage_meter = app.container.usage_meter() if app.container.config.usage_enabled() else None
+    traffic_mirror = app.container.traffic_mirror()
+    traffic_capture = app.container.traffic_capture()
+    idempotency_store = app.container.idempotency_store()
+    rabbitmq_rpc = app.container.rabbitmq_rpc()
+    broadcast_buffer = app.container.config.broadcast_client_buffer()
+
+    # Use dot notation to access the attributes of the Microservice object
+    service_name = microservice.service_name
+    base_url = str(microservice.base_url)  # Convert to string
+    base_url += 'api/v1'
+    logger.info(f"Registering service '{service_name}' with base URL: {base_url}")
+
+    # One bulkhead per microservice, shared by all of its paths
+    bulkhead = UpstreamBulkhead(service_name, microservice.concurrency)
+
+    routes = []
+    priorities = []
+    streams = []
+    for path_details in microservice.paths:
+        path = path_details.path
+        method = path_details.method
+        proxy_route = ProxyRoute(
+            service_name, base_url, http_client, path_details, bulkhead,
+            timeout=path_details.timeout or microservice.timeout,
+            usage_meter=usage_meter,
+            traffic_mirror=traffic_mirror,
+            # Only plain request/response paths are mirrored, never streams
+            mirror=(path_details.mirror or microservice.mirror) if path_details.protocol == "http" else None,
+            traffic_capture=traffic_capture if path_details.protocol == "http" else None,
+            idempotency_store=idempotency_store if path_details.protocol == "http" and not path_details.queue else None,
+            transform=RequestTransform(path_details.transform or microservice.transform, microservice.api_key),
+            rpc_client=rabbitmq_rpc,
+            broadcast_buffer=broadcast_buffer
+        )
+
+        # Create a new APIRoute dynamically
+        route = create_dynamic_route(proxy_route)
+        routes.append(route)
+        if isinstance(route, APIWebSocketRoute):
+            streams.append((None, route.path, "websocket"))
+            logger.info(f"Registered WebSocket route: {path} -> {base_url}")
+            continue
+        if path_details.protocol == "sse":
+            streams.append((method, route.path, "broadcast" if path_details.broadcast else "sse"))
+        priority = path_details.priority or ("high" if path_details.protected else "low")
+        priorities.append((method, route.path, priority))
+        logger.info(f"Registered route: {method} {path} -> {base_url}")
+    admission_controller.set_service_routes(service_name, priorities)
+    batch_service.set_streaming_routes(service_name, streams)
+    return routes
+
+def _fingerprint(microservice: Microservice) -> str:
+    return json.dumps(microservice.model_dump(mode="json", exclude={"id"}), sort_keys=True)
+
+async def sync_microservice_routes(app: FastAPI, microservices: List[Microservice], remove_missing: bool = True):
+    """Bring the dynamic routes in line with the given microservices.
+
+    Routes are only rebuilt for microservices whose configuration changed, and the
+    route table is swapped in one assignment so in-flight routing never sees a
+    half-updated list.
+
+    Args:
+        app (FastAPI): The FastAPI application instance.
+        microservices (List[Microservice]): The desired microservice configurations.
+        remove_missing (bool): Drop the routes of microservices that are not in the list.
+    """
+    # service_name -> (fingerprint, routes)
+    registered: Dict[str, Tuple[str, List[BaseRoute]]] = getattr(app.state, "microservice_routes", {})
+    updated = {} if remove_missing else dict(registered)
+
+    for microservice in microservices:
+        fingerprint = _fingerprint(microservice)
+        current = registered.get(microservice.service_name)
+        if current and current[0] == fingerprint:
+            updated[microservice.service_name] = current
+        else:
+            updated[microservice.service_name] = (fingerprint, build_microservice_routes(app, microservice))
+
+    admission_controller = app.container.admission_controller()
+    batch_service = app.container.batch_service()
+    for service_name in registered.keys() - updated.keys():
+        logger.info(f"Unregistering service '{service_name}'")
+        admission_controller.remove_service(service_name)
+        batch_service.remove_service(service_name)
+
+    previous_routes = {id(route) for _, routes in registered.values() for route in routes}
+    static_routes = [route for route in app.router.routes if id(route) not in previous_routes]
+    app.router.routes = static_routes + [route for _, routes in updated.values() for route in routes]
+    app.state.microservice_routes = updated
+
+    # Keep the background health monitor probing, and the aggregated OpenAPI document describing, exactly the registered upstreams
+    health_monitor = app.container.health_monitor()
+    openapi_aggregator = app.container.openapi_aggregator()
+    dns_cache = app.container.dns_cache()
+    for service_name in registered.keys() - updated.keys():
+        health_monitor.remove_upstream(service_name)
+        openapi_aggregator.remove_service(service_name)
+    for microservice in microservices:
+        health_monitor.add_upstream(microservice.service_name, str(microservice.base_url))
+        openapi_aggregator.add_service(microservice)
+        # Resolve the upstream host ahead of the first connection
+        dns_cache.add_host(microservice.base_url.host)
+
 async def register_microservice_routes(app: FastAPI, microservices: List[Microservice]):
     """Dynamically register routes for each microservice based on configuration."""
-    for microservice in microservices:
-        # Use dot notation to access the attributes of the Microservice object
-        service_name = microservice.service_name
-        base_url = str(microservice.base_url)  # Convert to string
-        base_url += 'api/v1'
-        logger.info(f"Registering service '{service_name}' with base URL: {base_url}")
-
-        for path_details in microservice.paths:
-            path = path_details.path
-            method = path_details.method
-
-            # Create and register a new APIRoute dynamically
-            route = create_dynamic_route(service_name, path, method, base_url)
-            app.router.routes.append(route)
-            logger.info(f"Registered route: {method} {path} -> {base_url}")
+    await sync_microservice_routes(app, microservices, remove_missing=False)
@@ -0,0 +1,178 @@
+import asyncio
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+from fastapi import HTTPException
+from httpx import ReadTimeout, RequestError, Timeout, TimeoutException
+from src.infrastructure import metrics
+from src.infrastructure.http_client import UpstreamHttpClient
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bytes kept while waiting for the end of an event before relaying them anyway
+MAX_PENDING_EVENT_SIZE = 65536
+
+
+def _event_boundary(data: bytes) -> int:
+    """Return the length of the complete events at the start of data, or 0."""
+    lf = data.rfind(b"\n\n")
+    crlf = data.rfind(b"\r\n\r\n")
+    return max(lf + 2 if lf >= 0 else 0, crlf + 4 if crlf >= 0 else 0)
+
+
+class BroadcastChannel:
+    """One upstream event stream shared by every client subscribed to the same route and query."""
+
+    def __init__(self, broadcaster: "EventBroadcaster", key: str, url: str, headers: List[Tuple[bytes, bytes]], timeout: Timeout):
+        self.broadcaster = broadcaster
+        self.key = key
+        self.subscribers: Set[asyncio.Queue] = set()
+        # Resolves to the upstream content type once the stream is open
+        self.ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.task = asyncio.create_task(self._run(url, headers, timeout))
+
+    def subscribe(self) -> asyncio.Queue:
+        """Add a subscriber and return the bounded queue its events are delivered to."""
+        queue = asyncio.Queue(self.broadcaster.buffer_size)
+        self.subscribers.add(queue)
+        self.broadcaster._subscribers_gauge.inc()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Remove a subscriber; the upstream stream is closed when the last one leaves."""
+        if queue in self.subscribers:
+            self.subscribers.discard(queue)
+            self.broadcaster._subscribers_gauge.dec()
+            if not self.subscribers:
+                self.broadcaster._close(self)
+                self.task.cancel()
+
+    def _publish(self, event: bytes) -> None:
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A slow client never holds back the others: it is disconnected
+                self.broadcaster._dropped.inc()
+                self._end(queue)
+                self.unsubscribe(queue)
+
+    def _end(self, queue: asyncio.Queue) -> None:
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    async def _run(self, url: str, headers: List[Tuple[bytes, bytes]], timeout: Timeout) -> None:
+        service_name = self.broadcaster.service_name
+        client = self.broadcaster.http_client.get_client()
+        self.broadcaster._upstreams_gauge.inc()
+        try:
+            try:
+                response = await client.send(client.build_request("GET", url, headers=headers, timeout=timeout), stream=True)
+            except TimeoutException:
+                raise HTTPException(status_code=504, detail=f"Microservice {service_name} timed out.")
+            except RequestError as e:
+                logger.error(f"Event stream from '{service_name}' failed: {url}: {e}")
+                raise HTTPException(status_code=502, detail=f"Microservice {service_name} is unavailable.")
+
+            try:
+                if response.status_code != 200:
+                    logger.error(f"Event stream from '{service_name}' answered {response.status_code}: {url}")
+                    raise HTTPException(status_code=502, detail=f"Microservice {service_name} refused the event stream.")
+                self.ready.set_result(response.headers.get("content-type", "text/event-stream"))
+                logger.info(f"Opened shared event stream from '{service_name}': {url}")
+
+                pending = b""
+                async for chunk in response.aiter_bytes():
+                    pending += chunk
+                    # Relay whole events only, so clients joining mid-stream never see a partial one
+                    end = _event_boundary(pending)
+                    if end == 0 and len(pending) > MAX_PENDING_EVENT_SIZE:
+                        end = len(pending)
+                    if end:
+                        self._publish(pending[:end])
+                        pending = pending[end:]
+            except ReadTimeout:
+                logger.info(f"Closing idle shared event stream from '{service_name}'.")
+            finally:
+                await response.aclose()
+        except HTTPException as e:
+            if not self.ready.done():
+                self.ready.set_exception(e)
+        except Exception as e:
+            logger.error(f"Shared event stream from '{service_name}' failed: {e}")
+            if not self.ready.done():
+                self.ready.set_exception(HTTPException(status_code=502, detail=f"Microservice {service_name} is unavailable."))
+        finally:
+            self.broadcaster._upstreams_gauge.dec()
+            if not self.ready.done():
+                self.ready.cancel()
+            # Subscribers end their responses; SSE clients reconnect on their own
+            self.broadcaster._close(self)
+            for queue in self.subscribers:
+                self._end(queue)
+            self.broadcaster._subscribers_gauge.dec(len(self.subscribers))
+            self.subscribers.clear()
+
+
+class EventBroadcaster:
+    """Fans out upstream Server-Sent Events to many clients of a broadcast route.
+
+    Keeps one upstream subscription per distinct target path and query string.
+    Each client gets a queue of at most ``buffer_size`` pending chunks and is
+    disconnected when it falls that far behind.
+    """
+
+    def __init__(self, service_name: str, http_client: UpstreamHttpClient, buffer_size: int = 64):
+        self.service_name = service_name
+        self.http_client = http_client
+        self.buffer_size = buffer_size
+        self.channels: Dict[str, BroadcastChannel] = {}
+        self._upstreams_gauge = metrics.BROADCAST_UPSTREAMS.labels(service=service_name)
+        self._subscribers_gauge = metrics.BROADCAST_SUBSCRIBERS.labels(service=service_name)
+        self._dropped = metrics.BROADCAST_DROPPED.labels(service=service_name)
+
+    async def subscribe(
+        self, key: str, url: str, headers: List[Tuple[bytes, bytes]], timeout: Timeout
+    ) -> Tuple[BroadcastChannel, asyncio.Queue, str]:
+        """
+        Join the shared stream for a key, opening it if needed.
+
+        Args:
+            key (str): Target path and query string identifying the stream.
+            url (str): Upstream URL, used when the stream has to be opened.
+            headers (List[Tuple[bytes, bytes]]): Upstream request headers, used when the stream has to be opened.
+            timeout (Timeout): Upstream timeout; its read timeout closes an idle stream.
+
+        Returns:
+            Tuple[BroadcastChannel, asyncio.Queue, str]: The channel, the subscriber queue and the content type.
+
+        Raises:
+            HTTPException: If the upstream stream could not be opened.
+        """
+        channel = self.channels.get(key)
+        if channel is None:
+            channel = self.channels[key] = BroadcastChannel(self, key, url, headers, timeout)
+        queue = channel.subscribe()
+        try:
+            content_type = await asyncio.shield(channel.ready)
+        except BaseException:
+            channel.unsubscribe(queue)
+            raise
+        return channel, queue, content_type
+
+    async def events(self, channel: BroadcastChannel, queue: asyncio.Queue, on_close: Callable[[], None]) -> AsyncIterator[bytes]:
+        """Yield the events delivered to one subscriber until it is dropped or the stream ends."""
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    return
+                yield event
+        finally:
+            channel.unsubscribe(queue)
+            on_close()
+
+    def _close(self, channel: BroadcastChannel) -> None:
+        # New subscribers open a fresh stream instead of joining one that is going away
+        if self.channels.get(channel.key) is channel:
+            del self.channels[channel.key]
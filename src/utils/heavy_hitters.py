@@ -0,0 +1,154 @@
+from time import monotonic
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Tracked dimensions; upstream errors are keyed by route
+DIMENSIONS = ("client_ip", "api_key", "route", "upstream_error")
+
+
+class CountMinSketch:
+    """Approximate counts in fixed memory; estimates never undercount."""
+
+    __slots__ = ("width", "depth", "rows")
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.rows = [[0] * width for _ in range(depth)]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Add to a key's count and return its new estimate."""
+        estimate = None
+        width = self.width
+        for seed, row in enumerate(self.rows):
+            index = hash((seed, key)) % width
+            row[index] += count
+            if estimate is None or row[index] < estimate:
+                estimate = row[index]
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        """Return the estimated count of a key."""
+        width = self.width
+        return min(row[hash((seed, key)) % width] for seed, row in enumerate(self.rows))
+
+
+class TopK:
+    """Space-Saving style candidate set of the keys with the largest counts.
+
+    Holds at most ``capacity`` keys with the sketch estimate of their count. A key
+    outside the set replaces the smallest candidate once its estimate exceeds it.
+    """
+
+    __slots__ = ("capacity", "counts", "_floor")
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        # Lower bound of the smallest candidate count, refreshed when a key is evicted
+        self._floor = 0
+
+    def offer(self, key: str, estimate: int) -> None:
+        counts = self.counts
+        if key in counts or len(counts) < self.capacity:
+            counts[key] = estimate
+        elif estimate > self._floor:
+            smallest = min(counts, key=counts.get)
+            if estimate > counts[smallest]:
+                del counts[smallest]
+                counts[key] = estimate
+            self._floor = min(counts.values())
+
+    def top(self, limit: int) -> List[Tuple[str, int]]:
+        return sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+class _Window:
+    __slots__ = ("started", "sketches", "top")
+
+    def __init__(self, started: float, width: int, depth: int, capacity: int):
+        self.started = started
+        self.sketches = {dimension: CountMinSketch(width, depth) for dimension in DIMENSIONS}
+        self.top = {dimension: TopK(capacity) for dimension in DIMENSIONS}
+
+
+class HeavyHitterTracker:
+    """Tracks the heaviest client IPs, API keys, routes and upstream error sources.
+
+    Counts go into a Count-Min sketch per dimension over a tumbling window of
+    ``window_seconds``, with a bounded top-K of candidates, so memory stays constant
+    whatever the number of distinct keys. Rates blend the current window with the
+    previous one, as a sliding window. When ``throttle_rate`` is set, client IPs and
+    API keys above that many requests per second are throttled.
+    """
+
+    def __init__(
+        self,
+        width: int = 2048,
+        depth: int = 4,
+        capacity: int = 100,
+        window_seconds: float = 60.0,
+        throttle_rate: float = 0.0
+    ):
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity
+        self.window_seconds = window_seconds
+        self.throttle_rate = throttle_rate
+        self._current = _Window(monotonic(), width, depth, capacity)
+        self._previous: Optional[_Window] = None
+
+    def record(self, dimension: str, key: str) -> int:
+        """
+        Count one event for a key and return its estimated count in the current window.
+
+        Args:
+            dimension (str): One of DIMENSIONS.
+            key (str): The client IP, hashed API key or route label.
+
+        Returns:
+            int: The estimated count of the key in the current window.
+        """
+        window = self._window()
+        estimate = window.sketches[dimension].add(key)
+        window.top[dimension].offer(key, estimate)
+        return estimate
+
+    def rate(self, dimension: str, key: str, current: Optional[int] = None) -> float:
+        """Estimated requests per second of a key over the last window_seconds."""
+        window = self._window()
+        if current is None:
+            current = window.sketches[dimension].estimate(key)
+        elapsed = monotonic() - window.started
+        previous = self._previous.sketches[dimension].estimate(key) if self._previous else 0
+        # Weight the previous window by the part of it still inside the sliding window
+        weight = max(0.0, 1.0 - elapsed / self.window_seconds)
+        return (current + previous * weight) / self.window_seconds
+
+    def should_throttle(self, dimension: str, key: str, current: int) -> bool:
+        """Whether a client whose current-window count is current exceeds the throttle rate."""
+        return bool(self.throttle_rate) and self.rate(dimension, key, current) > self.throttle_rate
+
+    def top(self, dimensions: Iterable[str] = DIMENSIONS, limit: int = 10) -> Dict[str, object]:
+        """Return the top keys of each dimension in the current and previous windows."""
+        window = self._window()
+        result = {
+            "window_seconds": self.window_seconds,
+            "elapsed_seconds": round(monotonic() - window.started, 3),
+            "throttle_rate": self.throttle_rate,
+        }
+        for dimension in dimensions:
+            result[dimension] = {
+                "current": [{"key": key, "count": count} for key, count in window.top[dimension].top(limit)],
+                "previous": [
+                    {"key": key, "count": count} for key, count in self._previous.top[dimension].top(limit)
+                ] if self._previous else [],
+            }
+        return result
+
+    def _window(self) -> _Window:
+        now = monotonic()
+        if now - self._current.started >= self.window_seconds:
+            # A gap longer than a window leaves nothing worth keeping
+            self._previous = self._current if now - self._current.started < 2 * self.window_seconds else None
+            self._current = _Window(now, self.width, self.depth, self.capacity)
+        return self._current
@@ -0,0 +1,234 @@
+import asyncio
+import base64
+import hashlib
+import json
+import secrets
+from time import monotonic
+from typing import AsyncIterator, List, Optional, Tuple
+from fastapi import HTTPException
+from starlette.responses import Response
+from src.infrastructure.db.redis_client import RedisClient
+from src.infrastructure import metrics
+from src.utils.memory_budget import MemoryBudget
+import logging
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "idempotency:"
+PENDING_PREFIX = "pending:"
+
+# Replace the reservation only if we still hold it, so a late request cannot overwrite a newer one
+COMPLETE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+end
+return nil
+"""
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Outcomes that a retry should be allowed to change, so they are never stored
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429})
+
+
+class IdempotencyReservation:
+    """Ownership of an idempotency key while the first request is in flight."""
+
+    def __init__(self, key: str, token: str):
+        self.key = key
+        self.token = token
+
+
+class IdempotencyStore:
+    """Redis-backed Idempotency-Key handling for proxied writes.
+
+    The first request with a key reserves it with ``SET NX`` and a lock TTL; its
+    response is then stored for ``ttl`` seconds and replayed to later requests with
+    the same key, without calling the upstream. Duplicates arriving while the first
+    request is in flight wait up to ``wait_timeout`` seconds for its response, then
+    get 409. Reusing a key for a different target (path and query) or request body
+    is rejected with 422.
+    """
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        lock_ttl: int = 60,
+        poll_interval: float = 0.05,
+        max_body_size: int = 1048576,
+        memory_budget: Optional[MemoryBudget] = None
+    ):
+        self.redis_client = redis_client
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self.max_body_size = max_body_size
+        # Bounds the response bodies buffered here for storage
+        self.memory_budget = memory_budget
+
+    @staticmethod
+    def make_key(scope: str, idempotency_key: str) -> str:
+        """Build the Redis key of an Idempotency-Key within a scope (route and consumer)."""
+        return KEY_PREFIX + hashlib.sha256(f"{scope}\n{idempotency_key}".encode()).hexdigest()
+
+    async def reserve(
+        self,
+        service_name: str,
+        key: str,
+        target: str,
+        body: bytes,
+        wait_timeout: float = 0.0
+    ) -> Tuple[Optional[IdempotencyReservation], Optional[Response]]:
+        """
+        Reserve the key, or get the stored response of the request that used it first.
+
+        Args:
+            service_name (str): Upstream microservice, for metrics.
+            key (str): Redis key from make_key.
+            target (str): Concrete request path and query string, compared with those of the first request.
+            body (bytes): Request body, compared with the body of the first request.
+            wait_timeout (float): Seconds to wait for a concurrent request holding the key.
+
+        Returns:
+            Tuple: The reservation when the request should be forwarded, or the response to replay.
+        """
+        # The route label only has the path template, so the concrete target is part of the request identity
+        fingerprint = hashlib.sha256(target.encode() + b"\n" + body).hexdigest()
+        token = f"{PENDING_PREFIX}{secrets.token_hex(8)}:{fingerprint}"
+        deadline = monotonic() + wait_timeout
+        while True:
+            if await self.redis_client.set(key, token, expire=self.lock_ttl, nx=True):
+                metrics.IDEMPOTENCY_OUTCOMES.labels(service_name, "reserved").inc()
+                return IdempotencyReservation(key, token), None
+
+            stored = await self.redis_client.get(key)
+            if stored is None:
+                # The holder released the key in between, try again
+                continue
+            if stored.startswith(PENDING_PREFIX):
+                if stored.rsplit(":", 1)[1] != fingerprint:
+                    raise self._mismatch(service_name)
+                if monotonic() >= deadline:
+                    metrics.IDEMPOTENCY_OUTCOMES.labels(service_name, "conflict").inc()
+                    raise HTTPException(
+                        status_code=409,
+                        detail="A request with this Idempotency-Key is already in progress.",
+                        headers={"Retry-After": "1"}
+                    )
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            record = json.loads(stored)
+            if record["fingerprint"] != fingerprint:
+                raise self._mismatch(service_name)
+            metrics.IDEMPOTENCY_OUTCOMES.labels(service_name, "replayed").inc()
+            body = base64.b64decode(record["body"])
+            response = Response(content=body, status_code=record["status_code"])
+            response.raw_headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in record["headers"]]
+            response.raw_headers.append((b"content-length", str(len(body)).encode("latin-1")))
+            response.headers["Idempotent-Replayed"] = "true"
+            return None, response
+
+    async def complete(
+        self,
+        reservation: IdempotencyReservation,
+        status_code: int,
+        headers: List[Tuple[bytes, bytes]],
+        body: bytes,
+        ttl: int
+    ) -> None:
+        """Store the response of the reserved request, or release the key if it should not be replayed."""
+        if status_code >= 500 or status_code in RETRYABLE_STATUS_CODES:
+            await self.release(reservation)
+            return
+        record = json.dumps({
+            "fingerprint": reservation.token.rsplit(":", 1)[1],
+            "status_code": status_code,
+            "headers": [(name.decode("latin-1"), value.decode("latin-1")) for name, value in headers],
+            "body": base64.b64encode(body).decode("ascii"),
+        }, separators=(",", ":"))
+        try:
+            await self.redis_client.eval(COMPLETE_SCRIPT, 1, reservation.key, reservation.token, record, ttl)
+        except Exception as e:
+            logger.error(f"Failed to store idempotent response: {e}")
+
+    async def release(self, reservation: IdempotencyReservation) -> None:
+        """Drop the reservation so that a retry is forwarded again."""
+        try:
+            await self.redis_client.eval(RELEASE_SCRIPT, 1, reservation.key, reservation.token)
+        except Exception as e:
+            logger.error(f"Failed to release idempotency key: {e}")
+
+    async def record(
+        self,
+        reservation: IdempotencyReservation,
+        response: Response,
+        ttl: int
+    ) -> Response:
+        """
+        Buffer the upstream response to store it, and return a response that relays it to the client.
+
+        Bodies larger than max_body_size, or that the memory budget cannot cover, are streamed
+        without being stored, and the key is released.
+        """
+        budget = self.memory_budget
+        chunks: List[bytes] = []
+        size = 0
+        reserved = 0
+        body_iterator = response.body_iterator.__aiter__()
+        try:
+            async for chunk in body_iterator:
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > self.max_body_size:
+                    return await self._stream_through(reservation, response, chunks, body_iterator)
+                if budget:
+                    try:
+                        await budget.reserve(len(chunk))
+                    except HTTPException:
+                        # The write already happened upstream, so its response is relayed rather than rejected
+                        return await self._stream_through(reservation, response, chunks, body_iterator)
+                    reserved += len(chunk)
+
+            body = b"".join(chunks)
+            # Content-Length is recomputed for the buffered body
+            headers = [(name, value) for name, value in response.raw_headers if name.lower() != b"content-length"]
+            await self.complete(reservation, response.status_code, headers, body, ttl)
+        except BaseException:
+            await self.release(reservation)
+            if response.background:
+                await response.background()
+            raise
+        finally:
+            if budget:
+                budget.release(reserved)
+
+        buffered = Response(content=body, status_code=response.status_code, background=response.background)
+        buffered.raw_headers = headers + [(b"content-length", str(len(body)).encode("latin-1"))]
+        return buffered
+
+    async def _stream_through(
+        self,
+        reservation: IdempotencyReservation,
+        response: Response,
+        chunks: List[bytes],
+        body_iterator: AsyncIterator[bytes]
+    ) -> Response:
+        await self.release(reservation)
+        response.body_iterator = _chain(chunks, body_iterator)
+        return response
+
+    @staticmethod
+    def _mismatch(service_name: str) -> HTTPException:
+        metrics.IDEMPOTENCY_OUTCOMES.labels(service_name, "mismatch").inc()
+        return HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request.")
+
+
+async def _chain(buffered: List[bytes], rest: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    for chunk in buffered:
+        yield chunk
+    async for chunk in rest:
+        yield chunk
@@ -0,0 +1,104 @@
+import asyncio
+from collections import deque
+from typing import Deque, Tuple
+from src.infrastructure import metrics
+from src.infrastructure.exception_handlers import MemoryBudgetExhaustedException, PayloadTooLargeException
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBudget:
+    """Process-wide budget for request and response bytes held in memory.
+
+    Bodies are reserved against ``max_bytes`` before they are buffered. When the
+    budget is exhausted, reservations wait in FIFO order for up to
+    ``wait_timeout`` seconds and are then rejected with 503, so memory stays
+    bounded whatever the mix of payload sizes. Single bodies above
+    ``max_body_size`` are rejected with 413.
+    """
+
+    def __init__(self, max_bytes: int = 268435456, max_body_size: int = 10485760, wait_timeout: float = 0.5):
+        self.max_bytes = max_bytes
+        # A body larger than the whole budget could never be reserved
+        self.max_body_size = min(max_body_size, max_bytes)
+        self.wait_timeout = wait_timeout
+        self.used = 0
+        self._waiters: Deque[Tuple[asyncio.Future, int]] = deque()
+        metrics.MEMORY_BUDGET_LIMIT.set(max_bytes)
+        self._oversized = metrics.MEMORY_BUDGET_REJECTED.labels(reason="body_too_large")
+        self._exhausted = metrics.MEMORY_BUDGET_REJECTED.labels(reason="budget_exhausted")
+
+    def check_size(self, size: int) -> None:
+        """Reject a body that is larger than a single request may buffer."""
+        if size > self.max_body_size:
+            self._oversized.inc()
+            raise PayloadTooLargeException(self.max_body_size)
+
+    def try_reserve(self, size: int) -> bool:
+        """Reserve bytes if they are available right now, without queueing behind waiters."""
+        if self._waiters or self.used + size > self.max_bytes:
+            return False
+        self._add(size)
+        return True
+
+    async def reserve(self, size: int) -> None:
+        """
+        Reserve bytes, waiting up to wait_timeout for other requests to release theirs.
+
+        Raises:
+            PayloadTooLargeException: If the size exceeds max_body_size.
+            MemoryBudgetExhaustedException: If the bytes do not become available in time.
+        """
+        self.check_size(size)
+        if self.try_reserve(size):
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (waiter, size)
+        self._waiters.append(entry)
+        metrics.MEMORY_BUDGET_WAITING.set(len(self._waiters))
+        try:
+            await asyncio.wait_for(waiter, self.wait_timeout)
+        except asyncio.TimeoutError:
+            # The bytes may have been granted right before the timeout
+            if waiter.done() and not waiter.cancelled():
+                self.release(size)
+            self._exhausted.inc()
+            raise MemoryBudgetExhaustedException()
+        except asyncio.CancelledError:
+            # The bytes may have been granted right before the cancellation
+            if waiter.done() and not waiter.cancelled():
+                self.release(size)
+            raise
+        finally:
+            try:
+                self._waiters.remove(entry)
+            except ValueError:
+                pass
+            metrics.MEMORY_BUDGET_WAITING.set(len(self._waiters))
+            # A waiter leaving the head of the queue may unblock smaller ones behind it
+            self._grant()
+
+    def release(self, size: int) -> None:
+        """Return bytes to the budget and hand them to waiting requests."""
+        if size:
+            self.used -= size
+            metrics.MEMORY_BUDGET_USED.set(self.used)
+            self._grant()
+
+    def _add(self, size: int) -> None:
+        self.used += size
+        metrics.MEMORY_BUDGET_USED.set(self.used)
+
+    def _grant(self) -> None:
+        while self._waiters:
+            waiter, size = self._waiters[0]
+            if waiter.done():
+                self._waiters.popleft()
+                continue
+            if self.used + size > self.max_bytes:
+                return
+            self._waiters.popleft()
+            self._add(size)
+            waiter.set_result(None)
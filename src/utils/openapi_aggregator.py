@@ -0,0 +1,281 @@
+import asyncio
+import copy
+import hashlib
+import json
+import re
+from time import monotonic
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import FastAPI
+from fastapi.openapi.utils import get_openapi
+from src.core.entities.microservice import Microservice
+from src.infrastructure.http_client import UpstreamHttpClient
+import logging
+
+logger = logging.getLogger(__name__)
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+PATH_PARAMETER = re.compile(r"{([^}:]+)(?::[^}]*)?}")
+
+
+class ServiceSpec:
+    """What one microservice contributes to the aggregated document, rebuilt only when it changes."""
+
+    __slots__ = ("microservice", "etag", "digest", "paths", "components", "dirty", "failures", "retry_at")
+
+    def __init__(self, microservice: Microservice):
+        self.microservice = microservice
+        self.etag: Optional[str] = None
+        self.digest: Optional[str] = None
+        self.paths: Dict[str, Dict[str, Any]] = {}
+        self.components: Dict[str, Dict[str, Any]] = {}
+        self.dirty = True
+        # Consecutive failed fetches, and when to try again without waiting for the next refresh
+        self.failures = 0
+        self.retry_at: Optional[float] = None
+
+
+class AggregatedDocument:
+    """The serialized aggregated document and its ETag, replaced as a whole."""
+
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+class OpenApiAggregator:
+    """Merges the OpenAPI documents of the registered microservices under the gateway's paths.
+
+    Specs are fetched in the background: right away for microservices whose
+    registration changed and every ``refresh_interval`` seconds for the others,
+    with ``If-None-Match`` so unchanged specs are not downloaded again. A failed
+    fetch is retried after ``retry_backoff`` seconds, doubling up to the refresh
+    interval, so a cold start does not leave a service out until the next
+    refresh. Only the
+    contributions of changed microservices are recomputed; the combined document
+    is then merged and serialized off the event loop, and served as-is.
+    """
+
+    def __init__(
+        self,
+        http_client: UpstreamHttpClient,
+        spec_path: str = "/openapi.json",
+        refresh_interval: float = 300.0,
+        fetch_timeout: float = 5.0,
+        max_concurrency: int = 10,
+        retry_backoff: float = 1.0
+    ):
+        self.http_client = http_client
+        self.spec_path = spec_path
+        self.refresh_interval = refresh_interval
+        self.fetch_timeout = fetch_timeout
+        self.max_concurrency = max_concurrency
+        self.retry_backoff = retry_backoff
+        self.document: Optional[AggregatedDocument] = None
+        self._base_spec: Dict[str, Any] = {}
+        self._services: Dict[str, ServiceSpec] = {}
+        self._changed = False
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def add_service(self, microservice: Microservice) -> None:
+        """Include a microservice, refetching its spec if its registration changed."""
+        current = self._services.get(microservice.service_name)
+        if current is None or current.microservice != microservice:
+            self._services[microservice.service_name] = ServiceSpec(microservice)
+            self._wakeup.set()
+
+    def remove_service(self, service_name: str) -> None:
+        """Drop a microservice from the aggregated document."""
+        if self._services.pop(service_name, None):
+            self._changed = True
+            self._wakeup.set()
+
+    async def start(self, base_spec: Dict[str, Any]) -> None:
+        """Start refreshing in the background.
+
+        Args:
+            base_spec (Dict[str, Any]): The gateway's own OpenAPI document, without the proxied routes.
+        """
+        self._base_spec = base_spec
+        if self._task is None:
+            self._changed = True
+            self._wakeup.set()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop refreshing."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def refresh(self, services: List[ServiceSpec]) -> None:
+        """Fetch the given services' specs and rebuild the document if anything changed."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(service: ServiceSpec) -> None:
+            async with semaphore:
+                await self._fetch(service)
+
+        await asyncio.gather(*(fetch(service) for service in services))
+        if self._changed or any(service.dirty for service in services):
+            for service in services:
+                service.dirty = False
+            self._changed = False
+            snapshot = list(self._services.values())
+            # Merging and serializing hundreds of specs takes a while: keep it off the event loop
+            self.document = await asyncio.to_thread(self._build, self._base_spec, snapshot)
+            logger.info(f"Aggregated OpenAPI document rebuilt from {len(snapshot)} microservices.")
+
+    async def _run(self) -> None:
+        next_refresh = monotonic() + self.refresh_interval
+        while True:
+            wake_at = min([next_refresh] + [
+                service.retry_at for service in self._services.values() if service.retry_at is not None
+            ])
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(wake_at - monotonic(), 0))
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            now = monotonic()
+            if now >= next_refresh:
+                services = list(self._services.values())
+                next_refresh = now + self.refresh_interval
+            else:
+                # New or changed services, and failed fetches whose retry is due
+                services = [
+                    service for service in self._services.values()
+                    if service.digest is None or (service.retry_at is not None and now >= service.retry_at)
+                ]
+            try:
+                await self.refresh(services)
+            except Exception as e:
+                logger.error(f"Aggregated OpenAPI refresh failed: {e}")
+
+    async def _fetch(self, service: ServiceSpec) -> None:
+        microservice = service.microservice
+        url = str(microservice.base_url).rstrip("/") + self.spec_path
+        headers = {"If-None-Match": service.etag} if service.etag and service.digest else {}
+        try:
+            response = await self.http_client.get_client().get(url, headers=headers, timeout=self.fetch_timeout)
+            if response.status_code == 304:
+                service.failures, service.retry_at = 0, None
+                return
+            response.raise_for_status()
+            digest = hashlib.sha256(response.content).hexdigest()
+            if digest == service.digest:
+                service.failures, service.retry_at = 0, None
+                return
+            spec = response.json()
+        except Exception as e:
+            service.failures += 1
+            delay = min(self.retry_backoff * 2 ** (service.failures - 1), self.refresh_interval)
+            service.retry_at = monotonic() + delay
+            logger.warning(
+                f"Could not fetch the OpenAPI spec of '{microservice.service_name}' from {url}, retrying in {delay:.1f}s: {e}"
+            )
+            if service.digest is None:
+                # Still listed, without operations, until the spec can be fetched
+                service.digest, service.paths, service.components, service.dirty = "", {}, {}, True
+            return
+        service.failures, service.retry_at = 0, None
+        service.etag = response.headers.get("etag")
+        service.digest = digest
+        service.paths, service.components = await asyncio.to_thread(_service_contribution, microservice, spec)
+        service.dirty = True
+
+    @staticmethod
+    def _build(base: Dict[str, Any], services: List[ServiceSpec]) -> AggregatedDocument:
+        document = dict(base)
+        document["paths"] = dict(base.get("paths", {}))
+        components = {section: dict(entries) for section, entries in base.get("components", {}).items()}
+        tags = list(base.get("tags", []))
+        for service in sorted(services, key=lambda service: service.microservice.service_name):
+            document["paths"].update(service.paths)
+            for section, entries in service.components.items():
+                components.setdefault(section, {}).update(entries)
+            tags.append({"name": service.microservice.service_name, "description": f"Proxied to {service.microservice.base_url}"})
+        document["components"] = components
+        document["tags"] = tags
+        return AggregatedDocument(json.dumps(document, separators=(",", ":")).encode("utf-8"))
+
+
+def gateway_spec(app: FastAPI) -> Dict[str, Any]:
+    """The gateway's own OpenAPI document, leaving out the opaque proxy routes."""
+    dynamic_routes = {id(route) for _, routes in getattr(app.state, "microservice_routes", {}).values() for route in routes}
+    return get_openapi(
+        title=app.title,
+        version=app.version,
+        description=app.description,
+        routes=[route for route in app.routes if id(route) not in dynamic_routes],
+    )
+
+
+def _template_key(path: str) -> Tuple[str, List[str]]:
+    """Return a path with its parameters blanked, and the parameter names in order."""
+    names = PATH_PARAMETER.findall(path)
+    return PATH_PARAMETER.sub("{}", path.rstrip("/") or "/"), names
+
+
+def _prefix_refs(node: Any, prefix: str) -> Any:
+    if isinstance(node, dict):
+        return {
+            key: ("#/components/" + value[len("#/components/"):].replace("/", "/" + prefix, 1)
+                  if key == "$ref" and isinstance(value, str) and value.startswith("#/components/")
+                  else _prefix_refs(value, prefix))
+            for key, value in node.items()
+        }
+    if isinstance(node, list):
+        return [_prefix_refs(value, prefix) for value in node]
+    return node
+
+
+def _service_contribution(microservice: Microservice, spec: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Map the registered paths of a microservice to the operations of its spec.
+
+    Component names are prefixed with the service name so specs cannot collide.
+    """
+    prefix = re.sub(r"[^A-Za-z0-9._-]", "_", microservice.service_name) + "."
+    upstream_operations = {}
+    for upstream_path, operations in spec.get("paths", {}).items():
+        key, names = _template_key(upstream_path)
+        upstream_operations[key] = (names, operations)
+
+    paths: Dict[str, Any] = {}
+    for path_details in microservice.paths:
+        transform = path_details.transform or microservice.transform
+        upstream_path = "/api/v1" + (transform.rewrite_path if transform and transform.rewrite_path else path_details.path)
+        key, upstream_names = _template_key(upstream_path)
+        match = upstream_operations.get(key)
+        gateway_path = path_details.path if path_details.path.endswith("/") else path_details.path + "/"
+        if match:
+            names, operations = match
+            operation = operations.get(path_details.method.lower())
+        else:
+            operation = None
+        if operation is None:
+            # Registered but not described by the upstream spec
+            operation = {"summary": f"{path_details.method} {path_details.path}", "responses": {"default": {"description": "Proxied response"}}}
+            names = []
+        operation = _prefix_refs(copy.deepcopy(operation), prefix)
+        # The upstream spec may name path parameters differently from the gateway path
+        renamed = dict(zip(names, upstream_names)) if len(names) == len(upstream_names) else {}
+        for parameter in operation.get("parameters", []):
+            if parameter.get("in") == "path" and parameter.get("name") in renamed:
+                parameter["name"] = renamed[parameter["name"]]
+        operation["tags"] = [microservice.service_name]
+        if "operationId" in operation:
+            operation["operationId"] = prefix + operation["operationId"]
+        paths.setdefault(gateway_path, {})[path_details.method.lower()] = operation
+
+    components = {
+        section: {prefix + name: _prefix_refs(value, prefix) for name, value in entries.items()}
+        for section, entries in spec.get("components", {}).items() if isinstance(entries, dict)
+    }
+    return paths, components
@@ -0,0 +1,200 @@
+import asyncio
+import sys
+import threading
+import tracemalloc
+import traceback
+from collections import Counter, deque
+from datetime import datetime, timezone
+from time import monotonic, sleep
+from typing import Any, Deque, Dict, List, Optional
+from src.infrastructure import metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilerBusy(Exception):
+    """Raised when a profile is requested while another one is running."""
+
+
+class EventLoopLagMonitor:
+    """Detects callbacks that block the event loop and logs the stack responsible.
+
+    A coroutine on the loop refreshes a heartbeat every ``interval`` seconds. A
+    watchdog thread checks the heartbeat; when it is older than ``threshold``, the
+    loop thread is stuck in a callback, so the watchdog captures and logs that
+    thread's current stack, which names the blocking call and its coroutine.
+    """
+
+    def __init__(self, threshold: float = 0.1, interval: float = 0.05, history: int = 50):
+        self.threshold = threshold
+        self.interval = interval
+        self.stalls: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self._heartbeat = monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    async def start(self) -> None:
+        """Start the heartbeat on the running loop and the watchdog thread."""
+        if self._task:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._beat())
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event loop lag monitor started (threshold {self.threshold * 1000:.0f} ms).")
+
+    async def stop(self) -> None:
+        """Stop the heartbeat and the watchdog thread."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog:
+            self._stopped.set()
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    async def _beat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            due = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            metrics.EVENT_LOOP_LAG.observe(max(0.0, loop.time() - due))
+            self._heartbeat = monotonic()
+
+    def _watch(self) -> None:
+        stall: Optional[Dict[str, Any]] = None
+        while not self._stopped.wait(self.interval):
+            blocked_for = monotonic() - self._heartbeat
+            if blocked_for <= self.threshold:
+                if stall:
+                    logger.warning(f"Event loop was blocked for {stall['blocked_seconds']:.3f}s.")
+                    stall = None
+                continue
+            if stall:
+                stall["blocked_seconds"] = blocked_for
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else ""
+            stall = {
+                "detected_at": datetime.now(timezone.utc).isoformat(),
+                "blocked_seconds": blocked_for,
+                "stack": stack,
+            }
+            self.stalls.append(stall)
+            metrics.EVENT_LOOP_STALLS.inc()
+            logger.warning(f"Event loop blocked for more than {blocked_for:.3f}s in:\n{stack}")
+
+
+class SamplingProfiler:
+    """Statistical CPU profiler that samples the stacks of all threads.
+
+    The output uses the folded-stack format (``thread;outer;...;inner count`` per
+    line) read by flamegraph.pl, speedscope and most flame graph viewers.
+    """
+
+    def __init__(self, max_seconds: float = 60.0):
+        self.max_seconds = max_seconds
+        self._lock = threading.Lock()
+
+    def profile(self, seconds: float, hz: int = 100) -> str:
+        """
+        Sample every thread for the given duration. Blocking; run it in a worker thread.
+
+        Args:
+            seconds (float): Duration of the profile, capped at max_seconds.
+            hz (int): Samples per second.
+
+        Returns:
+            str: The profile in folded-stack format, most frequent stacks first.
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy("A CPU profile is already running.")
+        try:
+            own_thread_id = threading.get_ident()
+            samples: Counter = Counter()
+            interval = 1.0 / hz
+            deadline = monotonic() + min(seconds, self.max_seconds)
+            while monotonic() < deadline:
+                thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_thread_id:
+                        continue
+                    stack = []
+                    while frame is not None:
+                        code = frame.f_code
+                        stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                        frame = frame.f_back
+                    stack.append(thread_names.get(thread_id, str(thread_id)))
+                    samples[";".join(reversed(stack))] += 1
+                sleep(interval)
+            return "\n".join(f"{stack} {count}" for stack, count in samples.most_common()) + "\n"
+        finally:
+            self._lock.release()
+
+
+class MemoryProfiler:
+    """On-demand tracemalloc snapshots, each compared with the previous one.
+
+    Tracing starts with the first snapshot request and stops on request, so the
+    allocation overhead of tracemalloc is only paid while investigating.
+    """
+
+    def __init__(self, frames: int = 10):
+        self.frames = frames
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._lock = threading.Lock()
+
+    def snapshot(self, limit: int = 25, key_type: str = "lineno") -> Dict[str, Any]:
+        """
+        Take a snapshot and return the allocation sites that grew the most since the previous one.
+
+        Args:
+            limit (int): Number of allocation sites to return.
+            key_type (str): Grouping of allocations: 'lineno', 'filename' or 'traceback'.
+
+        Returns:
+            Dict[str, Any]: Traced memory totals and the top allocation sites.
+        """
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+                self._previous = None
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ))
+            if self._previous is None:
+                statistics = snapshot.statistics(key_type)
+            else:
+                statistics = snapshot.compare_to(self._previous, key_type)
+            compared = self._previous is not None
+            self._previous = snapshot
+
+        current, peak = tracemalloc.get_traced_memory()
+        top: List[Dict[str, Any]] = []
+        for statistic in statistics[:limit]:
+            entry = {
+                "location": statistic.traceback.format()[-2:] if key_type == "traceback" else str(statistic.traceback[0]),
+                "size": statistic.size,
+                "count": statistic.count,
+            }
+            if compared:
+                entry["size_diff"] = statistic.size_diff
+                entry["count_diff"] = statistic.count_diff
+            top.append(entry)
+        return {"traced_memory": current, "peak_traced_memory": peak, "compared_to_previous": compared, "top": top}
+
+    def stop(self) -> None:
+        """Stop tracing and forget the previous snapshot."""
+        with self._lock:
+            tracemalloc.stop()
+            self._previous = None
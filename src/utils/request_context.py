@@ -0,0 +1,88 @@
+import os
+import socket
+import threading
+import zlib
+from contextvars import ContextVar, Token
+from time import time
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Crockford base32: fixed-width encodings sort like the integers they encode
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+# 2024-01-01T00:00:00Z, so that 42 bits of milliseconds last until 2163
+_EPOCH_MS = 1704067200000
+_WORKER_BITS = 10
+_SEQUENCE_BITS = 12
+_MAX_WORKER_ID = (1 << _WORKER_BITS) - 1
+_MAX_SEQUENCE = (1 << _SEQUENCE_BITS) - 1
+_ID_LENGTH = 13  # 64 bits in base32
+
+# ASGI scope key marking batch sub-requests, which run inside the admission and
+# buffering reservations of their batch request
+BATCH_SUB_REQUEST_KEY = "gateway.batch_sub_request"
+
+# Request ID of the request being handled by the current task or thread
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+class RequestIdGenerator:
+    """Snowflake-style generator of short, time-sortable request IDs.
+
+    An ID packs 42 bits of milliseconds, a 10-bit worker id and a 12-bit per-millisecond
+    sequence, and is rendered as 13 Crockford base32 characters. IDs from one worker are
+    strictly increasing, even if the wall clock steps backwards.
+    """
+
+    def __init__(self, worker_id: Optional[int] = None):
+        self.worker_id = (default_worker_id() if worker_id is None else int(worker_id)) & _MAX_WORKER_ID
+        self._last_ms = 0
+        self._sequence = 0
+        # IDs are also generated from the RabbitMQ consumer thread
+        self._lock = threading.Lock()
+
+    def next_id(self) -> str:
+        """Return a new request ID."""
+        with self._lock:
+            now_ms = int(time() * 1000) - _EPOCH_MS
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._sequence = 0
+            else:
+                self._sequence += 1
+                if self._sequence > _MAX_SEQUENCE:
+                    # Sequence exhausted (or clock went backwards): borrow the next millisecond
+                    self._last_ms += 1
+                    self._sequence = 0
+            value = (self._last_ms << (_WORKER_BITS + _SEQUENCE_BITS)) | (self.worker_id << _SEQUENCE_BITS) | self._sequence
+
+        chars = []
+        for _ in range(_ID_LENGTH):
+            chars.append(_ALPHABET[value & 31])
+            value >>= 5
+        return "".join(reversed(chars))
+
+
+def default_worker_id() -> int:
+    """Worker id from ``WORKER_ID``, or derived from the host name and process id."""
+    worker_id = os.getenv("WORKER_ID")
+    if worker_id is not None:
+        return int(worker_id)
+    return zlib.crc32(f"{socket.gethostname()}:{os.getpid()}".encode()) & _MAX_WORKER_ID
+
+
+def current_request_id() -> Optional[str]:
+    """Return the request ID of the current context, if any."""
+    return request_id_var.get()
+
+
+def bind_request_id(request_id: Optional[str]) -> Token:
+    """Set the request ID of the current context; pass the token to ``reset_request_id``."""
+    return request_id_var.set(request_id)
+
+
+def reset_request_id(token: Token) -> None:
+    """Restore the request ID that was current before ``bind_request_id``."""
+    request_id_var.reset(token)
@@ -0,0 +1,90 @@
+from string import Formatter
+from urllib.parse import quote
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from src.core.entities.microservice import TransformConfig
+
+# Headers that only apply to a single connection and must not be relayed
+HOP_BY_HOP_HEADERS = frozenset({
+    b"connection", b"keep-alive", b"proxy-authenticate", b"proxy-authorization",
+    b"te", b"trailer", b"transfer-encoding", b"upgrade",
+})
+# Recomputed by the HTTP client for the upstream request
+RECOMPUTED_HEADERS = frozenset({b"host", b"content-length"})
+
+RawHeaders = List[Tuple[bytes, bytes]]
+
+
+class RequestTransform:
+    """Rewrites a client request for its upstream, compiled once per route.
+
+    Everything that depends only on the route configuration (excluded header
+    names, added headers, credentials, the path template) is computed here, so
+    the per-request work is one pass over the raw client headers and, for
+    templated rewrites, filling in the path parameters.
+    """
+
+    def __init__(self, config: Optional[TransformConfig] = None, api_key: Optional[str] = None):
+        """
+        Compile the transformation of a route.
+
+        Args:
+            config (TransformConfig): Path rewrite and header rules; the request is forwarded as-is when omitted.
+            api_key (str): Upstream API key, sent as a Bearer token when the config enables credential injection.
+        """
+        config = config or TransformConfig()
+
+        added: RawHeaders = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in config.add_headers.items()]
+        if config.inject_api_key and api_key:
+            added.append((b"authorization", f"Bearer {api_key}".encode("latin-1")))
+        self.added_headers: RawHeaders = added
+        # Added headers replace the client's, and the request ID is set per request
+        self.excluded_headers: FrozenSet[bytes] = (
+            HOP_BY_HOP_HEADERS | RECOMPUTED_HEADERS
+            | {name.lower().encode("latin-1") for name in config.remove_headers}
+            | {name for name, _ in added}
+            | {b"x-request-id"}
+        )
+
+        self.rewrite_path = config.rewrite_path
+        # A template without placeholders is a constant path
+        self.templated = bool(config.rewrite_path) and any(
+            field_name is not None for _, field_name, _, _ in Formatter().parse(config.rewrite_path)
+        )
+
+    def target(self, path: str, query: str, path_params: Dict[str, object]) -> str:
+        """Build the upstream path, to be appended to a base URL, keeping the raw query string."""
+        if self.rewrite_path:
+            if self.templated:
+                # Quoted, so a parameter cannot add path segments, dot segments or a query to the upstream path
+                path = self.rewrite_path.format_map({name: _quote_segment(value) for name, value in path_params.items()})
+            else:
+                path = self.rewrite_path
+        target = f"/{path.lstrip('/')}"
+        return f"{target}?{query}" if query else target
+
+    def headers(self, raw_headers: RawHeaders, request_id: Optional[str], added: bool = True) -> RawHeaders:
+        """Filter the raw client headers and add the route's headers and the request ID.
+
+        Args:
+            raw_headers (RawHeaders): The client request headers.
+            request_id (str): Request ID to propagate, if any.
+            added (bool): Whether to add the route's headers and credentials; disabled for copies
+                sent anywhere but the route's own upstream.
+
+        Returns:
+            RawHeaders: The headers to send.
+        """
+        excluded = self.excluded_headers
+        headers = [(name, value) for name, value in raw_headers if name not in excluded]
+        if added:
+            headers.extend(self.added_headers)
+        if request_id:
+            headers.append((b"x-request-id", request_id.encode("latin-1")))
+        return headers
+
+
+def _quote_segment(value: object) -> str:
+    """Percent-encode a path parameter so it stays a single path segment."""
+    segment = quote(str(value), safe="")
+    # quote leaves dots alone, and the HTTP client would resolve "." and ".." segments
+    return segment.replace(".", "%2E") if segment in (".", "..") else segment
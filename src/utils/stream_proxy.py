@@ -0,0 +1,198 @@
+import asyncio
+from time import monotonic
+from typing import AsyncIterator, Callable, Optional
+from fastapi import WebSocket
+from httpx import ReadTimeout
+from src.infrastructure import metrics
+from src.utils.request_context import RequestIdGenerator, current_request_id
+from src.utils.request_transform import RequestTransform
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Handshake headers that belong to the client connection, not to the upstream one
+WEBSOCKET_HANDSHAKE_HEADERS = frozenset({
+    "host", "connection", "upgrade", "sec-websocket-key", "sec-websocket-version",
+    "sec-websocket-extensions", "sec-websocket-protocol", "content-length",
+})
+
+# WebSocket handshakes bypass the HTTP middlewares, so they get their IDs here
+request_id_generator = RequestIdGenerator()
+
+# Frames buffered per direction; keeps per-connection memory small
+WEBSOCKET_MAX_QUEUE = 4
+
+
+class ConnectionLease:
+    """A slot held by one long-lived connection; releasing it twice is harmless."""
+
+    __slots__ = ("_limiter", "_released")
+
+    def __init__(self, limiter: "ConnectionLimiter"):
+        self._limiter = limiter
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._limiter._release()
+
+
+class ConnectionLimiter:
+    """Caps the number of concurrent long-lived connections of a route."""
+
+    def __init__(self, service_name: str, protocol: str, max_connections: Optional[int] = None):
+        self.max_connections = max_connections
+        self.active = 0
+        self._gauge = metrics.STREAM_CONNECTIONS.labels(service=service_name, protocol=protocol)
+        self._rejected = metrics.STREAM_REJECTED.labels(service=service_name, protocol=protocol)
+
+    def try_acquire(self) -> Optional[ConnectionLease]:
+        """Return a lease, or None when the route is at its connection cap."""
+        if self.max_connections is not None and self.active >= self.max_connections:
+            self._rejected.inc()
+            return None
+        self.active += 1
+        self._gauge.inc()
+        return ConnectionLease(self)
+
+    def _release(self) -> None:
+        self.active -= 1
+        self._gauge.dec()
+
+
+async def relay_event_stream(chunks: AsyncIterator[bytes], service_name: str, on_close: Callable[[], None]) -> AsyncIterator[bytes]:
+    """Relay an upstream event stream, ending it quietly when it stays idle past the read timeout."""
+    try:
+        async for chunk in chunks:
+            yield chunk
+    except ReadTimeout:
+        logger.info(f"Closing idle event stream from '{service_name}'.")
+    finally:
+        on_close()
+
+
+async def proxy_websocket_handler(
+    websocket: WebSocket,
+    service_name: str,
+    base_url: str,
+    limiter: ConnectionLimiter,
+    timeout: Optional[float] = None,
+    idle_timeout: Optional[float] = None,
+    transform: Optional[RequestTransform] = None
+) -> None:
+    """Relay WebSocket frames between a client and a microservice in both directions.
+
+    The handshake goes through the route's transform, like proxied HTTP requests:
+    the path is rewritten and headers are removed, added or injected the same way.
+    """
+    websocket_connect = _load_websocket_connect()
+    if websocket_connect is None:
+        logger.error("WebSocket proxying requires the 'websockets' package.")
+        await websocket.close(code=1011)
+        return
+
+    lease = limiter.try_acquire()
+    if lease is None:
+        # 1013: try again later
+        await websocket.close(code=1013)
+        return
+
+    try:
+        transform = transform or RequestTransform()
+        target_url = to_websocket_url(base_url, transform.target(websocket.url.path, "", websocket.path_params), websocket.url.query)
+        headers = [
+            (name.decode("latin-1"), value.decode("latin-1"))
+            for name, value in transform.headers(websocket.headers.raw, current_request_id() or request_id_generator.next_id())
+            if name.decode("latin-1") not in WEBSOCKET_HANDSHAKE_HEADERS
+        ]
+        try:
+            upstream = await websocket_connect(
+                target_url,
+                additional_headers=headers,
+                subprotocols=websocket.scope.get("subprotocols") or None,
+                open_timeout=timeout,
+                max_queue=WEBSOCKET_MAX_QUEUE,
+                compression=None,
+            )
+        except Exception as e:
+            logger.error(f"WebSocket connection to '{service_name}' failed: {target_url}: {e}")
+            await websocket.close(code=1011)
+            return
+
+        async with upstream:
+            await websocket.accept(subprotocol=upstream.subprotocol)
+            await _relay_websocket(websocket, upstream, idle_timeout)
+            close_code = upstream.close_code or 1000
+
+        try:
+            await websocket.close(code=close_code)
+        except RuntimeError:
+            # The client already went away
+            pass
+    finally:
+        lease.release()
+
+
+async def _relay_websocket(websocket: WebSocket, upstream, idle_timeout: Optional[float]) -> None:
+    last_activity = monotonic()
+
+    async def client_to_upstream():
+        nonlocal last_activity
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            last_activity = monotonic()
+            text = message.get("text")
+            await upstream.send(text if text is not None else message.get("bytes", b""))
+
+    async def upstream_to_client():
+        nonlocal last_activity
+        async for message in upstream:
+            last_activity = monotonic()
+            if isinstance(message, str):
+                await websocket.send_text(message)
+            else:
+                await websocket.send_bytes(message)
+
+    async def idle_watchdog():
+        while True:
+            remaining = last_activity + idle_timeout - monotonic()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(remaining)
+
+    tasks = [asyncio.ensure_future(client_to_upstream()), asyncio.ensure_future(upstream_to_client())]
+    if idle_timeout:
+        tasks.append(asyncio.ensure_future(idle_watchdog()))
+    try:
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    for result in results:
+        if isinstance(result, Exception) and not isinstance(result, asyncio.CancelledError):
+            logger.debug(f"WebSocket relay ended: {result!r}")
+
+
+def _load_websocket_connect():
+    # Optional dependency, imported on first use: WebSocket routes are refused when it is missing
+    try:
+        from websockets.asyncio.client import connect
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return connect
+
+
+def to_websocket_url(base_url: str, path: str, query: str) -> str:
+    """Build the upstream WebSocket URL for a client path."""
+    base_url = str(base_url)
+    if base_url.startswith("https://"):
+        base_url = "wss://" + base_url[len("https://"):]
+    elif base_url.startswith("http://"):
+        base_url = "ws://" + base_url[len("http://"):]
+    target_url = f"{base_url.rstrip('/')}/{path.lstrip('/')}"
+    return f"{target_url}?{query}" if query else target_url
@@ -3,12 +3,92 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+def as_bool(value: str) -> bool:
+    return str(value).lower() in ("1", "true", "yes")
+
 def load_config(container):
     container.config.db_uri.from_env("MONGO_URI")
     container.config.db_name.from_env("DB_NAME")
     container.config.db_collection.from_env("DB_COLLECTION")
+    container.config.registry_backend.from_env("REGISTRY_BACKEND", default="mongodb")
+    container.config.registry_sqlite_path.from_env("REGISTRY_SQLITE_PATH", default="data/registry.db")
+    # With the embedded registry, MongoDB is only needed for usage metering, which then defaults to off
+    sqlite_registry = container.config.registry_backend() == "sqlite"
+    container.config.usage_enabled.from_env("USAGE_METERING_ENABLED", as_=as_bool, default="false" if sqlite_registry else "true")
+    container.config.mongodb_enabled.from_value(not sqlite_registry or container.config.usage_enabled())
+    container.config.health_required_dependencies.from_env(
+        "HEALTH_REQUIRED_DEPENDENCIES", default="redis" if sqlite_registry else "mongodb,redis"
+    )
     container.config.redis_host.from_env("REDIS_HOST", default="localhost")
     container.config.redis_port.from_env("REDIS_PORT", default=6379)
     container.config.redis_db.from_env("REDIS_DB", default=0)
     container.config.redis_password.from_env("REDIS_PASSWORD", default=None)
+    container.config.redis_max_connections.from_env("REDIS_MAX_CONNECTIONS", as_=int, default=50)
+    container.config.redis_pool_timeout.from_env("REDIS_POOL_TIMEOUT", as_=float, default=1.0)
+    container.config.redis_socket_timeout.from_env("REDIS_SOCKET_TIMEOUT", as_=float, default=1.0)
+    container.config.redis_connect_timeout.from_env("REDIS_CONNECT_TIMEOUT", as_=float, default=1.0)
+    container.config.redis_client_cache_prefixes.from_env("REDIS_CLIENT_CACHE_PREFIXES", default="")
+    container.config.redis_client_cache_max_keys.from_env("REDIS_CLIENT_CACHE_MAX_KEYS", as_=int, default=10000)
+    container.config.redis_client_cache_ttl.from_env("REDIS_CLIENT_CACHE_TTL", as_=float, default=60.0)
     container.config.rabbitmq_host.from_env("RABBITMQ_HOST")
+    container.config.admission_max_inflight.from_env("ADMISSION_MAX_INFLIGHT", as_=int, default=512)
+    container.config.admission_max_queue.from_env("ADMISSION_MAX_QUEUE", as_=int, default=1024)
+    container.config.admission_target_delay.from_env("ADMISSION_TARGET_DELAY", as_=float, default=0.05)
+    container.config.admission_interval.from_env("ADMISSION_INTERVAL", as_=float, default=0.5)
+    container.config.compression_minimum_size.from_env("COMPRESSION_MINIMUM_SIZE", as_=int, default=1024)
+    container.config.compression_offload_size.from_env("COMPRESSION_OFFLOAD_SIZE", as_=int, default=65536)
+    container.config.upstream_max_connections.from_env("UPSTREAM_MAX_CONNECTIONS", as_=int, default=1000)
+    container.config.upstream_max_keepalive.from_env("UPSTREAM_MAX_KEEPALIVE", as_=int, default=200)
+    container.config.batch_max_requests.from_env("BATCH_MAX_REQUESTS", as_=int, default=20)
+    container.config.batch_max_concurrency.from_env("BATCH_MAX_CONCURRENCY", as_=int, default=10)
+    container.config.registry_snapshot_path.from_env("REGISTRY_SNAPSHOT_PATH", default="data/registry_snapshot.json")
+    container.config.health_interval.from_env("HEALTH_INTERVAL", as_=float, default=5.0)
+    container.config.health_probe_timeout.from_env("HEALTH_PROBE_TIMEOUT", as_=float, default=2.0)
+    container.config.drain_grace_period.from_env("DRAIN_GRACE_PERIOD", as_=float, default=5.0)
+    container.config.drain_timeout.from_env("DRAIN_TIMEOUT", as_=float, default=30.0)
+    container.config.server_host.from_env("HOST", default="0.0.0.0")
+    container.config.server_port.from_env("PORT", as_=int, default=8500)
+    container.config.server_workers.from_env("WORKERS", as_=int, default=1)
+    container.config.usage_collection.from_env("USAGE_COLLECTION", default="usage_metrics")
+    container.config.usage_bucket_seconds.from_env("USAGE_BUCKET_SECONDS", as_=int, default=60)
+    container.config.usage_flush_interval.from_env("USAGE_FLUSH_INTERVAL", as_=float, default=10.0)
+    container.config.usage_max_keys.from_env("USAGE_MAX_KEYS", as_=int, default=50000)
+    container.config.usage_retention_seconds.from_env("USAGE_RETENTION_SECONDS", as_=int, default=2592000)
+    container.config.mirror_queue_size.from_env("MIRROR_QUEUE_SIZE", as_=int, default=1000)
+    container.config.mirror_workers.from_env("MIRROR_WORKERS", as_=int, default=4)
+    container.config.mirror_max_connections.from_env("MIRROR_MAX_CONNECTIONS", as_=int, default=50)
+    container.config.mirror_timeout.from_env("MIRROR_TIMEOUT", as_=float, default=5.0)
+    container.config.mirror_max_body_size.from_env("MIRROR_MAX_BODY_SIZE", as_=int, default=1048576)
+    container.config.capture_enabled.from_env("CAPTURE_ENABLED", as_=as_bool, default="false")
+    container.config.capture_directory.from_env("CAPTURE_DIRECTORY", default="data/capture")
+    container.config.capture_sample_rate.from_env("CAPTURE_SAMPLE_RATE", as_=float, default=0.01)
+    container.config.capture_bodies.from_env("CAPTURE_BODIES", as_=as_bool, default="false")
+    container.config.capture_max_file_size.from_env("CAPTURE_MAX_FILE_SIZE", as_=int, default=104857600)
+    container.config.capture_max_files.from_env("CAPTURE_MAX_FILES", as_=int, default=10)
+    container.config.admin_api_key.from_env("ADMIN_API_KEY", default=None)
+    container.config.profiling_enabled.from_env("PROFILING_ENABLED", as_=as_bool, default="false")
+    container.config.loop_lag_threshold.from_env("LOOP_LAG_THRESHOLD", as_=float, default=0.1)
+    container.config.profiler_max_seconds.from_env("PROFILER_MAX_SECONDS", as_=float, default=60.0)
+    container.config.dns_cache_ttl.from_env("DNS_CACHE_TTL", as_=float, default=60.0)
+    container.config.dns_cache_stale_ttl.from_env("DNS_CACHE_STALE_TTL", as_=float, default=3600.0)
+    container.config.dns_resolve_timeout.from_env("DNS_RESOLVE_TIMEOUT", as_=float, default=2.0)
+    container.config.idempotency_lock_ttl.from_env("IDEMPOTENCY_LOCK_TTL", as_=int, default=60)
+    container.config.idempotency_max_body_size.from_env("IDEMPOTENCY_MAX_BODY_SIZE", as_=int, default=1048576)
+    container.config.memory_budget_bytes.from_env("MEMORY_BUDGET_BYTES", as_=int, default=268435456)
+    container.config.max_body_size.from_env("MAX_BODY_SIZE", as_=int, default=10485760)
+    container.config.memory_budget_wait_timeout.from_env("MEMORY_BUDGET_WAIT_TIMEOUT", as_=float, default=0.5)
+    container.config.rabbitmq_rpc_max_pending.from_env("RABBITMQ_RPC_MAX_PENDING", as_=int, default=1000)
+    container.config.broadcast_client_buffer.from_env("BROADCAST_CLIENT_BUFFER", as_=int, default=64)
+    container.config.heavy_hitter_width.from_env("HEAVY_HITTER_WIDTH", as_=int, default=2048)
+    container.config.heavy_hitter_depth.from_env("HEAVY_HITTER_DEPTH", as_=int, default=4)
+    container.config.heavy_hitter_capacity.from_env("HEAVY_HITTER_CAPACITY", as_=int, default=100)
+    container.config.heavy_hitter_window.from_env("HEAVY_HITTER_WINDOW", as_=float, default=60.0)
+    container.config.heavy_hitter_throttle_rate.from_env("HEAVY_HITTER_THROTTLE_RATE", as_=float, default=0.0)
+    container.config.deny_list_networks_key.from_env("DENY_LIST_NETWORKS_KEY", default="deny:networks")
+    container.config.deny_list_credentials_key.from_env("DENY_LIST_CREDENTIALS_KEY", default="deny:credentials")
+    container.config.deny_list_channel.from_env("DENY_LIST_CHANNEL", default="deny:updates")
+    container.config.deny_list_resync_interval.from_env("DENY_LIST_RESYNC_INTERVAL", as_=float, default=60.0)
+    container.config.openapi_spec_path.from_env("OPENAPI_SPEC_PATH", default="/openapi.json")
+    container.config.openapi_refresh_interval.from_env("OPENAPI_REFRESH_INTERVAL", as_=float, default=300.0)
+    container.config.openapi_fetch_timeout.from_env("OPENAPI_FETCH_TIMEOUT", as_=float, default=5.0)
+    container.config.openapi_retry_backoff.from_env("OPENAPI_RETRY_BACKOFF", as_=float, default=1.0)
@@ -1,52 +1,150 @@
 # src/lifespan.py
+import asyncio
+from time import monotonic
 from contextlib import asynccontextmanager
 from fastapi_limiter import FastAPILimiter
-from src.utils.dynamic_router import register_microservice_routes
+from src.utils.dynamic_router import sync_microservice_routes
+from src.utils.openapi_aggregator import gateway_spec
+from src.utils.request_context import bind_request_id, reset_request_id
+from src.infrastructure.logging_config import setup_logging
 import logging
 from threading import Thread
 import json
 
 logger = logging.getLogger(__name__)
 
-def start_rabbitmq_consumer(container):
+def start_rabbitmq_consumer(container, loop):
     """Function to start consuming from RabbitMQ user authentication queue"""
     consume_user_auth_queue = container.consume_user_auth_queue()
+    deny_list = container.deny_list()
 
     def on_user_auth_message(ch, method, properties, body):
-        # Process the message received from the RabbitMQ queue
-        user_data = json.loads(body)
-        logger.info(f"Processing authentication for user: {user_data.get('user_wallet_address')}")
-        # Acknowledge the message
-        ch.basic_ack(delivery_tag=method.delivery_tag)
+        # Log under the request ID of the publisher, if it sent one
+        headers = properties.headers or {}
+        token = bind_request_id(headers.get("x-request-id") or properties.correlation_id)
+        try:
+            # Process the message received from the RabbitMQ queue
+            user_data = json.loads(body)
+            logger.info(f"Processing authentication for user: {user_data.get('user_wallet_address')}")
+            if user_data.get("action") == "revoke":
+                # Shared through Redis, so every gateway instance refuses the credentials
+                credentials = [user_data[field] for field in ("token", "api_key") if user_data.get(field)]
+                asyncio.run_coroutine_threadsafe(deny_list.revoke(credentials), loop).result(timeout=5)
+            # Acknowledge the message
+            ch.basic_ack(delivery_tag=method.delivery_tag)
+        finally:
+            reset_request_id(token)
 
-    # Start consuming messages from the queue
-    consume_user_auth_queue.execute(on_user_auth_message)
+    # Start consuming messages from the queue, until stop_rabbitmq_consumer asks to stop
+    try:
+        consume_user_auth_queue.execute(on_user_auth_message)
+    finally:
+        # The connection belongs to this thread, so it is closed here
+        consume_user_auth_queue.close()
+
+
+async def stop_rabbitmq_consumer(container, consumer_thread, timeout: float) -> None:
+    """Stop the RabbitMQ consumer after its current message and wait up to ``timeout`` seconds for it."""
+    if consumer_thread is None or not consumer_thread.is_alive():
+        return
+    container.consume_user_auth_queue().stop()
+    await asyncio.to_thread(consumer_thread.join, max(timeout, 0))
+    if consumer_thread.is_alive():
+        logger.warning("RabbitMQ consumer did not stop before the drain deadline; its unacknowledged message will be redelivered.")
+    else:
+        logger.info("RabbitMQ consumer stopped.")
+
+
+async def reconcile_registry(app, container, retry_interval: float = 1.0, max_retry_interval: float = 30.0):
+    """Load the registry from the database, update the routes and refresh the local snapshot.
+
+    Retries with exponential backoff until the database answers, so a slow or
+    unreachable MongoDB never delays serving the routes from the snapshot.
+    """
+    microservice_service = container.microservice_service()
+    delay = retry_interval
+    while True:
+        try:
+            microservices = await microservice_service.get_all_microservices()
+            break
+        except Exception as e:
+            logger.error(f"Registry reconciliation failed, retrying in {delay:.0f}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_retry_interval)
+
+    await sync_microservice_routes(app, microservices)
+    await container.registry_snapshot().save(microservices)
+    logger.info(f"Registry reconciled with the database ({len(microservices)} microservices).")
 
 
 @asynccontextmanager
 async def lifespan(app):
     """Lifespan event manager to handle startup and shutdown events."""
+    # Configured here rather than on import, so importing the app creates no log files
+    setup_logging()
     container = app.container
+    # MongoDB is not needed with the embedded registry store unless usage metering is enabled
+    mongo_client = container.mongo_client() if container.config.mongodb_enabled() else None
+    # The embedded registry store is only opened when it is the selected backend
+    sqlite_client = container.sqlite_client() if container.config.registry_backend() == "sqlite" else None
+    redis_client = container.redis_client()
+    http_client = container.http_client()
+    dns_cache = container.dns_cache()
+    health_monitor = container.health_monitor()
+    usage_meter = container.usage_meter() if container.config.usage_enabled() else None
+    traffic_mirror = container.traffic_mirror()
+    traffic_capture = container.traffic_capture()
+    rabbitmq_rpc = container.rabbitmq_rpc()
+    deny_list = container.deny_list()
+    openapi_aggregator = container.openapi_aggregator()
+    loop_lag_monitor = container.loop_lag_monitor() if container.config.profiling_enabled() else None
+    drain_controller = container.drain_controller()
+    reconcile_task = None
+    consumer_thread = None
 
     try:
-        mongo_client = container.mongo_client()
-        await mongo_client.connect()
-        redis_client = container.redis_client()
-        await redis_client.connect()
-        logger.info("MongoDB and Redis clients connected during startup.")
+        # Serve the last-known-good route table right away
+        snapshot_microservices = container.registry_snapshot().load()
+        if snapshot_microservices:
+            await sync_microservice_routes(app, snapshot_microservices)
 
-        microservice_service = container.microservice_service()
-        microservices = await microservice_service.get_all_microservices()
-        await register_microservice_routes(app, microservices)
+        # Upstream hosts are resolved in the background; until then connections use the system resolver
+        await dns_cache.start()
 
-        assert mongo_client.collection is not None, "MongoDB collection is not set during startup"
+        # Independent connections are established concurrently
+        connections = [redis_client.connect(), http_client.connect()]
+        if mongo_client:
+            connections.append(mongo_client.connect())
+        await asyncio.gather(*connections)
+        logger.info("MongoDB, Redis and upstream HTTP clients connected during startup.")
+        if sqlite_client:
+            await sqlite_client.connect()
 
         await FastAPILimiter.init(redis_client)
         logger.info("Rate limiter initialized with Redis backend.")
+        await deny_list.start()
+
+        if loop_lag_monitor:
+            await loop_lag_monitor.start()
+        # The first probe round runs in the background; readiness answers 503 until it is done
+        await health_monitor.start()
+        if usage_meter:
+            await usage_meter.start()
+        await traffic_mirror.start()
+        traffic_capture.start()
+        await rabbitmq_rpc.start()
+        await openapi_aggregator.start(gateway_spec(app))
+
+        # Build the request-path services once, so no request pays for constructing them
+        container.microservice_service()
+        container.gateway_service()
+
+        # The database copy of the registry replaces the snapshot once it is available
+        reconcile_task = asyncio.create_task(reconcile_registry(app, container))
 
         # Start RabbitMQ consumer in a separate thread to avoid blocking the application
-        consumer_thread = Thread(target=start_rabbitmq_consumer, args=(container,))
-        consumer_thread.daemon = True  # Daemon thread will exit when the main program exits
+        consumer_thread = Thread(target=start_rabbitmq_consumer, args=(container, asyncio.get_running_loop()))
+        consumer_thread.daemon = True  # A handler stuck past the drain deadline cannot block the exit
         consumer_thread.start()
 
         yield
@@ -56,6 +154,30 @@ async def lifespan(app):
         raise e
 
     finally:
-        await mongo_client.disconnect()
-        await redis_client.disconnect()
-        logger.info("MongoDB and Redis clients disconnected during shutdown.")
+        # Refuse new requests, then let in-flight requests and consumer handlers finish before closing anything
+        deadline = monotonic() + drain_controller.timeout
+        drain_controller.close()
+        await drain_controller.wait_idle(deadline - monotonic())
+        await stop_rabbitmq_consumer(container, consumer_thread, deadline - monotonic())
+
+        if reconcile_task:
+            reconcile_task.cancel()
+        if loop_lag_monitor:
+            await loop_lag_monitor.stop()
+        await health_monitor.stop()
+        await deny_list.stop()
+        await dns_cache.stop()
+        await openapi_aggregator.stop()
+        await rabbitmq_rpc.stop()
+        await traffic_mirror.stop()
+        await asyncio.to_thread(traffic_capture.stop)
+        # Write the last usage counters while MongoDB is still connected
+        if usage_meter:
+            await usage_meter.stop()
+        await asyncio.gather(
+            *([mongo_client.disconnect()] if mongo_client else []), redis_client.disconnect(), http_client.disconnect(),
+            return_exceptions=True
+        )
+        if sqlite_client:
+            await sqlite_client.disconnect()
+        logger.info("MongoDB, Redis and upstream HTTP clients disconnected during shutdown.")
@@ -4,6 +4,12 @@ from src.middleware.logging_middleware import LoggingMiddleware
 from src.middleware.response_interceptor import ResponseFormatMiddleware
 from src.middleware.security_headers import SecurityHeadersMiddleware
 from src.middleware.request_id_middleware import RequestIDMiddleware
+from src.middleware.admission_middleware import AdmissionControlMiddleware
+from src.middleware.compression_middleware import CompressionMiddleware
+from src.middleware.body_budget_middleware import BodyBudgetMiddleware
+from src.middleware.heavy_hitter_middleware import HeavyHitterMiddleware
+from src.middleware.deny_list_middleware import DenyListMiddleware
+from src.middleware.drain_middleware import DrainMiddleware
 
 def add_middlewares(app):
     app.add_middleware(
@@ -13,7 +19,22 @@ def add_middlewares(app):
         allow_methods=["*"],  # Allow all HTTP methods
         allow_headers=["*"],  # Allow all headers
     )
-    app.add_middleware(RequestIDMiddleware)
     app.add_middleware(LoggingMiddleware)
-    app.add_middleware(ResponseFormatMiddleware)
+    app.add_middleware(ResponseFormatMiddleware, budget=app.container.memory_budget())
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=app.container.config.compression_minimum_size(),
+        offload_size=app.container.config.compression_offload_size()
+    )
+    # Inside admission control, so shed requests never reserve buffering budget
+    app.add_middleware(BodyBudgetMiddleware, budget=app.container.memory_budget())
+    # Inside admission control, which classifies the request; throttled clients never reach the body budget
+    app.add_middleware(HeavyHitterMiddleware, tracker=app.container.heavy_hitter_tracker())
+    app.add_middleware(AdmissionControlMiddleware, controller=app.container.admission_controller())
     app.add_middleware(SecurityHeadersMiddleware)
+    # Denied clients are refused before admission, buffering or any Redis or upstream work
+    app.add_middleware(DenyListMiddleware, deny_list=app.container.deny_list())
+    # Counts every admitted, queued or refused request as in flight until its response is sent
+    app.add_middleware(DrainMiddleware, controller=app.container.drain_controller())
+    # Outermost, so every other middleware logs with the request ID and the header survives reformatting
+    app.add_middleware(RequestIDMiddleware)
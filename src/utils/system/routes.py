@@ -1,7 +1,20 @@
 # src/routes.py
 from src.interfaces.api.v1.gateway_controller import router as gateway_controller
 from src.interfaces.api.v1.microservice_controller import router as microservice_controller
+from src.interfaces.api.v1.metrics_controller import router as metrics_controller
+from src.interfaces.api.v1.batch_controller import router as batch_controller
+from src.interfaces.api.v1.health_check import router as health_check
+from src.interfaces.api.v1.profiling_controller import router as profiling_controller
+from src.interfaces.api.v1.heavy_hitters_controller import router as heavy_hitters_controller
+from src.interfaces.api.v1.openapi_controller import router as openapi_controller
 
 def register_routers(app):
     app.include_router(gateway_controller, prefix="/api/v1", tags=["gateway"])
     app.include_router(microservice_controller, prefix="/api/v1", tags=["microservice"])
+    app.include_router(health_check, prefix="/api/v1")
+    app.include_router(batch_controller, prefix="/api/v1", tags=["batch"])
+    app.include_router(openapi_controller, prefix="/api/v1")
+    app.include_router(metrics_controller, prefix="/internal", tags=["metrics"])
+    app.include_router(heavy_hitters_controller, prefix="/internal/heavy-hitters", tags=["heavy-hitters"])
+    if app.container.config.profiling_enabled():
+        app.include_router(profiling_controller, prefix="/internal/profiling", tags=["profiling"])
@@ -0,0 +1,174 @@
+# src/server.py
+import multiprocessing
+import os
+import signal
+import time
+from typing import List, Optional
+import uvicorn
+from uvicorn.importer import import_from_string
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Sockets are inherited by the spawned workers
+multiprocessing.allow_connection_pickling()
+spawn = multiprocessing.get_context("spawn")
+
+# Sent by the supervisor to a worker it replaces: stop accepting and finish in-flight
+# requests, without the readiness grace period of a full shutdown
+RETIRE_SIGNAL = signal.SIGUSR2
+
+
+class GatewayServer(uvicorn.Server):
+    """Uvicorn server that drains before shutting down.
+
+    The first SIGTERM or SIGINT starts draining: readiness fails and responses close
+    their connection, while requests are still served for the grace period of the
+    drain controller. The server then stops listening and waits up to the drain
+    timeout for the requests in flight. A second signal skips the grace period.
+    """
+
+    def __init__(self, config: uvicorn.Config, ready=None):
+        super().__init__(config)
+        # Written to once the application has started, for the supervisor
+        self.ready = ready
+        self._drain = None
+
+    def _drain_controller(self):
+        if self._drain is None and self.config.loaded:
+            app = import_from_string(self.config.app) if isinstance(self.config.app, str) else self.config.app
+            container = getattr(app, "container", None)
+            self._drain = container.drain_controller() if container else None
+        return self._drain
+
+    async def startup(self, sockets=None) -> None:
+        await super().startup(sockets=sockets)
+        if self.started:
+            signal.signal(RETIRE_SIGNAL, self.handle_retire)
+            if self.ready is not None:
+                self.ready.send(True)
+                self.ready.close()
+
+    def handle_exit(self, sig, frame) -> None:
+        drain = self._drain_controller()
+        if drain is None or drain.draining or self.should_exit:
+            super().handle_exit(sig, frame)
+        else:
+            drain.begin()
+
+    def handle_retire(self, sig, frame) -> None:
+        self.should_exit = True
+
+    async def on_tick(self, counter: int) -> bool:
+        drain = self._drain_controller()
+        if drain and drain.draining and not self.should_exit and drain.grace_elapsed():
+            logger.info("Drain grace period over, closing the listening socket.")
+            self.should_exit = True
+        return await super().on_tick(counter)
+
+
+def _run_worker(config: uvicorn.Config, sockets: list, ready) -> None:
+    config.configure_logging()
+    GatewayServer(config, ready=ready).run(sockets=sockets)
+
+
+class _Worker:
+    def __init__(self, config: uvicorn.Config, sockets: list):
+        self.ready, ready_writer = spawn.Pipe(duplex=False)
+        self.process = spawn.Process(target=_run_worker, args=(config, sockets, ready_writer))
+        self.process.start()
+        ready_writer.close()
+
+    def signal(self, sig: int) -> None:
+        if self.process.is_alive():
+            os.kill(self.process.pid, sig)
+
+
+class WorkerSupervisor:
+    """Runs the gateway workers on one listening socket owned by this process.
+
+    SIGHUP replaces the workers one at a time: a new worker is started on the same
+    socket and, once it is serving, the old one stops accepting and finishes its
+    requests, so a reload never refuses a connection. SIGTERM and SIGINT are
+    forwarded to every worker, which drain before exiting. Workers that die are
+    replaced.
+    """
+
+    def __init__(self, config: uvicorn.Config, workers: int = 1, startup_timeout: float = 60.0):
+        self.config = config
+        self.workers_count = max(workers, 1)
+        self.startup_timeout = startup_timeout
+        self.workers: List[_Worker] = []
+        self.retiring: List[_Worker] = []
+        self.should_exit = False
+        self._signals: List[int] = []
+
+    def run(self) -> None:
+        sockets = [self.config.bind_socket()]
+        for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
+            signal.signal(sig, lambda sig, frame: self._signals.append(sig))
+        logger.info(f"Supervisor [{os.getpid()}] starting {self.workers_count} workers.")
+        self.workers = [_Worker(self.config, sockets) for _ in range(self.workers_count)]
+
+        while self.workers or self.retiring:
+            while self._signals:
+                self._handle_signal(self._signals.pop(0), sockets)
+            self.retiring = [worker for worker in self.retiring if worker.process.is_alive()]
+            for index, worker in enumerate(self.workers):
+                if not worker.process.is_alive():
+                    if self.should_exit:
+                        continue
+                    logger.warning(f"Worker [{worker.process.pid}] exited with code {worker.process.exitcode}, replacing it.")
+                    self.workers[index] = _Worker(self.config, sockets)
+            if self.should_exit:
+                self.workers = [worker for worker in self.workers if worker.process.is_alive()]
+            time.sleep(0.2)
+
+        for sock in sockets:
+            sock.close()
+        logger.info(f"Supervisor [{os.getpid()}] stopped.")
+
+    def _handle_signal(self, sig: int, sockets: list) -> None:
+        if sig == signal.SIGHUP:
+            if not self.should_exit:
+                self.reload(sockets)
+            return
+        # A repeated signal reaches the workers again, which makes them skip their grace period
+        self.should_exit = True
+        for worker in self.workers + self.retiring:
+            worker.signal(sig)
+
+    def reload(self, sockets: list) -> None:
+        """Replace every worker by a new one, one at a time."""
+        logger.info("Reloading workers.")
+        for index, old in enumerate(list(self.workers)):
+            new = _Worker(self.config, sockets)
+            if not self._wait_ready(new):
+                logger.error(f"New worker [{new.process.pid}] did not start in time; keeping the current workers.")
+                new.process.kill()
+                new.process.join()
+                return
+            old.signal(RETIRE_SIGNAL)
+            self.retiring.append(old)
+            self.workers[index] = new
+        logger.info("Workers reloaded.")
+
+    def _wait_ready(self, worker: _Worker) -> bool:
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline and worker.process.is_alive() and not self._exit_requested():
+            if worker.ready.poll(0.2):
+                try:
+                    return worker.ready.recv()
+                except EOFError:
+                    # The worker exited before it started serving
+                    return False
+        return False
+
+    def _exit_requested(self) -> bool:
+        return any(sig != signal.SIGHUP for sig in self._signals)
+
+
+def serve(app: str, host: str, port: int, workers: int = 1, drain_timeout: Optional[float] = None) -> None:
+    """Serve the application with a supervisor that drains on shutdown and reloads workers on SIGHUP."""
+    config = uvicorn.Config(app, host=host, port=port, timeout_graceful_shutdown=drain_timeout)
+    WorkerSupervisor(config, workers).run()
@@ -0,0 +1,152 @@
+"""Replay a traffic capture against a gateway and report latency percentiles.
+
+Usage:
+    python -m src.utils.traffic_replay data/capture --target http://localhost:8500 --speed 2
+
+Requests are sent open-loop at their captured arrival times divided by the speed
+factor, so the concurrency seen by the gateway follows the captured traffic mix.
+"""
+import argparse
+import asyncio
+import math
+import os
+import sys
+from time import perf_counter
+from typing import Dict, List, Optional
+from httpx import AsyncClient, HTTPError, Limits, Timeout
+from src.infrastructure.traffic_capture import capture_files, read_capture
+
+# Headers that must be recomputed for the replayed request
+REPLAY_EXCLUDED_HEADERS = frozenset({"host", "content-length", "connection", "transfer-encoding"})
+
+
+class ReplayStats:
+    """Latencies and outcomes of the replayed requests."""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.statuses: Dict[int, int] = {}
+        self.errors = 0
+        self.late = 0
+        self.peak_inflight = 0
+
+    def percentile(self, fraction: float) -> float:
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+    def report(self, elapsed: float) -> str:
+        total = len(self.latencies) + self.errors
+        lines = [
+            f"requests: {total} in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.1f} req/s), peak concurrency {self.peak_inflight}",
+            f"errors: {self.errors}, sent late: {self.late}",
+            "status: " + ", ".join(f"{status}={count}" for status, count in sorted(self.statuses.items())),
+        ]
+        for label, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p99.9", 0.999)):
+            lines.append(f"{label}: {self.percentile(fraction) * 1000:.1f} ms")
+        if self.latencies:
+            lines.append(f"max: {max(self.latencies) * 1000:.1f} ms")
+        return "\n".join(lines)
+
+
+async def replay(
+    paths: List[str],
+    target: str,
+    speed: float = 1.0,
+    max_inflight: int = 1000,
+    timeout: float = 30.0,
+    extra_headers: Optional[Dict[str, str]] = None,
+    late_threshold: float = 0.01
+) -> ReplayStats:
+    """
+    Send the captured requests to the target, keeping their relative timing.
+
+    Args:
+        paths (List[str]): Capture files, oldest first.
+        target (str): Base URL of the gateway under test.
+        speed (float): Time compression factor; 2 replays an hour of traffic in 30 minutes.
+        max_inflight (int): Safety cap on concurrent requests.
+        timeout (float): Per-request timeout in seconds.
+        extra_headers (Dict[str, str]): Headers added to every request, e.g. credentials stripped at capture.
+        late_threshold (float): Seconds behind schedule after which a request counts as sent late.
+
+    Returns:
+        ReplayStats: The latencies and outcomes of the replayed requests.
+    """
+    stats = ReplayStats()
+    inflight = asyncio.Semaphore(max_inflight)
+    tasks = set()
+    target = target.rstrip("/")
+
+    async with AsyncClient(
+        limits=Limits(max_connections=max_inflight, max_keepalive_connections=max_inflight),
+        timeout=Timeout(timeout)
+    ) as client:
+
+        async def send(captured):
+            headers = [(name, value) for name, value in captured.headers if name not in REPLAY_EXCLUDED_HEADERS]
+            if extra_headers:
+                headers.extend(extra_headers.items())
+            url = f"{target}{captured.path}" + (f"?{captured.query}" if captured.query else "")
+            started = perf_counter()
+            try:
+                response = await client.request(captured.method, url, headers=headers, content=captured.body)
+                stats.latencies.append(perf_counter() - started)
+                stats.statuses[response.status_code] = stats.statuses.get(response.status_code, 0) + 1
+            except HTTPError:
+                stats.errors += 1
+            finally:
+                inflight.release()
+
+        loop = asyncio.get_running_loop()
+        replay_start = loop.time()
+        capture_start = None
+        for captured in read_capture(paths):
+            if capture_start is None:
+                capture_start = captured.timestamp
+            due = replay_start + (captured.timestamp - capture_start) / speed
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await inflight.acquire()
+            if loop.time() - due > late_threshold:
+                stats.late += 1
+            task = asyncio.create_task(send(captured))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            stats.peak_inflight = max(stats.peak_inflight, len(tasks))
+        await asyncio.gather(*tasks)
+    return stats
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay captured gateway traffic and report latency percentiles.")
+    parser.add_argument("capture", nargs="+", help="Capture files, or a capture directory.")
+    parser.add_argument("--target", required=True, help="Base URL of the gateway under test.")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed factor between 1 and 10 (default 1).")
+    parser.add_argument("--max-inflight", type=int, default=1000, help="Maximum concurrent requests (default 1000).")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds (default 30).")
+    parser.add_argument("--header", action="append", default=[], metavar="NAME:VALUE", help="Header added to every request.")
+    args = parser.parse_args(argv)
+    if not 1 <= args.speed <= 10:
+        parser.error("--speed must be between 1 and 10.")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    paths = []
+    for capture in args.capture:
+        paths.extend(capture_files(capture) if os.path.isdir(capture) else [capture])
+    extra_headers = dict(header.split(":", 1) for header in args.header)
+    extra_headers = {name.strip().lower(): value.strip() for name, value in extra_headers.items()}
+
+    started = perf_counter()
+    stats = asyncio.run(replay(paths, args.target, args.speed, args.max_inflight, args.timeout, extra_headers))
+    print(stats.report(perf_counter() - started))
+    return 0 if stats.latencies else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
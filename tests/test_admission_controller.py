@@ -0,0 +1,134 @@
+import asyncio
+from unittest import mock
+import pytest
+from src.utils import admission_controller as admission_module
+from src.utils.admission_controller import AdmissionController, AdmissionRejected
+
+
+def test_classify_uses_service_routes_then_prefixes():
+    controller = AdmissionController()
+    controller.set_service_routes("orders", [("POST", "/api/v1/orders/", "high"), ("GET", "/api/v1/orders/{order_id}/", "critical")])
+    assert controller.classify("POST", "/api/v1/orders") == "high"
+    assert controller.classify("GET", "/api/v1/orders/42/") == "critical"
+    assert controller.classify("GET", "/api/v1/health") == "critical"
+    assert controller.classify("GET", "/api/v1/other") == "normal"
+    assert controller.classify("GET", "/elsewhere") == "low"
+
+
+def test_service_routes_are_replaced_and_removed():
+    controller = AdmissionController()
+    controller.set_service_routes("orders", [("POST", "/orders/", "high")])
+    controller.set_service_routes("orders", [("PUT", "/orders/", "high")])
+    assert controller.classify("POST", "/orders") == "low"
+    assert controller.classify("PUT", "/orders") == "high"
+    controller.remove_service("orders")
+    assert controller.classify("PUT", "/orders") == "low"
+
+
+def test_unknown_priority_is_refused():
+    controller = AdmissionController()
+    with pytest.raises(ValueError):
+        controller.set_service_routes("orders", [("GET", "/orders/", "urgent")])
+
+
+def test_critical_requests_are_never_queued():
+    async def scenario():
+        controller = AdmissionController(max_inflight=1)
+        async with controller.admit("low"):
+            async with controller.admit("critical"):
+                assert controller.inflight == 2
+        assert controller.inflight == 0
+
+    asyncio.run(scenario())
+
+
+def test_freed_slots_go_to_the_highest_class_first():
+    async def scenario():
+        controller = AdmissionController(max_inflight=1, class_shares={"low": 1.0})
+        order = []
+
+        async def request(priority):
+            async with controller.admit(priority):
+                order.append(priority)
+
+        async with controller.admit("high"):
+            low = asyncio.create_task(request("low"))
+            await asyncio.sleep(0)
+            high = asyncio.create_task(request("high"))
+            await asyncio.sleep(0)
+        await asyncio.gather(low, high)
+        assert order == ["high", "low"]
+        assert controller.inflight == 0 and controller.queued == 0
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_preempts_a_lower_class():
+    async def scenario():
+        controller = AdmissionController(max_inflight=1, max_queue=1, class_shares={"low": 1.0})
+        async with controller.admit("high"):
+            low = asyncio.create_task(controller._acquire(controller.classes["low"]))
+            await asyncio.sleep(0)
+            high = asyncio.create_task(controller._acquire(controller.classes["high"]))
+            await asyncio.sleep(0)
+            with pytest.raises(AdmissionRejected) as rejected:
+                await low
+            assert rejected.value.reason == "preempted by higher priority traffic"
+        await high
+        controller._release(controller.classes["high"])
+        assert controller.inflight == 0 and controller.queued == 0
+
+    asyncio.run(scenario())
+
+
+def test_wait_timeout_is_rejected():
+    async def scenario():
+        controller = AdmissionController(max_inflight=1, interval=0.005, class_shares={"low": 1.0})
+        async with controller.admit("high"):
+            with pytest.raises(AdmissionRejected):
+                async with controller.admit("low"):
+                    pass
+        assert controller.inflight == 0 and controller.queued == 0
+
+    asyncio.run(scenario())
+
+
+def test_slot_handed_over_right_before_the_timeout_is_released():
+    async def scenario():
+        controller = AdmissionController(max_inflight=1, class_shares={"low": 1.0})
+        low = controller.classes["low"]
+        controller._take(low)
+
+        async def granted_then_timed_out(waiter, timeout):
+            controller._release(low)
+            await asyncio.sleep(0)
+            assert waiter.done()
+            raise asyncio.TimeoutError
+
+        with mock.patch.object(admission_module.asyncio, "wait_for", granted_then_timed_out):
+            with pytest.raises(AdmissionRejected):
+                async with controller.admit("low"):
+                    pass
+        assert controller.inflight == 0 and low.inflight == 0
+
+    asyncio.run(scenario())
+
+
+def test_slot_handed_over_right_before_a_cancellation_is_released():
+    async def scenario():
+        controller = AdmissionController(max_inflight=1, class_shares={"low": 1.0})
+        low = controller.classes["low"]
+        controller._take(low)
+
+        async def granted_then_cancelled(waiter, timeout):
+            controller._release(low)
+            await asyncio.sleep(0)
+            raise asyncio.CancelledError
+
+        with mock.patch.object(admission_module.asyncio, "wait_for", granted_then_cancelled):
+            with pytest.raises(asyncio.CancelledError):
+                async with controller.admit("low"):
+                    pass
+        assert controller.inflight == 0 and low.inflight == 0
+
+    asyncio.run(scenario())
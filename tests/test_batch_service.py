@@ -0,0 +1,55 @@
+import pytest
+from fastapi import HTTPException
+from src.core.schemas.batch_schema import BatchRequestSchema
+from src.services.batch_service import BatchService
+
+
+def batch(*requests) -> BatchRequestSchema:
+    return BatchRequestSchema(requests=[
+        {"id": id_, "method": method, "path": path, "depends_on": depends_on}
+        for id_, method, path, depends_on in requests
+    ])
+
+
+def rejection(service: BatchService, schema: BatchRequestSchema) -> str:
+    with pytest.raises(HTTPException) as rejected:
+        service.validate(schema)
+    assert rejected.value.status_code == 400
+    return rejected.value.detail
+
+
+def test_valid_dependency_chain():
+    BatchService().validate(batch(
+        ("a", "GET", "/api/v1/a", []),
+        ("b", "GET", "/api/v1/b", ["a"]),
+        ("c", "GET", "/api/v1/c", ["a", "b"]),
+    ))
+
+
+def test_dependency_cycles_are_rejected():
+    detail = rejection(BatchService(), batch(
+        ("a", "GET", "/api/v1/a", []),
+        ("b", "GET", "/api/v1/b", ["c"]),
+        ("c", "GET", "/api/v1/c", ["b"]),
+    ))
+    assert "['b', 'c']" in detail
+
+
+def test_unknown_dependencies_and_duplicate_ids_are_rejected():
+    rejection(BatchService(), batch(("a", "GET", "/api/v1/a", ["missing"])))
+    rejection(BatchService(), batch(("a", "GET", "/api/v1/a", []), ("a", "GET", "/api/v1/b", [])))
+
+
+@pytest.mark.parametrize("path", ["/api/v1/batch", "/api/v1/x/../batch", "/internal/metrics", "/api/v1/../../internal/metrics", "//evil/path"])
+def test_gateway_paths_are_rejected_after_normalization(path):
+    rejection(BatchService(), batch(("a", "POST", path, [])))
+
+
+def test_streaming_routes_are_rejected_until_removed():
+    service = BatchService()
+    service.set_streaming_routes("events", [("GET", "/api/v1/events/{room}/", "sse"), (None, "/api/v1/chat/", "websocket")])
+    assert "sse" in rejection(service, batch(("a", "GET", "/api/v1/events/1", [])))
+    assert "websocket" in rejection(service, batch(("a", "POST", "/api/v1/chat", [])))
+    service.validate(batch(("a", "POST", "/api/v1/events/1", [])))
+    service.remove_service("events")
+    service.validate(batch(("a", "GET", "/api/v1/events/1", [])))
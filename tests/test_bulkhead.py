@@ -0,0 +1,136 @@
+import asyncio
+from unittest import mock
+import pytest
+from src.core.entities.microservice import ConcurrencyConfig
+from src.infrastructure.exception_handlers import UpstreamOverloadedException
+from src.utils import bulkhead as bulkhead_module
+from src.utils.bulkhead import AdaptiveConcurrencyLimit, UpstreamBulkhead
+
+
+def make_bulkhead(limit: int = 1, queue_size: int = 10, queue_timeout: float = 1.0) -> UpstreamBulkhead:
+    config = ConcurrencyConfig(initial_limit=limit, min_limit=limit, max_limit=limit, queue_size=queue_size, queue_timeout=queue_timeout)
+    return UpstreamBulkhead("test-service", config)
+
+
+def test_slot_is_released_after_the_block():
+    async def scenario():
+        bulkhead = make_bulkhead()
+        async with bulkhead.slot():
+            assert bulkhead.inflight == 1
+        assert bulkhead.inflight == 0
+
+    asyncio.run(scenario())
+
+
+def test_release_is_idempotent():
+    async def scenario():
+        bulkhead = make_bulkhead(limit=2)
+        release = await bulkhead.acquire()
+        release()
+        release()
+        assert bulkhead.inflight == 0
+
+    asyncio.run(scenario())
+
+
+def test_released_slot_is_handed_to_the_oldest_waiter():
+    async def scenario():
+        bulkhead = make_bulkhead()
+        release = await bulkhead.acquire()
+        order = []
+
+        async def wait(name):
+            async with bulkhead.slot():
+                order.append(name)
+
+        first = asyncio.create_task(wait("first"))
+        second = asyncio.create_task(wait("second"))
+        await asyncio.sleep(0)
+        release()
+        await asyncio.gather(first, second)
+        assert order == ["first", "second"]
+        assert bulkhead.inflight == 0
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_is_rejected():
+    async def scenario():
+        bulkhead = make_bulkhead(queue_size=0)
+        release = await bulkhead.acquire()
+        with pytest.raises(UpstreamOverloadedException):
+            await bulkhead.acquire()
+        release()
+        assert bulkhead.inflight == 0
+
+    asyncio.run(scenario())
+
+
+def test_wait_timeout_is_rejected():
+    async def scenario():
+        bulkhead = make_bulkhead(queue_timeout=0.01)
+        release = await bulkhead.acquire()
+        with pytest.raises(UpstreamOverloadedException):
+            await bulkhead.acquire()
+        release()
+        assert bulkhead.inflight == 0
+        assert not bulkhead._waiters
+
+    asyncio.run(scenario())
+
+
+def test_slot_handed_over_right_before_the_timeout_is_released():
+    async def scenario():
+        bulkhead = make_bulkhead()
+        release = await bulkhead.acquire()
+
+        async def granted_then_timed_out(waiter, timeout):
+            release()
+            await asyncio.sleep(0)
+            assert waiter.done()
+            raise asyncio.TimeoutError
+
+        with mock.patch.object(bulkhead_module.asyncio, "wait_for", granted_then_timed_out):
+            with pytest.raises(UpstreamOverloadedException):
+                await bulkhead.acquire()
+        assert bulkhead.inflight == 0
+
+    asyncio.run(scenario())
+
+
+def test_slot_handed_over_right_before_a_cancellation_is_released():
+    async def scenario():
+        bulkhead = make_bulkhead()
+        release = await bulkhead.acquire()
+
+        async def granted_then_cancelled(waiter, timeout):
+            release()
+            await asyncio.sleep(0)
+            assert waiter.done()
+            raise asyncio.CancelledError
+
+        with mock.patch.object(bulkhead_module.asyncio, "wait_for", granted_then_cancelled):
+            with pytest.raises(asyncio.CancelledError):
+                await bulkhead.acquire()
+        assert bulkhead.inflight == 0
+
+    asyncio.run(scenario())
+
+
+def test_limit_backs_off_on_failures_and_grows_when_used():
+    limit = AdaptiveConcurrencyLimit(initial_limit=10, min_limit=2, max_limit=12)
+    assert limit.on_sample(0.01, inflight=10, dropped=False) == 11
+    assert limit.on_sample(0.01, inflight=1, dropped=False) == 11
+    assert limit.on_sample(0.01, inflight=10, dropped=True) == 9
+    # Latency well above the baseline counts as degradation
+    assert limit.on_sample(0.5, inflight=10, dropped=False) == 8
+
+
+def test_limit_stays_within_bounds():
+    limit = AdaptiveConcurrencyLimit(initial_limit=2, min_limit=2, max_limit=3)
+    for _ in range(5):
+        limit.on_sample(0.01, inflight=3, dropped=True)
+    assert limit.value == 2
+    for _ in range(5):
+        limit.on_sample(0.001, inflight=3, dropped=False)
+    assert limit.value == 3
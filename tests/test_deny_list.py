@@ -0,0 +1,67 @@
+from src.utils.deny_list import CidrTree, DenyList, credential_hash
+
+
+def make_deny_list(networks=(), revoked=()) -> DenyList:
+    deny_list = DenyList(redis_client=None)
+    deny_list.replace(networks, [credential_hash(credential) for credential in revoked])
+    return deny_list
+
+
+def test_cidr_tree_matches_prefixes():
+    tree = CidrTree(8)
+    tree.add(0b10100000, 3)
+    assert tree.contains(0b10111111)
+    assert not tree.contains(0b11000000)
+
+
+def test_cidr_tree_ignores_prefixes_already_covered():
+    tree = CidrTree(8)
+    tree.add(0b10000000, 1)
+    tree.add(0b11000000, 2)
+    assert tree.size == 1
+    # A shorter prefix covers the longer ones added before it
+    tree = CidrTree(8)
+    tree.add(0b11000000, 2)
+    tree.add(0b10000000, 1)
+    assert tree.contains(0b10000001)
+    assert not tree.contains(0b01000000)
+
+
+def test_denied_networks():
+    deny_list = make_deny_list(["10.0.0.0/8", "192.168.1.7", "2001:db8::/32"])
+    assert deny_list.is_denied("10.20.30.40")
+    assert deny_list.is_denied("192.168.1.7")
+    assert not deny_list.is_denied("192.168.1.8")
+    assert deny_list.is_denied("2001:db8::1")
+    assert not deny_list.is_denied("2001:db9::1")
+
+
+def test_ipv4_mapped_addresses_match_ipv4_networks():
+    deny_list = make_deny_list(["10.0.0.0/8"])
+    assert deny_list.is_denied("::ffff:10.1.2.3")
+    assert not deny_list.is_denied("::ffff:11.1.2.3")
+
+
+def test_missing_or_invalid_hosts_are_not_denied():
+    deny_list = make_deny_list(["0.0.0.0/0"])
+    assert not deny_list.is_denied(None)
+    assert not deny_list.is_denied("testclient")
+
+
+def test_invalid_networks_are_ignored():
+    deny_list = make_deny_list(["not-a-network", "10.0.0.0/8"])
+    assert deny_list.snapshot.networks == ["10.0.0.0/8"]
+
+
+def test_revoked_credentials():
+    deny_list = make_deny_list(revoked=["token-1"])
+    assert deny_list.is_revoked("token-1")
+    assert not deny_list.is_revoked("token-2")
+
+
+def test_replace_swaps_the_whole_snapshot():
+    deny_list = make_deny_list(["10.0.0.0/8"], ["token-1"])
+    deny_list.replace(["172.16.0.0/12"], [])
+    assert not deny_list.is_denied("10.0.0.1")
+    assert deny_list.is_denied("172.16.0.1")
+    assert not deny_list.is_revoked("token-1")
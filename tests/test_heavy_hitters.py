@@ -0,0 +1,28 @@
+from src.utils.heavy_hitters import CountMinSketch, TopK
+
+
+def test_sketch_never_undercounts():
+    sketch = CountMinSketch(width=16, depth=3)
+    counts = {f"key-{index}": index + 1 for index in range(64)}
+    for key, count in counts.items():
+        sketch.add(key, count)
+    for key, count in counts.items():
+        assert sketch.estimate(key) >= count
+
+
+def test_sketch_add_returns_the_new_estimate():
+    sketch = CountMinSketch()
+    assert sketch.add("a") == 1
+    assert sketch.add("a", 4) == 5
+    assert sketch.estimate("a") == 5
+
+
+def test_top_k_keeps_the_largest_counts():
+    top = TopK(capacity=2)
+    top.offer("a", 5)
+    top.offer("b", 1)
+    top.offer("c", 3)
+    assert top.top(10) == [("a", 5), ("c", 3)]
+    # A key must exceed the smallest candidate to replace it
+    top.offer("d", 3)
+    assert top.top(10) == [("a", 5), ("c", 3)]
@@ -0,0 +1,180 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from starlette.responses import Response, StreamingResponse
+from src.utils.idempotency import IdempotencyStore
+from src.utils.memory_budget import MemoryBudget
+
+
+class FakeRedis:
+    """The subset of RedisClient used by the store, with the two Lua scripts emulated."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def set(self, key, value, expire=None, nx=False):
+        if nx and key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def eval(self, script, numkeys, key, token, *args):
+        if self.data.get(key) != token:
+            return None
+        if args:
+            # COMPLETE_SCRIPT: replace the reservation with the stored response
+            self.data[key] = args[0]
+        else:
+            # RELEASE_SCRIPT
+            del self.data[key]
+        return 1
+
+
+def streamed(*chunks: bytes, status_code: int = 200) -> StreamingResponse:
+    async def body():
+        for chunk in chunks:
+            yield chunk
+    return StreamingResponse(body(), status_code=status_code, media_type="application/json")
+
+
+async def read(response: Response) -> bytes:
+    if isinstance(response, StreamingResponse):
+        return b"".join([chunk async for chunk in response.body_iterator])
+    return response.body
+
+
+KEY = IdempotencyStore.make_key("PUT /items/{item_id}\nconsumer", "key-1")
+
+
+def test_first_request_is_stored_and_replayed():
+    async def scenario():
+        store = IdempotencyStore(FakeRedis())
+        reservation, replayed = await store.reserve("items", KEY, "/items/1", b'{"a":1}')
+        assert reservation is not None and replayed is None
+        response = await store.record(reservation, streamed(b'{"ok":', b"true}", status_code=201), ttl=60)
+        assert await read(response) == b'{"ok":true}'
+
+        reservation, replayed = await store.reserve("items", KEY, "/items/1", b'{"a":1}')
+        assert reservation is None
+        assert replayed.status_code == 201
+        assert replayed.body == b'{"ok":true}'
+        assert replayed.headers["idempotent-replayed"] == "true"
+        assert replayed.headers["content-length"] == "11"
+
+    asyncio.run(scenario())
+
+
+def test_key_reused_for_another_body_is_rejected():
+    async def scenario():
+        store = IdempotencyStore(FakeRedis())
+        reservation, _ = await store.reserve("items", KEY, "/items/1", b'{"a":1}')
+        await store.record(reservation, streamed(b"{}"), ttl=60)
+        with pytest.raises(HTTPException) as rejected:
+            await store.reserve("items", KEY, "/items/1", b'{"a":2}')
+        assert rejected.value.status_code == 422
+
+    asyncio.run(scenario())
+
+
+def test_key_reused_for_another_target_is_rejected():
+    async def scenario():
+        store = IdempotencyStore(FakeRedis())
+        reservation, _ = await store.reserve("items", KEY, "/items/1", b"{}")
+        await store.record(reservation, streamed(b"{}"), ttl=60)
+        for target in ("/items/2", "/items/1?force=true"):
+            with pytest.raises(HTTPException) as rejected:
+                await store.reserve("items", KEY, target, b"{}")
+            assert rejected.value.status_code == 422
+
+    asyncio.run(scenario())
+
+
+def test_duplicate_in_flight_gets_a_conflict():
+    async def scenario():
+        store = IdempotencyStore(FakeRedis())
+        await store.reserve("items", KEY, "/items/1", b"{}")
+        with pytest.raises(HTTPException) as rejected:
+            await store.reserve("items", KEY, "/items/1", b"{}", wait_timeout=0)
+        assert rejected.value.status_code == 409
+
+    asyncio.run(scenario())
+
+
+def test_duplicate_in_flight_waits_for_the_first_response():
+    async def scenario():
+        store = IdempotencyStore(FakeRedis(), poll_interval=0.001)
+        reservation, _ = await store.reserve("items", KEY, "/items/1", b"{}")
+        duplicate = asyncio.create_task(store.reserve("items", KEY, "/items/1", b"{}", wait_timeout=1.0))
+        await asyncio.sleep(0.01)
+        await store.record(reservation, streamed(b"done"), ttl=60)
+        _, replayed = await duplicate
+        assert replayed.body == b"done"
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("status_code", [500, 503, 429])
+def test_retryable_responses_release_the_key(status_code):
+    async def scenario():
+        redis = FakeRedis()
+        store = IdempotencyStore(redis)
+        reservation, _ = await store.reserve("items", KEY, "/items/1", b"{}")
+        await store.record(reservation, streamed(b"error", status_code=status_code), ttl=60)
+        assert KEY not in redis.data
+        reservation, _ = await store.reserve("items", KEY, "/items/1", b"{}")
+        assert reservation is not None
+
+    asyncio.run(scenario())
+
+
+def test_large_responses_are_relayed_without_being_stored():
+    async def scenario():
+        redis = FakeRedis()
+        store = IdempotencyStore(redis, max_body_size=4)
+        reservation, _ = await store.reserve("items", KEY, "/items/1", b"{}")
+        response = await store.record(reservation, streamed(b"abc", b"def", b"gh"), ttl=60)
+        assert await read(response) == b"abcdefgh"
+        assert KEY not in redis.data
+
+    asyncio.run(scenario())
+
+
+def test_stored_responses_are_reserved_against_the_memory_budget():
+    async def scenario():
+        redis = FakeRedis()
+        budget = MemoryBudget(max_bytes=5, max_body_size=5, wait_timeout=0.01)
+        store = IdempotencyStore(redis, memory_budget=budget)
+        reservation, _ = await store.reserve("items", KEY, "/items/1", b"{}")
+        response = await store.record(reservation, streamed(b"abc"), ttl=60)
+        assert await read(response) == b"abc"
+        assert budget.used == 0
+
+        # A response the budget cannot cover is relayed, and the key released
+        other_key = IdempotencyStore.make_key("scope", "key-2")
+        reservation, _ = await store.reserve("items", other_key, "/items/1", b"{}")
+        response = await store.record(reservation, streamed(b"abc", b"def"), ttl=60)
+        assert await read(response) == b"abcdef"
+        assert other_key not in redis.data
+        assert budget.used == 0
+
+    asyncio.run(scenario())
+
+
+def test_failed_upstream_stream_releases_the_key():
+    async def scenario():
+        redis = FakeRedis()
+        store = IdempotencyStore(redis)
+        reservation, _ = await store.reserve("items", KEY, "/items/1", b"{}")
+
+        async def broken():
+            yield b"partial"
+            raise ConnectionError("upstream went away")
+
+        with pytest.raises(ConnectionError):
+            await store.record(reservation, StreamingResponse(broken()), ttl=60)
+        assert KEY not in redis.data
+
+    asyncio.run(scenario())
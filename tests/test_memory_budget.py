@@ -0,0 +1,116 @@
+import asyncio
+from unittest import mock
+import pytest
+from src.infrastructure.exception_handlers import MemoryBudgetExhaustedException, PayloadTooLargeException
+from src.utils import memory_budget as memory_budget_module
+from src.utils.memory_budget import MemoryBudget
+
+
+def test_try_reserve_within_the_budget():
+    budget = MemoryBudget(max_bytes=100, max_body_size=100)
+    assert budget.try_reserve(60)
+    assert not budget.try_reserve(50)
+    budget.release(60)
+    assert budget.used == 0
+
+
+def test_oversized_body_is_rejected():
+    async def scenario():
+        budget = MemoryBudget(max_bytes=100, max_body_size=10)
+        with pytest.raises(PayloadTooLargeException):
+            await budget.reserve(11)
+        assert budget.used == 0
+
+    asyncio.run(scenario())
+
+
+def test_waiters_are_granted_in_order():
+    async def scenario():
+        budget = MemoryBudget(max_bytes=100, max_body_size=100, wait_timeout=1.0)
+        budget.try_reserve(100)
+        order = []
+
+        async def reserve(name, size):
+            await budget.reserve(size)
+            order.append(name)
+
+        first = asyncio.create_task(reserve("first", 80))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(reserve("second", 10))
+        await asyncio.sleep(0)
+        # Enough for the second waiter only, which must not overtake the first
+        budget.release(20)
+        await asyncio.sleep(0)
+        assert order == []
+        budget.release(80)
+        await asyncio.gather(first, second)
+        assert order == ["first", "second"]
+        assert budget.used == 90
+
+    asyncio.run(scenario())
+
+
+def test_wait_timeout_is_rejected():
+    async def scenario():
+        budget = MemoryBudget(max_bytes=100, max_body_size=100, wait_timeout=0.01)
+        budget.try_reserve(100)
+        with pytest.raises(MemoryBudgetExhaustedException):
+            await budget.reserve(10)
+        assert budget.used == 100
+        assert not budget._waiters
+
+    asyncio.run(scenario())
+
+
+def test_bytes_granted_right_before_the_timeout_are_released():
+    async def scenario():
+        budget = MemoryBudget(max_bytes=100, max_body_size=100)
+        budget.try_reserve(100)
+
+        async def granted_then_timed_out(waiter, timeout):
+            budget.release(100)
+            await asyncio.sleep(0)
+            assert waiter.done()
+            raise asyncio.TimeoutError
+
+        with mock.patch.object(memory_budget_module.asyncio, "wait_for", granted_then_timed_out):
+            with pytest.raises(MemoryBudgetExhaustedException):
+                await budget.reserve(50)
+        assert budget.used == 0
+
+    asyncio.run(scenario())
+
+
+def test_bytes_granted_right_before_a_cancellation_are_released():
+    async def scenario():
+        budget = MemoryBudget(max_bytes=100, max_body_size=100)
+        budget.try_reserve(100)
+
+        async def granted_then_cancelled(waiter, timeout):
+            budget.release(100)
+            await asyncio.sleep(0)
+            raise asyncio.CancelledError
+
+        with mock.patch.object(memory_budget_module.asyncio, "wait_for", granted_then_cancelled):
+            with pytest.raises(asyncio.CancelledError):
+                await budget.reserve(50)
+        assert budget.used == 0
+
+    asyncio.run(scenario())
+
+
+def test_leaving_waiter_unblocks_smaller_ones_behind_it():
+    async def scenario():
+        budget = MemoryBudget(max_bytes=100, max_body_size=100, wait_timeout=1.0)
+        budget.try_reserve(50)
+        large = asyncio.create_task(budget.reserve(100))
+        await asyncio.sleep(0)
+        small = asyncio.create_task(budget.reserve(10))
+        await asyncio.sleep(0)
+        large.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await large
+        await small
+        assert budget.used == 60
+
+    asyncio.run(scenario())